@@ -0,0 +1,16 @@
+from .cache import CacheBackend, MemoryCache, RedisCache, SQLiteCache
+from .ratelimit import RateLimiter
+from .transport import Transport
+from .client import GifClient
+from .models import Gif
+from .types import *
+from .hedging import HedgePolicy
+from .errors import CircuitOpen, MediaTooLarge
+from .instrumentation import Hooks, MetricsCollector, RequestEvent, TracingHooks
+from .sync import LoopThread, SyncGiphyClient, SyncTenorClient
+from .prefix import PrefixCache
+from .batching import Batcher
+from .breaker import CircuitBreaker
+from .columnar import MediaTable
+from .dedup import Deduplicator
+from .prefetch import PreviewPrefetcher, Thumbnail, ThumbnailCache
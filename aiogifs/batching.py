@@ -0,0 +1,109 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+K = TypeVar("K", bound = Hashable)
+V = TypeVar("V")
+
+
+class Batcher(Generic[K, V]):
+    def __init__(self, load_many: Callable[[List[K]], Awaitable[Dict[K, V]]], *, window: float = 0.002, max_batch: Optional[int] = None):
+        """Collects single-key lookups made within a short window into one call of `load_many`.
+
+        The first `load` starts the window. Every key requested before it closes, or before
+        `max_batch` distinct keys are waiting, is resolved by the same `load_many` call, and each
+        caller receives the value of its own key.
+
+        :param load_many: The coroutine function resolving a list of keys. It returns the values found, keyed by key.
+        :type load_many: Callable[[List[K]], Awaitable[Dict[K, V]]]
+        :param window: How long keys are collected in seconds, defaults to 0.002
+        :type window: float, optional
+        :param max_batch: Sends the batch early once this many distinct keys are waiting, defaults to None
+        :type max_batch: Optional[int], optional
+        """
+        self.load_many = load_many
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.keys = 0
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Returns the number of batches sent and the mean number of keys per batch.
+
+        :rtype: Dict[str, float]
+        """
+        return {"batches": self.batches, "keys": self.keys, "mean_batch_size": self.keys / self.batches if self.batches else 0.0}
+
+    async def load(self, key: K) -> Optional[V]:
+        """Resolves one key as part of the current batch.
+
+        :param key: The key to resolve.
+        :type key: K
+        :raises Exception: The error raised by `load_many` for the batch.
+        :raises asyncio.CancelledError: If the batch was cancelled.
+        :return: The value of the key, or None if `load_many` didn't return it.
+        :rtype: Optional[V]
+        """
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            # every caller of the key may have been cancelled, leaving nobody to retrieve an error
+            future.add_done_callback(lambda future: future.cancelled() or future.exception())
+            if self.max_batch is not None and len(self._pending) >= self.max_batch:
+                self.flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self.flush)
+        # callers of the same key share its future, so one caller cancelling must not cancel the others
+        return await asyncio.shield(future)
+
+    def flush(self):
+        """Sends the waiting keys now instead of when the window closes.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._dispatch(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self):
+        """Cancels the keys still waiting and the batches in flight, and waits for them to stop.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.cancel()
+        tasks = [task for task in self._tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions = True)
+
+    async def _dispatch(self, pending: Dict[K, asyncio.Future]):
+        self.batches += 1
+        self.keys += len(pending)
+        try:
+            values = await self.load_many(list(pending))
+            for key, future in pending.items():
+                if not future.done():
+                    future.set_result(values.get(key))
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except BaseException as e:
+            # any future left unresolved would keep its callers waiting forever
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
@@ -0,0 +1,210 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import aiohttp
+
+
+class _Circuit:
+    __slots__ = ("state", "outcomes", "failures", "opened_at", "probes", "trips")
+
+    def __init__(self):
+        self.state = CircuitBreaker.CLOSED
+        self.outcomes: Deque[Tuple[float, bool]] = deque()
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.trips = 0
+
+
+class Permit:
+    __slots__ = ("probe", "trips")
+
+    def __init__(self, probe: bool, trips: int):
+        """Lets one request through a circuit. Returned by `CircuitBreaker.allow` and handed back to `record` or `release`.
+
+        :param probe: Whether the request probes a half-open circuit.
+        :type probe: bool
+        :param trips: How many times the circuit had opened when the request was let through.
+        :type trips: int
+        """
+        self.probe = probe
+        self.trips = trips
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    # the retry hint while every probe slot is taken, as the probes' outcome decides what comes next
+    PROBE_RETRY_AFTER = 1.0
+
+    def __init__(self, *, failure_rate: float = 0.5, min_requests: int = 10, window: float = 30.0, cooldown: float = 15.0, probes: int = 1, stale_ttl: float = 3600.0):
+        """Stops sending requests to an endpoint that keeps failing, so callers fail fast instead of waiting out every error.
+
+        Each endpoint of each provider has its own circuit. A circuit opens once at least
+        `min_requests` requests completed within the last `window` seconds and `failure_rate` of them
+        failed. Server errors, timeouts and connection errors count as failures. While a circuit is
+        open, requests are answered from the cache even if the entry expired, or raise
+        `CircuitOpen`. After `cooldown` seconds the circuit lets `probes` requests through. It closes
+        again if they succeed and reopens if they fail.
+
+        Expired entries are also served while a circuit is closed: a response that expired less
+        than `stale_ttl` ago is returned at once, and refreshed in the background for the next
+        caller (stale-while-revalidate).
+
+        :param failure_rate: The share of failed requests opening the circuit, defaults to 0.5
+        :type failure_rate: float, optional
+        :param min_requests: The number of requests within the window needed before the circuit can open, defaults to 10
+        :type min_requests: int, optional
+        :param window: How far back requests are counted in seconds, defaults to 30.0
+        :type window: float, optional
+        :param cooldown: How long the circuit stays open before probing in seconds, defaults to 15.0
+        :type cooldown: float, optional
+        :param probes: The number of requests let through at once while probing, defaults to 1
+        :type probes: int, optional
+        :param stale_ttl: How long past their expiry the client's default cache keeps responses to serve while they are refreshed or while a circuit is open, in seconds, defaults to 3600.0
+        :type stale_ttl: float, optional
+        """
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self.probes = probes
+        self.stale_ttl = stale_ttl
+        self._circuits: Dict[str, _Circuit] = {}
+
+    @staticmethod
+    def is_failure(error: BaseException) -> bool:
+        """Returns whether an error means the endpoint is unhealthy, as opposed to a bad request.
+
+        :rtype: bool
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500
+        return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, ValueError))
+
+    def _circuit(self, key: str) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        return circuit
+
+    def state(self, key: str) -> str:
+        """Returns the state of a circuit: "closed", "open" or "half_open".
+
+        :param key: The circuit, in the form "provider:endpoint", e.g. "giphy:/gifs/search".
+        :type key: str
+        :rtype: str
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return self.CLOSED
+        if circuit.state == self.OPEN and time.monotonic() - circuit.opened_at >= self.cooldown:
+            return self.HALF_OPEN
+        return circuit.state
+
+    def retry_after(self, key: str) -> float:
+        """Returns how many seconds a refused request should wait: the rest of the cooldown of an open circuit, or `PROBE_RETRY_AFTER` while every probe slot is taken.
+
+        :rtype: float
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state == self.CLOSED:
+            return 0.0
+        remaining = circuit.opened_at + self.cooldown - time.monotonic()
+        if circuit.state == self.OPEN and remaining > 0:
+            return remaining
+        return self.PROBE_RETRY_AFTER if circuit.probes >= self.probes else 0.0
+
+    def allow(self, key: str) -> Optional[Permit]:
+        """Returns a permit if a request may be sent, or None. The permit must be handed to `record` or `release` once the request ends.
+
+        :rtype: Optional[Permit]
+        """
+        circuit = self._circuit(key)
+        if circuit.state == self.CLOSED:
+            return Permit(False, circuit.trips)
+        if circuit.state == self.OPEN:
+            if time.monotonic() - circuit.opened_at < self.cooldown:
+                return None
+            circuit.state = self.HALF_OPEN
+        if circuit.probes >= self.probes:
+            return None
+        circuit.probes += 1
+        return Permit(True, circuit.trips)
+
+    def record(self, key: str, success: bool, permit: Permit):
+        """Records the outcome of a request sent after `allow`.
+
+        Only probes decide whether a half-open circuit closes or reopens. The outcome of a request
+        let through before the circuit last opened is ignored.
+
+        :param key: The circuit, in the form "provider:endpoint".
+        :type key: str
+        :param success: Whether the endpoint answered, as opposed to failing as described by `is_failure`.
+        :type success: bool
+        :param permit: The permit `allow` returned for the request.
+        :type permit: Permit
+        """
+        circuit = self._circuit(key)
+        now = time.monotonic()
+        if permit.trips != circuit.trips:
+            # sent before the circuit last opened, so it says nothing about the endpoint now
+            return
+        if permit.probe:
+            # another probe may have closed the circuit already
+            if circuit.state == self.HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                if success:
+                    circuit.state = self.CLOSED
+                    circuit.probes = 0
+                    circuit.outcomes.clear()
+                    circuit.failures = 0
+                else:
+                    self._open(circuit, now)
+            return
+
+        circuit.outcomes.append((now, success))
+        if not success:
+            circuit.failures += 1
+        while circuit.outcomes and circuit.outcomes[0][0] <= now - self.window:
+            _, ok = circuit.outcomes.popleft()
+            if not ok:
+                circuit.failures -= 1
+        total = len(circuit.outcomes)
+        if total >= self.min_requests and circuit.failures >= total * self.failure_rate:
+            self._open(circuit, now)
+
+    def release(self, key: str, permit: Permit):
+        """Gives back the probe slot of a request that ended without an outcome, such as a cancelled one.
+        """
+        circuit = self._circuits.get(key)
+        if circuit is not None and permit.probe and permit.trips == circuit.trips and circuit.state == self.HALF_OPEN:
+            circuit.probes = max(0, circuit.probes - 1)
+
+    def _open(self, circuit: _Circuit, now: float):
+        circuit.state = self.OPEN
+        circuit.opened_at = now
+        circuit.probes = 0
+        circuit.trips += 1
+        circuit.outcomes.clear()
+        circuit.failures = 0
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns the state of every circuit, keyed by "provider:endpoint", for monitoring.
+
+        :rtype: Dict[str, Dict[str, float]]
+        """
+        return {
+            key: {
+                "state": self.state(key),
+                "requests": len(circuit.outcomes),
+                "failures": circuit.failures,
+                "trips": circuit.trips,
+                "retry_after": self.retry_after(key),
+            }
+            for key, circuit in self._circuits.items()
+        }
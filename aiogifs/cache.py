@@ -0,0 +1,368 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+from .decoders import get_decoder
+
+T = TypeVar("T")
+
+
+def make_cache_key(url: str, params: dict, *, exclude: Iterable[str] = ()) -> str:
+    """Builds a stable cache key from a request url and its query parameters.
+
+    :param url: The full url of the request.
+    :type url: str
+    :param params: The query parameters sent with the request.
+    :type params: dict
+    :param exclude: Parameter names to leave out of the key, such as the API key, defaults to ()
+    :type exclude: Iterable[str], optional
+    :return: A string uniquely identifying the request.
+    :rtype: str
+    """
+    url = url.rstrip("/").lower()
+    items = sorted((str(k), str(v)) for k, v in params.items() if k not in exclude and v is not None)
+    query = "&".join(f"{k}={v}" for k, v in items)
+    return f"{url}?{query}"
+
+
+class CacheBackend:
+    """The interface every response cache implements.
+
+    All methods are coroutines so that backends which talk to a network store (such as Redis) can be plugged
+    straight into the HTTP layer. Backends keep track of their own `hits` and `misses`.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, *, stale: bool = False) -> Optional[Any]:
+        """Returns the cached value for `key`, or None if it is missing or expired.
+
+        With `stale`, a value that expired less than the backend's `stale_ttl` ago is returned too.
+        This is how responses are served while they are refreshed in the background, or while a
+        circuit breaker is open.
+        """
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, *, ttl: float, size: Optional[int] = None) -> None:
+        """Stores `value` under `key` for `ttl` seconds. `size` is the size of the payload in bytes, if known.
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        """Removes `key` from the cache.
+        """
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        """Removes every entry from the cache.
+        """
+        raise NotImplementedError
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit and miss counters of the cache.
+
+        :rtype: Dict[str, int]
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, *, max_entries: int = 1024, max_bytes: Optional[int] = 32 * 1024 * 1024, stale_ttl: float = 0.0):
+        """An in-memory cache with per-entry TTLs and LRU eviction.
+
+        :param max_entries: The maximum number of responses kept, defaults to 1024
+        :type max_entries: int, optional
+        :param max_bytes: The maximum total payload size kept in bytes. None disables the limit, defaults to 32 MiB
+        :type max_bytes: Optional[int], optional
+        :param stale_ttl: How long expired responses are kept for stale reads in seconds, defaults to 0.0
+        :type stale_ttl: float, optional
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Returns the total size in bytes of the payloads currently cached.
+
+        :rtype: int
+        """
+        return self._bytes
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats
+        stats.update(entries = len(self._entries), bytes = self._bytes, evictions = self.evictions)
+        return stats
+
+    async def get(self, key: str, *, stale: bool = False) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires, _ = entry
+        now = time.monotonic()
+        if expires + self.stale_ttl <= now:
+            self._remove(key)
+            self.misses += 1
+            return None
+        if expires <= now and not stale:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, *, ttl: float, size: Optional[int] = None) -> None:
+        if ttl <= 0:
+            return
+        if size is None:
+            size = len(json.dumps(value))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+        self._evict()
+
+    async def delete(self, key: str) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._entries.popitem(last = False)
+            self._bytes -= size
+            self.evictions += 1
+
+
+class RedisCache(CacheBackend):
+    def __init__(self, client, *, prefix: str = "aiogifs:", stale_ttl: float = 0.0):
+        """A cache backed by a Redis-like async client.
+
+        Any object providing coroutine methods `get(key)`, `set(key, value, ex=seconds)`, `delete(*keys)`
+        and an async `scan_iter(match=pattern)` works, such as `redis.asyncio.Redis`. Values are stored as JSON.
+        Redis drops keys as they expire, so with `stale_ttl` a second copy is stored under a "stale:" key that outlives the first.
+
+        :param client: The async Redis client.
+        :param prefix: A prefix added to every key, defaults to "aiogifs:"
+        :type prefix: str, optional
+        :param stale_ttl: How long expired responses are kept for stale reads in seconds, defaults to 0.0
+        :type stale_ttl: float, optional
+        """
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.stale_ttl = stale_ttl
+
+    async def get(self, key: str, *, stale: bool = False) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + ("stale:" if stale and self.stale_ttl > 0 else "") + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, *, ttl: float, size: Optional[int] = None) -> None:
+        seconds = int(ttl)
+        if seconds <= 0:
+            return
+        raw = json.dumps(value)
+        await self.client.set(self.prefix + key, raw, ex = seconds)
+        if self.stale_ttl > 0:
+            await self.client.set(self.prefix + "stale:" + key, raw, ex = seconds + int(self.stale_ttl))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key, self.prefix + "stale:" + key)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match = self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+class SQLiteCache(CacheBackend):
+    def __init__(self, path: str, *, max_bytes: Optional[int] = 256 * 1024 * 1024, max_entries: Optional[int] = None, touch_interval: float = 60.0, stale_ttl: float = 0.0, purge_interval: float = 60.0):
+        """A persistent cache stored in an SQLite database, so cached responses survive restarts.
+
+        The database uses write-ahead logging, so several worker processes on one host can share the
+        same file. Queries run in the default executor to keep the event loop free.
+
+        Writes check the limits against a running count and size instead of scanning the table.
+        Expired rows are purged every `purge_interval` seconds, which also recounts the table to take
+        in the writes of other processes.
+
+        :param path: The path of the database file. It is created if it doesn't exist.
+        :type path: str
+        :param max_bytes: The maximum total payload size kept in bytes. None disables the limit, defaults to 256 MiB
+        :type max_bytes: Optional[int], optional
+        :param max_entries: The maximum number of responses kept. None disables the limit, defaults to None
+        :type max_entries: Optional[int], optional
+        :param touch_interval: How often in seconds a hit refreshes an entry's LRU position. Keeps hits mostly read-only, defaults to 60.0
+        :type touch_interval: float, optional
+        :param stale_ttl: How long expired responses are kept for stale reads in seconds, defaults to 0.0
+        :type stale_ttl: float, optional
+        :param purge_interval: How often in seconds a write also purges expired responses, defaults to 60.0
+        :type purge_interval: float, optional
+        """
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.stale_ttl = stale_ttl
+        self.purge_interval = purge_interval
+        self.evictions = 0
+        self._loads = get_decoder()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout = 30, check_same_thread = False, isolation_level = None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+        self._count, self._bytes = self._totals()
+        self._next_purge = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size(self) -> int:
+        """Returns the total size in bytes of the payloads currently cached, as last counted.
+
+        :rtype: int
+        """
+        return self._bytes
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats
+        stats.update(entries = self._count, bytes = self._bytes, evictions = self.evictions)
+        return stats
+
+    def _totals(self) -> Tuple[int, int]:
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return count, total
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        def locked():
+            with self._lock:
+                return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, locked)
+
+    async def get(self, key: str, *, stale: bool = False) -> Optional[Any]:
+        row = await self._run(self._get, key, time.time(), stale)
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._loads(row)
+
+    def _get(self, key: str, now: float, stale: bool) -> Optional[bytes]:
+        row = self._db.execute("SELECT value, expires, accessed, size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires, accessed, size = row
+        if expires + self.stale_ttl <= now:
+            if self._db.execute("DELETE FROM responses WHERE key = ? AND expires <= ?", (key, now - self.stale_ttl)).rowcount:
+                self._count -= 1
+                self._bytes -= size
+            return None
+        if expires <= now and not stale:
+            return None
+        if now - accessed >= self.touch_interval:
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return value
+
+    async def set(self, key: str, value: Any, *, ttl: float, size: Optional[int] = None) -> None:
+        if ttl <= 0:
+            return
+        blob = json.dumps(value, separators = (",", ":")).encode()
+        if self.max_bytes is not None and len(blob) > self.max_bytes:
+            return
+        await self._run(self._set, key, blob, ttl)
+
+    def _set(self, key: str, blob: bytes, ttl: float):
+        now = time.time()
+        old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, blob, now + ttl, len(blob), now),
+        )
+        if old is None:
+            self._count += 1
+        self._bytes += len(blob) - (old[0] if old is not None else 0)
+        self._evict(now)
+
+    def _over(self) -> bool:
+        return (self.max_entries is not None and self._count > self.max_entries) or (self.max_bytes is not None and self._bytes > self.max_bytes)
+
+    def _purge(self, now: float):
+        self._db.execute("DELETE FROM responses WHERE expires <= ?", (now - self.stale_ttl,))
+        self._count, self._bytes = self._totals()
+        self._next_purge = now + self.purge_interval
+
+    def _evict(self, now: float):
+        if now >= self._next_purge:
+            self._purge(now)
+        if not self._over():
+            return
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if not self._over():
+                break
+            victims.append((key,))
+            self._count -= 1
+            self._bytes -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete, key)
+
+    def _delete(self, key: str):
+        row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None and self._db.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount:
+            self._count -= 1
+            self._bytes -= row[0]
+
+    async def clear(self) -> None:
+        await self._run(self._clear)
+
+    def _clear(self):
+        self._db.execute("DELETE FROM responses")
+        self._count = self._bytes = 0
+
+    async def close(self):
+        """Closes the database connection.
+        """
+        await self._run(self._db.close)
@@ -0,0 +1,191 @@
+import asyncio
+from itertools import zip_longest
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from .models import Gif
+from .tenor import TenorClient
+from .giphy import GiphyClient
+
+Fetch = Callable[[], Awaitable[List[Gif]]]
+
+
+class GifClient:
+    def __init__(self, *, tenor: Optional[TenorClient] = None, giphy: Optional[GiphyClient] = None, strategy: str = "hedge", primary: str = "tenor", budget: float = 0.5, timeout: Optional[float] = None):
+        """Searches Tenor and Giphy through one interface.
+
+        :param tenor: The Tenor client to use, defaults to None
+        :type tenor: Optional[TenorClient], optional
+        :param giphy: The Giphy client to use, defaults to None
+        :type giphy: Optional[GiphyClient], optional
+        :param strategy: The default `Strategy` used to combine the providers, defaults to "hedge"
+        :type strategy: str, optional
+        :param primary: The provider asked first by the race strategy and listed first when merging, defaults to "tenor"
+        :type primary: str, optional
+        :param budget: How long in seconds the race strategy waits for the primary provider before asking the next one, defaults to 0.5
+        :type budget: float, optional
+        :param timeout: The maximum time in seconds a call may take overall. None waits indefinitely, defaults to None
+        :type timeout: Optional[float], optional
+        :raises ValueError: If no client is passed.
+        """
+        if tenor is None and giphy is None:
+            raise ValueError("GifClient needs at least one of a TenorClient or a GiphyClient")
+        self.tenor = tenor
+        self.giphy = giphy
+        self.strategy = strategy
+        self.primary = primary
+        self.budget = budget
+        self.timeout = timeout
+
+    async def search(self, query: str, *, limit: int = 25, strategy: Optional[str] = None, budget: Optional[float] = None, timeout: Optional[float] = None) -> List[Gif]:
+        """Searches every configured provider according to the strategy.
+
+        :param query: The search query.
+        :type query: str
+        :param limit: The maximum number of results asked from each provider, defaults to 25
+        :type limit: int, optional
+        :param strategy: Overrides the client's strategy for this call, defaults to None
+        :type strategy: Optional[str], optional
+        :param budget: Overrides the client's race budget for this call, defaults to None
+        :type budget: Optional[float], optional
+        :param timeout: Overrides the client's timeout for this call, defaults to None
+        :type timeout: Optional[float], optional
+        :raises asyncio.TimeoutError: If no provider answered in time.
+        :return: A list of provider-neutral `Gif` objects.
+        :rtype: List[Gif]
+        """
+        async def tenor():
+            resp = await self.tenor.search(query, limit = limit)
+            return [Gif.from_tenor(m) for m in resp.media or []]
+
+        async def giphy():
+            resp = await self.giphy.search(query, limit = limit)
+            return [Gif.from_giphy(m) for m in resp.media]
+
+        return await self._dispatch(tenor, giphy, strategy, budget, timeout)
+
+    async def trending(self, *, limit: int = 25, strategy: Optional[str] = None, budget: Optional[float] = None, timeout: Optional[float] = None) -> List[Gif]:
+        """Fetches trending media from every configured provider according to the strategy.
+
+        :param limit: The maximum number of results asked from each provider, defaults to 25
+        :type limit: int, optional
+        :param strategy: Overrides the client's strategy for this call, defaults to None
+        :type strategy: Optional[str], optional
+        :param budget: Overrides the client's race budget for this call, defaults to None
+        :type budget: Optional[float], optional
+        :param timeout: Overrides the client's timeout for this call, defaults to None
+        :type timeout: Optional[float], optional
+        :raises asyncio.TimeoutError: If no provider answered in time.
+        :return: A list of provider-neutral `Gif` objects.
+        :rtype: List[Gif]
+        """
+        async def tenor():
+            resp = await self.tenor.trending(limit = limit)
+            return [Gif.from_tenor(m) for m in resp.media or []]
+
+        async def giphy():
+            resp = await self.giphy.trending(limit = limit)
+            return [Gif.from_giphy(m) for m in resp.media]
+
+        return await self._dispatch(tenor, giphy, strategy, budget, timeout)
+
+    async def open(self) -> "GifClient":
+        """Opens the sessions of every configured provider now. Otherwise each is opened by its first request.
+
+        :rtype: GifClient
+        """
+        for client in (self.tenor, self.giphy):
+            if client is not None:
+                await client.open()
+        return self
+
+    async def close(self):
+        """Closes the sessions of every configured provider.
+        """
+        for client in (self.tenor, self.giphy):
+            if client is not None:
+                await client.close()
+
+    async def __aenter__(self) -> "GifClient":
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _providers(self, tenor: Fetch, giphy: Fetch) -> List[Tuple[str, Fetch]]:
+        providers = []
+        if self.tenor is not None:
+            providers.append(("tenor", tenor))
+        if self.giphy is not None:
+            providers.append(("giphy", giphy))
+        providers.sort(key = lambda p: p[0] != self.primary)
+        return providers
+
+    async def _dispatch(self, tenor: Fetch, giphy: Fetch, strategy: Optional[str], budget: Optional[float], timeout: Optional[float]) -> List[Gif]:
+        strategy = strategy or self.strategy
+        timeout = self.timeout if timeout is None else timeout
+        fetches = [fetch for _, fetch in self._providers(tenor, giphy)]
+        if strategy == "merge":
+            return await self._merge(fetches, timeout)
+        elif strategy == "race":
+            coro = self._first(fetches, self.budget if budget is None else budget)
+        elif strategy == "hedge":
+            coro = self._first(fetches, None)
+        else:
+            raise ValueError(f"Unknown strategy {strategy!r}")
+        return await asyncio.wait_for(coro, timeout)
+
+    async def _first(self, fetches: List[Fetch], budget: Optional[float]) -> List[Gif]:
+        # with no budget every provider is asked at once, otherwise the next one
+        # is only asked when the previous ones failed or went over the budget
+        waiting = list(fetches)
+        pending = set()
+        error: Optional[BaseException] = None
+        try:
+            while waiting or pending:
+                if waiting and (budget is None or not pending):
+                    pending.add(asyncio.ensure_future(waiting.pop(0)()))
+                    if budget is None:
+                        continue
+                done, pending = await asyncio.wait(pending, timeout = budget if waiting else None, return_when = asyncio.FIRST_COMPLETED)
+                if not done and waiting:
+                    pending.add(asyncio.ensure_future(waiting.pop(0)()))
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        return task.result()
+                    error = asyncio.CancelledError() if task.cancelled() else task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            # the losers are waited for, so none is still running once the call returns
+            await asyncio.gather(*pending, return_exceptions = True)
+
+    async def _merge(self, fetches: List[Fetch], timeout: Optional[float]) -> List[Gif]:
+        # providers that fail or miss the timeout are left out of the merge
+        tasks = [asyncio.ensure_future(fetch()) for fetch in fetches]
+        done, pending = await asyncio.wait(tasks, timeout = timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions = True)
+        finished = [t for t in tasks if t in done and not t.cancelled()]
+        answers = [t.result() for t in finished if t.exception() is None]
+        if not answers:
+            errors = [t.exception() for t in finished]
+            raise errors[0] if errors else asyncio.TimeoutError()
+
+        # a duplicate shares the provider and ID or the media URL of an earlier GIF. Tenor and Giphy host
+        # their own copies under their own URLs, so a GIF found on both providers is kept twice
+        merged = []
+        seen = set()
+        for row in zip_longest(*answers):
+            for gif in row:
+                if gif is None:
+                    continue
+                key = (gif.provider, gif.id)
+                if key in seen or (gif.url and gif.url in seen):
+                    continue
+                seen.add(key)
+                if gif.url:
+                    seen.add(gif.url)
+                merged.append(gif)
+        return merged
@@ -0,0 +1,299 @@
+import sys
+from array import array
+from typing import AsyncIterable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .giphy.models import Media as GiphyMedia
+from .tenor.models import Media as TenorMedia
+
+TENOR_FORMATS = ("gif", "tiny_gif", "mp4", "tiny_mp4")
+GIPHY_FORMATS = ("original", "fixed_width", "fixed_height", "preview_gif")
+
+# stored in place of a missing size, dimension or duration
+_NONE = -1
+FIELDS = ("size", "width", "height", "duration")
+
+
+class _Column:
+    __slots__ = ("urls", "size", "width", "height", "duration")
+
+    def __init__(self):
+        self.urls: List[Optional[str]] = []
+        self.size = array("q")
+        self.width = array("i")
+        self.height = array("i")
+        self.duration = array("d")
+
+    def append(self, url: Optional[str], size: Optional[int], width: Optional[int], height: Optional[int], duration: Optional[float]):
+        self.urls.append(url)
+        self.size.append(_NONE if size is None else int(size))
+        self.width.append(_NONE if width is None else int(width))
+        self.height.append(_NONE if height is None else int(height))
+        self.duration.append(_NONE if duration is None else float(duration))
+
+    def take(self, indices: Sequence[int]) -> "_Column":
+        column = _Column()
+        column.urls = [self.urls[i] for i in indices]
+        for field in FIELDS:
+            source = getattr(self, field)
+            setattr(column, field, array(source.typecode, (source[i] for i in indices)))
+        return column
+
+
+class FormatView:
+    """One format of a `MediaRow`, with the attributes of the format objects it replaces."""
+    __slots__ = ("_column", "_index")
+
+    def __init__(self, column: _Column, index: int):
+        self._column = column
+        self._index = index
+
+    def _get(self, field: str):
+        value = getattr(self._column, field)[self._index]
+        return None if value == _NONE else value
+
+    @property
+    def url(self) -> Optional[str]:
+        return self._column.urls[self._index]
+
+    @property
+    def size(self) -> Optional[int]:
+        return self._get("size")
+
+    @property
+    def width(self) -> Optional[int]:
+        return self._get("width")
+
+    @property
+    def height(self) -> Optional[int]:
+        return self._get("height")
+
+    @property
+    def dimensions(self) -> Optional[List[int]]:
+        if self.width is None or self.height is None:
+            return None
+        return [self.width, self.height]
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self._get("duration")
+
+    def __repr__(self) -> str:
+        return f"<FormatView url={self.url!r} size={self.size!r}>"
+
+
+class MediaRow:
+    """A row of a `MediaTable`. Formats are read as attributes, like on `Media`: `row.gif`, `row.tiny_mp4` or `row.original`."""
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "MediaTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def provider(self) -> str:
+        return self._table.provider
+
+    @property
+    def id(self) -> str:
+        return self._table.ids[self._index]
+
+    @property
+    def url(self) -> Optional[str]:
+        return self._table.urls[self._index]
+
+    @property
+    def images(self) -> Dict[str, FormatView]:
+        return {name: view for name, view in ((name, self.format(name)) for name in self._table.formats) if view is not None}
+
+    def format(self, name: str) -> Optional[FormatView]:
+        """Returns a format of the row, or None if the media doesn't have it.
+
+        :param name: The name of the format, one of the table's `formats`.
+        :type name: str
+        :rtype: Optional[FormatView]
+        """
+        column = self._table.columns[name]
+        if column.urls[self._index] is None:
+            return None
+        return FormatView(column, self._index)
+
+    def __getattr__(self, name: str) -> Optional[FormatView]:
+        if name in self._table.columns:
+            return self.format(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __repr__(self) -> str:
+        return f"<MediaRow provider={self.provider!r} id={self.id!r}>"
+
+
+class MediaTable:
+    def __init__(self, provider: str, formats: Sequence[str]):
+        """Holds many media objects compactly, with each field stored as one column.
+
+        Only the id, the url and the url, size, dimensions and duration of the chosen formats are
+        kept. Numbers live in typed arrays, so a table costs a fraction of the JSON dicts behind the
+        `Media` objects it was built from, and `column`, `filter` and `sort` work over whole columns.
+        Rows are read through `MediaRow` views.
+
+        :param provider: The provider of the media, "tenor" or "giphy".
+        :type provider: str
+        :param formats: The formats kept: `Media` attribute names for Tenor, `images` keys for Giphy.
+        :type formats: Sequence[str]
+        """
+        self.provider = provider
+        self.formats = tuple(formats)
+        self.ids: List[str] = []
+        self.urls: List[Optional[str]] = []
+        self.columns: Dict[str, _Column] = {name: _Column() for name in self.formats}
+
+    @classmethod
+    def from_tenor(cls, media: Iterable[TenorMedia], *, formats: Sequence[str] = TENOR_FORMATS) -> "MediaTable":
+        """Builds a table from Tenor `Media` objects.
+
+        :rtype: MediaTable
+        """
+        table = cls("tenor", formats)
+        table.extend(media)
+        return table
+
+    @classmethod
+    def from_giphy(cls, media: Iterable[GiphyMedia], *, formats: Sequence[str] = GIPHY_FORMATS) -> "MediaTable":
+        """Builds a table from Giphy `Media` objects.
+
+        :rtype: MediaTable
+        """
+        table = cls("giphy", formats)
+        table.extend(media)
+        return table
+
+    @classmethod
+    async def collect(cls, media: AsyncIterable[Union[TenorMedia, GiphyMedia]], *, provider: str, formats: Optional[Sequence[str]] = None) -> "MediaTable":
+        """Builds a table from an async iterator such as `iter_trending`, so the full responses never pile up in memory.
+
+        :param media: The media to store.
+        :type media: AsyncIterable[Union[TenorMedia, GiphyMedia]]
+        :param provider: The provider of the media, "tenor" or "giphy".
+        :type provider: str
+        :param formats: The formats kept. Defaults to the provider's `TENOR_FORMATS` or `GIPHY_FORMATS`
+        :type formats: Optional[Sequence[str]], optional
+        :rtype: MediaTable
+        """
+        if formats is None:
+            formats = TENOR_FORMATS if provider == "tenor" else GIPHY_FORMATS
+        table = cls(provider, formats)
+        async for item in media:
+            table.append(item)
+        return table
+
+    def append(self, media: Union[TenorMedia, GiphyMedia]):
+        """Adds the fields of one `Media` object to the table.
+        """
+        self.ids.append(media.id)
+        self.urls.append(media.url)
+        if isinstance(media, GiphyMedia):
+            images = media.images
+            for name, column in self.columns.items():
+                image = images.get(name)
+                if image is None:
+                    column.append(None, None, None, None, None)
+                else:
+                    column.append(image.url, image.size, image.width, image.height, None)
+        else:
+            for name, column in self.columns.items():
+                fmt = getattr(media, name)
+                if fmt is None:
+                    column.append(None, None, None, None, None)
+                else:
+                    dims = fmt.dimensions or (None, None)
+                    column.append(fmt.url, fmt.size, dims[0], dims[1], getattr(fmt, "duration", None))
+
+    def extend(self, media: Iterable[Union[TenorMedia, GiphyMedia]]):
+        """Adds the fields of many `Media` objects to the table.
+        """
+        for item in media:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[MediaRow]:
+        for index in range(len(self.ids)):
+            yield MediaRow(self, index)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[MediaRow, "MediaTable"]:
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self.ids))))
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("MediaTable index out of range")
+        return MediaRow(self, index)
+
+    def column(self, format: str, field: str) -> array:
+        """Returns a whole column, such as the size of every `mp4`. Missing values are -1.
+
+        :param format: The name of the format.
+        :type format: str
+        :param field: One of "size", "width", "height" or "duration".
+        :type field: str
+        :rtype: array
+        """
+        if field not in FIELDS:
+            raise ValueError(f"unknown field {field!r}, expected one of {FIELDS}")
+        return getattr(self.columns[format], field)
+
+    def take(self, indices: Iterable[int]) -> "MediaTable":
+        """Returns a new table holding the rows at `indices`, in that order.
+
+        :rtype: MediaTable
+        """
+        indices = list(indices)
+        table = MediaTable(self.provider, self.formats)
+        table.ids = [self.ids[i] for i in indices]
+        table.urls = [self.urls[i] for i in indices]
+        table.columns = {name: column.take(indices) for name, column in self.columns.items()}
+        return table
+
+    def filter(self, format: str, *, max_bytes: Optional[int] = None, max_width: Optional[int] = None, max_height: Optional[int] = None, max_duration: Optional[float] = None) -> "MediaTable":
+        """Returns a new table with the rows whose `format` exists and meets every limit. Unknown values don't rule a row out.
+
+        :param format: The name of the format checked.
+        :type format: str
+        :param max_bytes: The maximum file size in bytes, defaults to None
+        :type max_bytes: Optional[int], optional
+        :param max_width: The maximum width in pixels, defaults to None
+        :type max_width: Optional[int], optional
+        :param max_height: The maximum height in pixels, defaults to None
+        :type max_height: Optional[int], optional
+        :param max_duration: The maximum duration, defaults to None
+        :type max_duration: Optional[float], optional
+        :rtype: MediaTable
+        """
+        column = self.columns[format]
+        keep = [i for i, url in enumerate(column.urls) if url is not None]
+        for values, limit in ((column.size, max_bytes), (column.width, max_width), (column.height, max_height), (column.duration, max_duration)):
+            if limit is not None:
+                keep = [i for i in keep if values[i] <= limit]
+        return self.take(keep)
+
+    def sort(self, format: str, field: str = "size", *, reverse: bool = False) -> "MediaTable":
+        """Returns a new table sorted by a column, such as the size of the `gif`. Rows missing the value come last.
+
+        :rtype: MediaTable
+        """
+        values = self.column(format, field)
+        known = sorted((i for i in range(len(values)) if values[i] != _NONE), key = values.__getitem__, reverse = reverse)
+        return self.take(known + [i for i in range(len(values)) if values[i] == _NONE])
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the approximate memory used by the table in bytes.
+
+        :rtype: int
+        """
+        total = sum(sys.getsizeof(s) for s in self.ids) + sum(sys.getsizeof(s) for s in self.urls if s is not None)
+        total += sys.getsizeof(self.ids) + sys.getsizeof(self.urls)
+        for column in self.columns.values():
+            total += sys.getsizeof(column.urls) + sum(sys.getsizeof(s) for s in column.urls if s is not None)
+            total += sum(getattr(column, field).itemsize * len(getattr(column, field)) for field in FIELDS)
+        return total
@@ -0,0 +1,51 @@
+import json
+from typing import Any, Callable, Dict, Optional
+
+Decoder = Callable[[bytes], Any]
+
+
+def _orjson() -> Decoder:
+    import orjson
+    return orjson.loads
+
+def _msgspec() -> Decoder:
+    import msgspec
+    return msgspec.json.Decoder().decode
+
+def _ujson() -> Decoder:
+    import ujson
+    return ujson.loads
+
+def _stdlib() -> Decoder:
+    return json.loads
+
+
+BACKENDS: Dict[str, Callable[[], Decoder]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "ujson": _ujson,
+    "json": _stdlib,
+}
+
+
+def get_decoder(name: Optional[str] = None) -> Decoder:
+    """Returns a function decoding a JSON body from bytes.
+
+    :param name: One of "orjson", "msgspec", "ujson" or "json". If None, the fastest installed backend is used, defaults to None
+    :type name: Optional[str], optional
+    :raises ImportError: If the requested backend isn't installed.
+    :raises ValueError: If the backend is unknown.
+    :return: The decoding function.
+    :rtype: Callable[[bytes], Any]
+    """
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend {name!r}. Choose from {', '.join(BACKENDS)}")
+        return BACKENDS[name]()
+
+    for loader in BACKENDS.values():
+        try:
+            return loader()
+        except ImportError:
+            continue
+    return json.loads
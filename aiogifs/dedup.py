@@ -0,0 +1,261 @@
+import asyncio
+import io
+from collections import OrderedDict
+from typing import AsyncIterable, AsyncIterator, Dict, Hashable, Iterable, List, Optional, Set, Tuple, TypeVar, Union
+from urllib.parse import urlsplit
+
+from .giphy.models import Media as GiphyMedia
+from .models import Gif
+from .tenor.models import Media as TenorMedia
+
+AnyMedia = Union[TenorMedia, GiphyMedia, Gif]
+T = TypeVar("T")
+
+# CDN hosts serving the same files under different names
+_HOST_ALIASES = {
+    "media0.giphy.com": "media.giphy.com",
+    "media1.giphy.com": "media.giphy.com",
+    "media2.giphy.com": "media.giphy.com",
+    "media3.giphy.com": "media.giphy.com",
+    "media4.giphy.com": "media.giphy.com",
+    "i.giphy.com": "media.giphy.com",
+    "c.tenor.com": "media.tenor.com",
+    "media1.tenor.com": "media.tenor.com",
+}
+
+
+def normalize_url(url: str) -> str:
+    """Reduces a media url to the parts naming the file: the host, with CDN aliases folded, and the path.
+
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    return _HOST_ALIASES.get(host, host) + parts.path.rstrip("/")
+
+
+def fingerprints(media: AnyMedia) -> List[Hashable]:
+    """Returns the cheap fingerprints of a media object: its normalized file urls and the size and
+    dimensions of its files. Two objects sharing any fingerprint are considered the same media.
+
+    :param media: A Tenor or Giphy `Media` object, or a `Gif`.
+    :type media: Union[TenorMedia, GiphyMedia, Gif]
+    :rtype: List[Hashable]
+    """
+    urls = []
+    files = []
+    if isinstance(media, TenorMedia):
+        gif = media.gif
+        mp4 = media.mp4
+        if gif is not None:
+            urls.append(gif.url)
+            files.append(("gif", gif.size, *(gif.dimensions or (None, None))))
+        if mp4 is not None:
+            urls.append(mp4.url)
+            files.append(("mp4", mp4.size, *(mp4.dimensions or (None, None)), mp4.duration))
+    elif isinstance(media, GiphyMedia):
+        original = media.original
+        if original is not None:
+            urls.extend((original.url, original.mp4))
+            files.append(("gif", original.size, original.width, original.height))
+    else:
+        urls.extend((media.url, media.mp4_url))
+        files.append(("gif", media.size, media.width, media.height))
+
+    keys: List[Hashable] = [normalize_url(url) for url in urls if url]
+    # a tuple only identifies a file if its size is known
+    keys.extend(key for key in files if key[1] and None not in key[2:4])
+    return keys
+
+
+def preview_url(media: AnyMedia) -> Optional[str]:
+    """Returns the url of a small still image of the media, used for perceptual hashing.
+
+    :rtype: Optional[str]
+    """
+    if isinstance(media, TenorMedia):
+        for fmt in (media.nano_gif, media.tiny_gif, media.gif):
+            if fmt is not None and fmt.preview_url:
+                return fmt.preview_url
+        return None
+    return media.preview_url
+
+
+def dhash(image: bytes, size: int = 8) -> int:
+    """Computes the difference hash of an image: one bit per pair of neighbouring pixels of a
+    `size + 1` by `size` grayscale thumbnail. Similar images get hashes differing in few bits.
+
+    Requires Pillow.
+
+    :param image: The encoded image, such as a PNG or the first frame of a GIF.
+    :type image: bytes
+    :param size: The number of rows and bit columns of the thumbnail, defaults to 8
+    :type size: int, optional
+    :raises ImportError: If Pillow isn't installed.
+    :rtype: int
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image)) as img:
+        # one byte per pixel in "L" mode
+        pixels = img.convert("L").resize((size + 1, size)).tobytes()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = value << 1 | (left > right)
+    return value
+
+
+class Deduplicator:
+    def __init__(self, *, max_entries: int = 100_000, client = None, max_distance: int = 3, max_preview_bytes: int = 512 * 1024):
+        """Drops media already seen in a stream of results, across providers and pages.
+
+        Media are first compared by cheap fingerprints (see `fingerprints`). When a `client` is passed,
+        the preview image of media passing that check is downloaded and compared by perceptual hash
+        too, which catches re-encoded copies. Only the last `max_entries` media are remembered, so
+        memory stays bounded however long a pagination runs.
+
+        :param max_entries: The number of media remembered, defaults to 100_000
+        :type max_entries: int, optional
+        :param client: A `TenorClient`, `GiphyClient` or `HTTPClient` used to download previews. Enables perceptual hashing, which requires Pillow, defaults to None
+        :param max_distance: The number of differing hash bits under which two previews are the same media, defaults to 3
+        :type max_distance: int, optional
+        :param max_preview_bytes: Skips perceptual hashing of previews bigger than this, defaults to 512 KiB
+        :type max_preview_bytes: int, optional
+        :raises ImportError: If a client is passed but Pillow isn't installed.
+        """
+        if client is not None:
+            try:
+                import PIL  # noqa: F401
+            except ImportError:
+                raise ImportError("Perceptual hashing requires Pillow. Install it with `pip install aiogifs[phash]`") from None
+        self.max_entries = max_entries
+        self.client = client
+        self.max_distance = max_distance
+        self.max_preview_bytes = max_preview_bytes
+        self.dropped = 0
+        # each remembered media and the fingerprints and hash it was stored under
+        self._entries: "OrderedDict[int, Tuple[List[Hashable], Optional[int]]]" = OrderedDict()
+        self._keys: Dict[Hashable, int] = {}
+        self._counter = 0
+        # a hash differing in at most `max_distance` bits matches in at least one of `max_distance + 1` bands
+        self._bands = max_distance + 1
+        self._band_bits = 64 // self._bands
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(self._bands)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of media remembered and of duplicates dropped.
+
+        :rtype: Dict[str, int]
+        """
+        return {"entries": len(self._entries), "dropped": self.dropped}
+
+    async def is_duplicate(self, media: AnyMedia) -> bool:
+        """Returns whether the media was seen before, and remembers it if it wasn't.
+
+        :param media: A Tenor or Giphy `Media` object, or a `Gif`.
+        :type media: Union[TenorMedia, GiphyMedia, Gif]
+        :rtype: bool
+        """
+        keys = fingerprints(media)
+        if any(key in self._keys for key in keys):
+            self.dropped += 1
+            return True
+        # remembered before hashing, so a copy checked while the preview downloads is caught by its fingerprints
+        entry = self._remember(keys)
+        if self.client is None:
+            return False
+        phash = await self._hash(media)
+        if phash is None or entry not in self._entries:
+            return False
+        if self._near(phash):
+            self._forget(entry, self._entries.pop(entry))
+            self.dropped += 1
+            return True
+        self._index(entry, phash)
+        return False
+
+    async def filter(self, media: AsyncIterable[T]) -> AsyncIterator[T]:
+        """Yields the media of an async iterator, such as `iter_search`, skipping duplicates.
+
+        :param media: The media to filter.
+        :type media: AsyncIterable[T]
+        :rtype: AsyncIterator[T]
+        """
+        async for item in media:
+            if not await self.is_duplicate(item):
+                yield item
+
+    async def unique(self, media: Iterable[T]) -> List[T]:
+        """Returns the media of a list, such as `TenorResponse.media`, without duplicates.
+
+        :param media: The media to filter.
+        :type media: Iterable[T]
+        :rtype: List[T]
+        """
+        return [item for item in media if not await self.is_duplicate(item)]
+
+    def clear(self):
+        """Forgets every media seen.
+        """
+        self._entries.clear()
+        self._keys.clear()
+        for bucket in self._buckets:
+            bucket.clear()
+
+    async def _hash(self, media: AnyMedia) -> Optional[int]:
+        url = preview_url(media)
+        if not url:
+            return None
+        try:
+            chunks = [chunk async for chunk in self.client.stream(url, max_size = self.max_preview_bytes)]
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, dhash, b"".join(chunks))
+        except Exception:
+            # a preview that can't be fetched or decoded leaves the cheap fingerprints to decide
+            return None
+
+    def _band(self, phash: int, band: int) -> int:
+        return phash >> (band * self._band_bits) & ((1 << self._band_bits) - 1)
+
+    def _near(self, phash: int) -> bool:
+        for band, bucket in enumerate(self._buckets):
+            for entry in bucket.get(self._band(phash, band), ()):
+                other = self._entries[entry][1]
+                if bin(phash ^ other).count("1") <= self.max_distance:
+                    return True
+        return False
+
+    def _remember(self, keys: List[Hashable]) -> int:
+        entry = self._counter
+        self._counter += 1
+        self._entries[entry] = (keys, None)
+        for key in keys:
+            self._keys[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._forget(*self._entries.popitem(last = False))
+        return entry
+
+    def _index(self, entry: int, phash: int):
+        self._entries[entry] = (self._entries[entry][0], phash)
+        for band, bucket in enumerate(self._buckets):
+            bucket.setdefault(self._band(phash, band), set()).add(entry)
+
+    def _forget(self, entry: int, value: Tuple[List[Hashable], Optional[int]]):
+        keys, phash = value
+        for key in keys:
+            if self._keys.get(key) == entry:
+                del self._keys[key]
+        if phash is not None:
+            for band, bucket in enumerate(self._buckets):
+                members = bucket.get(self._band(phash, band))
+                if members is not None:
+                    members.discard(entry)
+                    if not members:
+                        del bucket[self._band(phash, band)]
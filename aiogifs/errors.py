@@ -0,0 +1,19 @@
+
+class MediaTooLarge(Exception):
+    """Raised when a download is bigger than the allowed maximum size.
+    """
+    def __init__(self, url: str, size: int, max_size: int):
+        self.url = url
+        self.size = size
+        self.max_size = max_size
+        super().__init__(f"{url} is {size} bytes, more than the allowed {max_size} bytes")
+
+
+class CircuitOpen(Exception):
+    """Raised when a request is refused because its endpoint keeps failing and no cached response is available.
+    """
+    def __init__(self, provider: str, endpoint: str, retry_after: float):
+        self.provider = provider
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(f"the circuit of {provider} {endpoint} is open, retry in {retry_after:.1f} seconds")
@@ -1,8 +1,82 @@
-from typing import List
+from typing import Dict, List, Optional
+
+
+def _to_int(value) -> Optional[int]:
+    # Giphy sends sizes and dimensions as strings
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+class Image:
+    __slots__ = ("_data",)
+
+    def __init__(self, *, data: dict):
+        self._data = data
+
+    @property
+    def url(self) -> Optional[str]:
+        """Returns the url of the GIF rendition, if the rendition has one.
+
+        :rtype: Optional[str]
+        """
+        return self._data.get("url")
+
+    @property
+    def width(self) -> Optional[int]:
+        """Returns the width of the rendition in pixels.
+
+        :rtype: Optional[int]
+        """
+        return _to_int(self._data.get("width"))
+
+    @property
+    def height(self) -> Optional[int]:
+        """Returns the height of the rendition in pixels.
+
+        :rtype: Optional[int]
+        """
+        return _to_int(self._data.get("height"))
+
+    @property
+    def size(self) -> Optional[int]:
+        """Returns the size of the GIF rendition in bytes.
+
+        :rtype: Optional[int]
+        """
+        return _to_int(self._data.get("size"))
+
+    @property
+    def mp4(self) -> Optional[str]:
+        """Returns the url of the MP4 version of the rendition, if there is one.
+
+        :rtype: Optional[str]
+        """
+        return self._data.get("mp4")
+
+    @property
+    def mp4_size(self) -> Optional[int]:
+        """Returns the size of the MP4 version of the rendition in bytes.
+
+        :rtype: Optional[int]
+        """
+        return _to_int(self._data.get("mp4_size"))
+
+    @property
+    def webp(self) -> Optional[str]:
+        """Returns the url of the WebP version of the rendition, if there is one.
+
+        :rtype: Optional[str]
+        """
+        return self._data.get("webp")
+
 
 class Media:
+    __slots__ = ("_data", "_images")
+
     def __init__(self, *, data: dict):
         self._data = data
+        self._images: Optional[Dict[str, Image]] = None
 
     @property
     def type(self) -> str:
@@ -76,8 +150,42 @@ class Media:
         """
         return self._data.get("rating")
 
+    @property
+    def images(self) -> Dict[str, Image]:
+        """Returns the renditions of the Media Object keyed by name, such as `original` or `fixed_height`.
+
+        See https://developers.giphy.com/docs/optional-settings/#rendition-guide for every rendition.
+
+        :rtype: Dict[str, Image]
+        """
+        if self._images is None:
+            self._images = {k: Image(data = v) for k, v in (self._data.get("images") or {}).items()}
+        return self._images
+
+    @property
+    def original(self) -> Optional[Image]:
+        """Returns the `original` rendition of the Media Object.
+
+        :rtype: Optional[Image]
+        """
+        return self.images.get("original")
+
+    @property
+    def preview_url(self) -> Optional[str]:
+        """Returns the url of a still preview of the Media Object.
+
+        :rtype: Optional[str]
+        """
+        for name in ("fixed_width_still", "original_still", "downsized_still"):
+            image = self.images.get(name)
+            if image is not None and image.url:
+                return image.url
+        return None
+
 
 class Meta:
+    __slots__ = ("_payload",)
+
     def __init__(self, *, payload: dict):
         self._payload = payload
 
@@ -114,22 +222,70 @@ class Meta:
         return self._payload.get("response_id")
 
 
+class Pagination:
+    __slots__ = ("_payload",)
+
+    def __init__(self, *, payload: dict):
+        self._payload = payload
+
+    @property
+    def total_count(self) -> int:
+        """Returns the total number of results available.
+
+        :rtype: int
+        """
+        return self._payload.get("total_count")
+
+    @property
+    def count(self) -> int:
+        """Returns the number of results in this response.
+
+        :rtype: int
+        """
+        return self._payload.get("count")
+
+    @property
+    def offset(self) -> int:
+        """Returns the position of the first result of this response.
+
+        :rtype: int
+        """
+        return self._payload.get("offset")
+
+    @property
+    def next_offset(self) -> Optional[int]:
+        """Returns the offset of the next page of results.
+
+        :return: The offset to pass to fetch the next page, or None if this is the last one.
+        :rtype: Optional[int]
+        """
+        offset = (self.offset or 0) + (self.count or 0)
+        total = self.total_count
+        if not self.count or (total is not None and offset >= total):
+            return None
+        return offset
+
+
 class GiphyResponse:
+    __slots__ = ("_rp", "_media", "_meta", "_pagination")
+
     def __init__(self, *, raw_payload: dict):
         self._rp = raw_payload
+        self._media: Optional[List[Media]] = None
+        self._meta: Optional[Meta] = None
+        self._pagination: Optional[Pagination] = None
 
     @property
     def media(self) -> List[Media]:
-        """Returns a list of Media Objects.
+        """Returns a list of Media Objects. The list is built once and reused.
 
         :return: A list of Media Objects containing properties such as `.url`
         :rtype: List[Media]
         """
-        media_objs = []
-        for i in self._rp.get("data"):
-            media_objs.append(Media(data = i))
+        if self._media is None:
+            self._media = [Media(data = i) for i in self._rp.get("data")]
 
-        return media_objs
+        return self._media
 
     @property
     def meta(self) -> Meta:
@@ -138,6 +294,25 @@ class GiphyResponse:
         :return: Meta Object - Holds request information.
         :rtype: Meta
         """
-        meta_array = self._rp.get("meta")
-        return Meta(payload = meta_array)
+        if self._meta is None:
+            self._meta = Meta(payload = self._rp.get("meta"))
+        return self._meta
+
+    @property
+    def pagination(self) -> Pagination:
+        """Returns the Pagination object.
+
+        :return: Pagination Object - Holds the offset and counts of the results.
+        :rtype: Pagination
+        """
+        if self._pagination is None:
+            self._pagination = Pagination(payload = self._rp.get("pagination") or {})
+        return self._pagination
 
+    @property
+    def raw(self) -> dict:
+        """Returns the raw json payload received from the Giphy API.
+
+        :rtype: dict
+        """
+        return self._rp
@@ -0,0 +1,74 @@
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class HedgePolicy:
+    def __init__(self, *, percentile: float = 0.95, min_delay: float = 0.02, max_delay: Optional[float] = None, min_samples: int = 20, window: int = 256):
+        """Decides when `HTTPClient` sends a duplicate of a slow request.
+
+        Latencies are tracked per endpoint. Once `min_samples` requests have completed, a request still
+        running after the `percentile` latency of the last `window` requests is sent again, and whichever
+        copy completes first is used.
+
+        :param percentile: The latency percentile after which a request is hedged, defaults to 0.95
+        :type percentile: float, optional
+        :param min_delay: The shortest delay in seconds before hedging, defaults to 0.02
+        :type min_delay: float, optional
+        :param max_delay: The longest delay in seconds before hedging. None leaves it unbounded, defaults to None
+        :type max_delay: Optional[float], optional
+        :param min_samples: How many latencies must be known before requests to an endpoint are hedged, defaults to 20
+        :type min_samples: int, optional
+        :param window: How many recent latencies are kept per endpoint, defaults to 256
+        :type window: int, optional
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.hedged = 0
+        self.hedges_won = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._delays: Dict[str, Optional[float]] = {}
+
+    def record(self, endpoint: str, latency: float):
+        """Records the latency in seconds of a completed request.
+
+        :param endpoint: The endpoint the request was sent to.
+        :type endpoint: str
+        :param latency: How long the request took.
+        :type latency: float
+        """
+        samples = self._latencies.get(endpoint)
+        if samples is None:
+            samples = self._latencies[endpoint] = deque(maxlen = self.window)
+        samples.append(latency)
+        self._delays.pop(endpoint, None)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """Returns how long to wait before hedging a request to `endpoint`.
+
+        :param endpoint: The endpoint the request is sent to.
+        :type endpoint: str
+        :return: The delay in seconds, or None if too few latencies are known yet.
+        :rtype: Optional[float]
+        """
+        if endpoint in self._delays:
+            return self._delays[endpoint]
+        samples = self._latencies.get(endpoint)
+        delay = None
+        if samples is not None and len(samples) >= self.min_samples:
+            ordered = sorted(samples)
+            delay = max(ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)], self.min_delay)
+            if self.max_delay is not None:
+                delay = min(delay, self.max_delay)
+        self._delays[endpoint] = delay
+        return delay
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Returns how many requests were hedged and how many of those the duplicate won.
+
+        :rtype: Dict[str, int]
+        """
+        return {"hedged": self.hedged, "hedges_won": self.hedges_won}
@@ -0,0 +1,550 @@
+import aiohttp
+import asyncio
+import hashlib
+import inspect
+import os
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type, Union
+import warnings
+from .breaker import CircuitBreaker, Permit
+from .cache import CacheBackend, MemoryCache, make_cache_key
+from .decoders import get_decoder
+from .errors import CircuitOpen, MediaTooLarge
+from .hedging import HedgePolicy
+from .instrumentation import Hooks, RequestEvent
+from .ratelimit import RateLimiter
+from .transport import Transport
+from .utils import gather_bounded
+
+# the permit of every request sent without a breaker, which nobody reads
+_UNCHECKED = Permit(False, 0)
+
+
+class Route:
+    BASE = ""
+    def __init__(self, endpoint: str, params: dict, method: str = "GET", **kwargs):
+        self.method = method
+        self.endpoint = endpoint
+        self.path = endpoint.format(**kwargs)
+        self.url = self.BASE + self.path
+        self.params = params
+        self.headers: Dict[str, str] = {}
+
+
+
+class _Validator:
+    __slots__ = ("etag", "last_modified", "digest", "data", "size")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], digest: bytes, data: dict, size: int):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.data = data
+        self.size = size
+
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class _InFlight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class HTTPClient:
+    """The HTTP layer shared by the provider clients.
+
+    Subclasses set `PROVIDER`, the name reported to instrumentation hooks, `AUTH_PARAM`, the name of
+    the query parameter carrying the API key, and `DEFAULT_TTLS`, the cache lifetime in seconds of
+    each cacheable endpoint. `ROUTE`, `RESULTS_KEY` and `MAX_IDS` describe the provider's lookup by
+    ID endpoint for `lookup`.
+
+    Responses of the endpoints in `REVALIDATE` are kept with their validators: the ETag and
+    Last-Modified headers, and a hash of the body. Refetching them sends a conditional request.
+    A `304`, or a body with the same hash, returns the payload decoded before, so the response is
+    neither decoded again nor, with a conditional request, downloaded again. At most
+    `MAX_VALIDATORS` responses, with bodies totalling `MAX_VALIDATOR_BYTES`, are kept this way.
+    """
+    PROVIDER = "unknown"
+    AUTH_PARAM = "api_key"
+    DEFAULT_TTLS: Dict[str, float] = {}
+    ROUTE: Type[Route] = Route
+    RESULTS_KEY = "results"
+    MAX_IDS = 50
+    REVALIDATE: Tuple[str, ...] = ()
+    MAX_VALIDATORS = 256
+    MAX_VALIDATOR_BYTES = 16 * 1024 * 1024
+    DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total = 10, sock_connect = 3, sock_read = 5)
+    DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total = None, sock_connect = 3, sock_read = 30)
+
+    def __init__(self, *, api_key: Optional[str] = None, session: Optional[aiohttp.ClientSession] = None, cache: Union[CacheBackend, bool, None] = True, cache_ttls: Optional[Dict[str, float]] = None, rate_limiter: Optional[RateLimiter] = None, transport: Optional[Transport] = None, json_loads: Optional[Callable[[bytes], dict]] = None, timeout: Optional[aiohttp.ClientTimeout] = None, timeouts: Optional[Dict[str, aiohttp.ClientTimeout]] = None, hedging: Optional[HedgePolicy] = None, hooks: Sequence[Hooks] = (), base_url: Optional[str] = None, breaker: Optional[CircuitBreaker] = None):
+        self._session = session
+        # whether the session was acquired from the transport, and so is released to it rather than closed
+        self._acquired = False
+        self._auth = api_key
+        if cache is True:
+            cache = MemoryCache(stale_ttl = breaker.stale_ttl if breaker is not None else 0.0)
+        self.cache: Optional[CacheBackend] = cache if isinstance(cache, CacheBackend) else None
+        self.cache_ttls = dict(self.DEFAULT_TTLS)
+        if cache_ttls:
+            self.cache_ttls.update(cache_ttls)
+        self._inflight: Dict[str, _InFlight] = {}
+        self.rate_limiter = rate_limiter
+        self.transport = transport
+        self.json_loads = json_loads or get_decoder()
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.timeouts = dict(timeouts or {})
+        self.hedging = hedging
+        self.hooks = list(hooks)
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.breaker = breaker
+        self._session_lock: Optional[asyncio.Lock] = None
+        self.revalidate = set(self.REVALIDATE)
+        self._validators: "OrderedDict[str, _Validator]" = OrderedDict()
+        self._validator_bytes = 0
+
+    async def open_session(self):
+        if self._session is not None and self._session.closed:
+            self._session = None
+        if not self._session and self.transport is not None:
+            self._session = await self.transport.acquire()
+            self._acquired = True
+        elif not self._session:
+            self._session = aiohttp.ClientSession(raise_for_status = True)
+        else:
+            if not self._session.raise_for_status:
+                warnings.warn("raise_for_status is not enabled on your ClientSession. No HTTP Error raising is enabled!")
+
+    async def ensure_session(self) -> aiohttp.ClientSession:
+        """Returns the session, opening it on first use. Concurrent first requests open it only once.
+
+        :rtype: aiohttp.ClientSession
+        """
+        session = self._session
+        if session is not None and not session.closed:
+            return session
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                await self.open_session()
+        return self._session
+
+    def cache_key(self, route: Route) -> str:
+        return make_cache_key(route.url, route.params, exclude = (self.AUTH_PARAM,))
+
+    async def request(self, route: Route, *, cache: bool = True) -> dict:
+        """Sends a request to the API and returns the decoded payload.
+
+        Concurrent GET requests for the same route and params share a single network call, so every
+        caller receives the same payload object. Callers must not mutate it. Passing `cache = False`
+        skips the response cache for this request.
+        """
+        if self._auth and route.params.get(self.AUTH_PARAM) is None:
+            route.params.update({self.AUTH_PARAM: self._auth})
+        if self.base_url is not None:
+            route.url = self.base_url + route.path
+
+        key = self.cache_key(route)
+        ttl = self.cache_ttls.get(route.endpoint, 0) if cache and self.cache is not None else 0
+        if ttl > 0:
+            cached = await self.cache.get(key)
+            if cached is None and self.breaker is not None and route.method == "GET":
+                # stale-while-revalidate: an entry expired within the breaker's `stale_ttl` is
+                # answered at once and refreshed in the background
+                cached = await self.cache.get(key, stale = True)
+                if cached is not None:
+                    self._refresh(route, key, ttl)
+            if cached is not None:
+                if self.hooks:
+                    self._emit("on_cache_hit", self._event(route))
+                return cached
+
+        if route.method != "GET":
+            permit = self._allow(route)
+            if permit is None:
+                return await self._fallback(route, key, ttl)
+            return await self._fetch(route, key, ttl, permit)
+
+        call = self._inflight.get(key)
+        if call is None:
+            permit = self._allow(route)
+            if permit is None:
+                return await self._fallback(route, key, ttl)
+            call = _InFlight(asyncio.ensure_future(self._fetch(route, key, ttl, permit)))
+            call.task.add_done_callback(partial(self._forget, key, call))
+            self._inflight[key] = call
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            # the request is only abandoned once nobody is left waiting on it
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+                # new callers must not join a request that is being cancelled
+                if self._inflight.get(key) is call:
+                    del self._inflight[key]
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _refresh(self, route: Route, key: str, ttl: float):
+        # joins a request already in flight, and leaves an open circuit alone
+        if key in self._inflight:
+            return
+        permit = self._allow(route)
+        if permit is None:
+            return
+        call = _InFlight(asyncio.ensure_future(self._fetch(route, key, ttl, permit)))
+        call.task.add_done_callback(partial(self._forget, key, call))
+        self._inflight[key] = call
+
+    async def lookup(self, endpoint: str, ids: Iterable[str], *, params: Optional[dict] = None, concurrency: int = 4) -> Dict[str, dict]:
+        """Resolves objects by ID through an endpoint taking a comma separated `ids` parameter.
+
+        Every object is cached on its own under the endpoint's TTL, so IDs seen before are answered
+        from the cache whatever batch they arrived in. The remaining IDs are packed into batches of
+        `MAX_IDS`, sent with at most `concurrency` requests in flight.
+
+        :param endpoint: The lookup endpoint, such as "/gifs".
+        :type endpoint: str
+        :param ids: The IDs to resolve. Duplicates are looked up once.
+        :type ids: Iterable[str]
+        :param params: Other query parameters sent with every batch, defaults to None
+        :type params: Optional[dict], optional
+        :param concurrency: The maximum number of batches in flight at once, defaults to 4
+        :type concurrency: int, optional
+        :raises Exception: The error of the first failed batch, once every batch completed.
+        :return: The raw objects keyed by ID. IDs unknown to the API, or whose object is unusable, are left out.
+        :rtype: Dict[str, dict]
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        ids = list(dict.fromkeys(str(id) for id in ids))
+        ttl = self.cache_ttls.get(endpoint, 0) if self.cache is not None else 0
+        url = self.ROUTE(endpoint, {}).url
+        keys = {id: make_cache_key(f"{url}/{id}", params) for id in ids}
+
+        found: Dict[str, dict] = {}
+        if ttl > 0 and ids:
+            cached = await asyncio.gather(*(self.cache.get(keys[id]) for id in ids))
+            found = {id: obj for id, obj in zip(ids, cached) if obj is not None}
+        missing = [id for id in ids if id not in found]
+
+        async def fetch(batch: List[str]) -> List[dict]:
+            data = await self.request(self.ROUTE(endpoint, dict(params, ids = ",".join(batch))), cache = False)
+            return data.get(self.RESULTS_KEY) or []
+
+        batches = [missing[i:i + self.MAX_IDS] for i in range(0, len(missing), self.MAX_IDS)]
+        error = None
+        for result in await gather_bounded(fetch, batches, concurrency = concurrency):
+            if isinstance(result, Exception):
+                error = error or result
+                continue
+            for obj in result:
+                if not self._usable(obj):
+                    continue
+                id = str(obj.get("id"))
+                found[id] = obj
+                if ttl > 0 and id in keys:
+                    await self.cache.set(keys[id], obj, ttl = ttl)
+        if error is not None:
+            raise error
+        return found
+
+    def _usable(self, obj: dict) -> bool:
+        # objects failing this are treated as unknown by `lookup`, and aren't cached
+        return True
+
+    def _circuit(self, route: Route) -> str:
+        return f"{self.PROVIDER}:{route.endpoint}"
+
+    def _allow(self, route: Route) -> Optional[Permit]:
+        # None when the circuit refuses the request
+        if self.breaker is None:
+            return _UNCHECKED
+        return self.breaker.allow(self._circuit(route))
+
+    async def _fallback(self, route: Route, key: str, ttl: float) -> dict:
+        # the circuit is open: answer from the cache even if the entry expired, or fail fast
+        if ttl > 0:
+            stale = await self.cache.get(key, stale = True)
+            if stale is not None:
+                if self.hooks:
+                    self._emit("on_cache_hit", self._event(route))
+                return stale
+        circuit = self._circuit(route)
+        raise CircuitOpen(self.PROVIDER, route.endpoint, self.breaker.retry_after(circuit))
+
+    def _event(self, route: Route) -> RequestEvent:
+        return RequestEvent(provider = self.PROVIDER, endpoint = route.endpoint, method = route.method, url = route.url)
+
+    def _emit(self, name: str, event: RequestEvent):
+        for hook in self.hooks:
+            try:
+                getattr(hook, name)(event)
+            except Exception as e:
+                # a broken hook must not fail the request it observes
+                warnings.warn(f"{type(hook).__name__}.{name} raised {e!r}", RuntimeWarning)
+
+    async def _fetch(self, route: Route, key: str, ttl: float, permit: Permit) -> dict:
+        event = self._event(route) if self.hooks else None
+        if event is not None:
+            self._emit("on_request_start", event)
+
+        validator = None
+        if route.endpoint in self.revalidate:
+            validator = self._validators.get(key)
+            if validator is not None:
+                route.headers.update(validator.headers())
+
+        limiter = self.rate_limiter
+        attempt = 0
+        try:
+            while True:
+                try:
+                    status, body, headers = await self._send(route)
+                except aiohttp.ClientResponseError as e:
+                    if e.status != 429 or limiter is None or attempt >= limiter.max_retries:
+                        raise
+                    limiter.throttle(e.headers or {}, attempt)
+                    attempt += 1
+                    if event is not None:
+                        event.attempt = attempt
+                        self._emit("on_retry", event)
+                    continue
+                if status != 304 or validator is not None:
+                    break
+                # the validator the conditional headers came from was evicted, so there is nothing
+                # to serve the 304 from. The full body is asked for again
+                conditional = [route.headers.pop(name, None) for name in ("If-None-Match", "If-Modified-Since")]
+                if not any(conditional):
+                    break
+
+            decode_start = time.monotonic()
+            digest = hashlib.blake2b(body, digest_size = 16).digest() if route.endpoint in self.revalidate and status != 304 else None
+            if validator is not None and (status == 304 or digest == validator.digest):
+                # unchanged: hand out the payload decoded before, and the models built from it
+                data = validator.data
+                if status != 304:
+                    validator.etag = headers.get("ETag")
+                    validator.last_modified = headers.get("Last-Modified")
+                self._validators.move_to_end(key)
+                if event is not None:
+                    event.extra["revalidated"] = True
+            else:
+                data = self.json_loads(body)
+                if digest is not None:
+                    self._keep_validator(key, _Validator(headers.get("ETag"), headers.get("Last-Modified"), digest, data, len(body)))
+            if event is not None:
+                event.status = status
+                event.bytes = len(body)
+                event.decode_time = time.monotonic() - decode_start
+            if self.breaker is not None:
+                self.breaker.record(self._circuit(route), True, permit)
+        except BaseException as e:
+            if self.breaker is not None:
+                if isinstance(e, Exception):
+                    self.breaker.record(self._circuit(route), not self.breaker.is_failure(e), permit)
+                else:
+                    self.breaker.release(self._circuit(route), permit)
+            if event is not None:
+                event.error = e
+                event.status = getattr(e, "status", None)
+            raise
+        finally:
+            if event is not None:
+                event.duration = time.monotonic() - event.started
+                self._emit("on_request_end", event)
+
+        if ttl > 0:
+            await self.cache.set(key, data, ttl = ttl, size = len(body) or (validator.size if validator is not None else None))
+        return data
+
+    def _keep_validator(self, key: str, validator: _Validator):
+        # the decoded payload is kept too, so the validators are bounded by body size as well as count
+        old = self._validators.pop(key, None)
+        if old is not None:
+            self._validator_bytes -= old.size
+        if validator.size <= self.MAX_VALIDATOR_BYTES:
+            self._validators[key] = validator
+            self._validator_bytes += validator.size
+        while len(self._validators) > self.MAX_VALIDATORS or self._validator_bytes > self.MAX_VALIDATOR_BYTES:
+            _, evicted = self._validators.popitem(last = False)
+            self._validator_bytes -= evicted.size
+
+    async def _send(self, route: Route) -> Tuple[int, bytes, Mapping[str, str]]:
+        policy = self.hedging
+        delay = policy.delay(route.endpoint) if policy is not None and route.method == "GET" else None
+        if delay is None:
+            return await self._attempt(route)
+
+        first = asyncio.ensure_future(self._attempt(route))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout = delay)
+            if not done:
+                policy.hedged += 1
+                tasks.add(asyncio.ensure_future(self._attempt(route)))
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when = asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.discard(task)
+                    if task.exception() is None or not tasks:
+                        if task is not first:
+                            policy.hedges_won += 1
+                        return task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _attempt(self, route: Route) -> Tuple[int, bytes, Mapping[str, str]]:
+        limiter = self.rate_limiter
+        if limiter is not None:
+            await limiter.acquire()
+        start = time.monotonic()
+        timeout = self.timeouts.get(route.endpoint, self.timeout)
+        session = await self.ensure_session()
+        async with session.request(route.method, route.url, params = route.params, headers = route.headers or None, timeout = timeout) as resp:
+            if resp.status == 429:
+                resp.raise_for_status()
+            if limiter is not None:
+                limiter.update(resp.headers)
+            body = await resp.read()
+            status = resp.status
+            headers = resp.headers
+        if self.hedging is not None:
+            self.hedging.record(route.endpoint, time.monotonic() - start)
+        return status, body, headers
+
+    def _forget(self, key: str, call: _InFlight, task: asyncio.Future):
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception() # marks the exception as retrieved when every waiter went away
+
+    async def stream(self, media: Union[str, Any], *, chunk_size: int = 64 * 1024, start: int = 0, max_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Streams a media file in chunks of at most `chunk_size` bytes, without buffering it in memory.
+
+        :param media: A url, or a media format object with a `url` and optionally a `size`, such as a Tenor `MP4`.
+        :type media: Union[str, Any]
+        :param chunk_size: The maximum size of each chunk, defaults to 64 KiB
+        :type chunk_size: int, optional
+        :param start: The byte offset to start from, sent as a `Range` header, defaults to 0
+        :type start: int, optional
+        :param max_size: Refuses files bigger than this many bytes, defaults to None
+        :type max_size: Optional[int], optional
+        :raises MediaTooLarge: If the file is bigger than `max_size`.
+        """
+        async for chunk in self._stream(media, chunk_size, start, max_size, None):
+            yield chunk
+
+    async def _stream(self, media: Union[str, Any], chunk_size: int, start: int, max_size: Optional[int], on_response: Optional[Callable[[aiohttp.ClientResponse], None]]) -> AsyncIterator[bytes]:
+        url = media if isinstance(media, str) else media.url
+        known = None if isinstance(media, str) else getattr(media, "size", None)
+        if max_size is not None and known is not None and known > max_size:
+            raise MediaTooLarge(url, known, max_size)
+
+        headers = {"Range": f"bytes={start}-"} if start else {}
+        session = await self.ensure_session()
+        async with session.get(url, headers = headers, timeout = self.DOWNLOAD_TIMEOUT) as resp:
+            offset = start if resp.status == 206 else 0
+            if max_size is not None and resp.content_length is not None and offset + resp.content_length > max_size:
+                raise MediaTooLarge(url, offset + resp.content_length, max_size)
+            if on_response is not None:
+                on_response(resp)
+            received = offset
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                received += len(chunk)
+                if max_size is not None and received > max_size:
+                    raise MediaTooLarge(url, received, max_size)
+                yield chunk
+
+    async def download(self, media: Union[str, Any], dest: Union[str, os.PathLike, BinaryIO], *, chunk_size: int = 64 * 1024, resume: bool = True, max_size: Optional[int] = None) -> int:
+        """Downloads a media file to a path or a writer.
+
+        When `dest` is a path to a partially downloaded file and `resume` is True, only the missing
+        bytes are requested. If the server ignores the range, the file is downloaded again from scratch.
+
+        :param media: A url, or a media format object with a `url` and optionally a `size`, such as a Tenor `MP4`.
+        :type media: Union[str, Any]
+        :param dest: A file path, or an object with a `write` method. `write` may be a coroutine function.
+        :type dest: Union[str, os.PathLike, BinaryIO]
+        :param chunk_size: The maximum size of each chunk, defaults to 64 KiB
+        :type chunk_size: int, optional
+        :param resume: Continues a partial download found at `dest`, defaults to True
+        :type resume: bool, optional
+        :param max_size: Refuses files bigger than this many bytes, defaults to None
+        :type max_size: Optional[int], optional
+        :raises MediaTooLarge: If the file is bigger than `max_size`.
+        :return: The size of the downloaded file in bytes.
+        :rtype: int
+        """
+        if hasattr(dest, "write"):
+            written = 0
+            async for chunk in self._stream(media, chunk_size, 0, max_size, None):
+                result = dest.write(chunk)
+                if inspect.isawaitable(result):
+                    await result
+                written += len(chunk)
+            return written
+
+        start = os.path.getsize(dest) if resume and os.path.exists(dest) else 0
+        known = None if isinstance(media, str) else getattr(media, "size", None)
+        if start and known is not None and start >= known:
+            return start
+
+        state = {"offset": 0}
+        def on_response(resp: aiohttp.ClientResponse):
+            state["offset"] = start if resp.status == 206 else 0
+
+        try:
+            with open(dest, "r+b" if start else "wb") as fp:
+                written = None
+                async for chunk in self._stream(media, chunk_size, start, max_size, on_response):
+                    if written is None:
+                        fp.seek(state["offset"])
+                        fp.truncate()
+                        written = state["offset"]
+                    fp.write(chunk)
+                    written += len(chunk)
+                if written is None:
+                    # an empty body: a 206 added nothing, but a 200 means the file is now empty
+                    fp.seek(state["offset"])
+                    fp.truncate()
+                    written = state["offset"]
+                return written
+        except aiohttp.ClientResponseError as e:
+            # 416 means the partial file already holds every byte
+            if e.status == 416 and start:
+                return start
+            raise
+
+    async def cleanup(self):
+        # background refreshes nobody waits on would otherwise reopen the session once it is closed
+        refreshes = [call.task for call in self._inflight.values() if call.waiters == 0 and not call.task.done()]
+        for task in refreshes:
+            task.cancel()
+        if refreshes:
+            await asyncio.gather(*refreshes, return_exceptions = True)
+        session, self._session = self._session, None
+        if session is None:
+            return
+        if self._acquired:
+            self._acquired = False
+            # a transport closed since then has already dropped this client, and may have other users by now
+            if session is self.transport.session:
+                await self.transport.release()
+        elif self.transport is None or session is not self.transport.session:
+            # a session passed in that belongs to the transport is left to it
+            await session.close()
@@ -0,0 +1,214 @@
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class RequestEvent:
+    """Describes a request made by `HTTPClient`. The same object is passed to every hook of a request,
+    and `extra` is free for hooks to keep their own state in.
+    """
+    __slots__ = ("provider", "endpoint", "method", "url", "started", "duration", "status", "bytes", "decode_time", "attempt", "error", "extra")
+
+    def __init__(self, *, provider: str, endpoint: str, method: str, url: str):
+        self.provider = provider
+        self.endpoint = endpoint
+        self.method = method
+        self.url = url
+        self.started = time.monotonic()
+        self.duration: Optional[float] = None
+        self.status: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.decode_time: Optional[float] = None
+        self.attempt = 0
+        self.error: Optional[BaseException] = None
+        self.extra: Dict[str, Any] = {}
+
+
+class Hooks:
+    """Receives events from `HTTPClient`. Subclass it and override the events you need.
+
+    Hooks run inline on the request path and must not block. An error raised by a hook is reported
+    as a `RuntimeWarning` and doesn't affect the request.
+    """
+    def on_request_start(self, event: RequestEvent):
+        """Called before a request is sent to the network. Cache hits and coalesced callers don't send one.
+        """
+
+    def on_request_end(self, event: RequestEvent):
+        """Called once the request has completed or failed. `duration`, `status`, `bytes`, `decode_time` and `error` are filled in.
+        """
+
+    def on_retry(self, event: RequestEvent):
+        """Called before a throttled request is retried. `attempt` is the retry number.
+        """
+
+    def on_cache_hit(self, event: RequestEvent):
+        """Called when a request is answered from the response cache.
+        """
+
+
+class TracingHooks(Hooks):
+    def __init__(self, tracer):
+        """Records every request as a span of an OpenTelemetry-style tracer.
+
+        :param tracer: An object with a `start_span(name, attributes=...)` method, such as `opentelemetry.trace.get_tracer(...)`.
+        """
+        self.tracer = tracer
+
+    def on_request_start(self, event: RequestEvent):
+        event.extra["span"] = self.tracer.start_span(
+            f"{event.provider} {event.endpoint}",
+            attributes = {"http.method": event.method, "http.url": event.url, "aiogifs.provider": event.provider},
+        )
+
+    def on_retry(self, event: RequestEvent):
+        span = event.extra.get("span")
+        if span is not None:
+            span.add_event("retry", {"attempt": event.attempt})
+
+    def on_request_end(self, event: RequestEvent):
+        span = event.extra.pop("span", None)
+        if span is None:
+            return
+        if event.status is not None:
+            span.set_attribute("http.status_code", event.status)
+        if event.bytes is not None:
+            span.set_attribute("http.response_content_length", event.bytes)
+        if event.error is not None:
+            span.record_exception(event.error)
+        span.end()
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+Labels = Tuple[str, str]
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsCollector(Hooks):
+    def __init__(self, *, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, namespace: str = "aiogifs"):
+        """Aggregates request metrics per provider and endpoint.
+
+        Use `render()` for the Prometheus text format, or register the collector with a
+        `prometheus_client` registry: `REGISTRY.register(collector)`.
+
+        :param buckets: The upper bounds in seconds of the latency histogram buckets, defaults to DEFAULT_BUCKETS
+        :type buckets: Tuple[float, ...], optional
+        :param namespace: The prefix of every metric name, defaults to "aiogifs"
+        :type namespace: str, optional
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self.latency: Dict[Labels, _Histogram] = {}
+        self.decode: Dict[Labels, _Histogram] = {}
+        self.responses: Dict[Tuple[str, str, str], int] = {}
+        self.bytes: Dict[Labels, int] = {}
+        self.in_flight: Dict[Labels, int] = {}
+        self.retries: Dict[Labels, int] = {}
+        self.cache_hits: Dict[Labels, int] = {}
+
+    def _observe(self, table: Dict[Labels, _Histogram], labels: Labels, value: float):
+        hist = table.get(labels)
+        if hist is None:
+            hist = table[labels] = _Histogram(len(self.buckets))
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            hist.counts[index] += 1
+        hist.sum += value
+        hist.count += 1
+
+    def on_request_start(self, event: RequestEvent):
+        labels = (event.provider, event.endpoint)
+        self.in_flight[labels] = self.in_flight.get(labels, 0) + 1
+
+    def on_request_end(self, event: RequestEvent):
+        labels = (event.provider, event.endpoint)
+        self.in_flight[labels] = self.in_flight.get(labels, 1) - 1
+        status = str(event.status) if event.status is not None else type(event.error).__name__
+        key = labels + (status,)
+        self.responses[key] = self.responses.get(key, 0) + 1
+        if event.duration is not None:
+            self._observe(self.latency, labels, event.duration)
+        if event.decode_time is not None:
+            self._observe(self.decode, labels, event.decode_time)
+        if event.bytes:
+            self.bytes[labels] = self.bytes.get(labels, 0) + event.bytes
+
+    def on_retry(self, event: RequestEvent):
+        labels = (event.provider, event.endpoint)
+        self.retries[labels] = self.retries.get(labels, 0) + 1
+
+    def on_cache_hit(self, event: RequestEvent):
+        labels = (event.provider, event.endpoint)
+        self.cache_hits[labels] = self.cache_hits.get(labels, 0) + 1
+
+    def _families(self) -> Iterator[Tuple[str, str, str, List[Tuple[str, Dict[str, str], float]]]]:
+        # yields (name, type, help, samples) for every metric
+        ns = self.namespace
+
+        def labelled(table: Dict[Labels, Any]) -> List[Tuple[Dict[str, str], Any]]:
+            return [({"provider": p, "endpoint": e}, v) for (p, e), v in sorted(table.items())]
+
+        def histogram(name: str, table: Dict[Labels, _Histogram]) -> List[Tuple[str, Dict[str, str], float]]:
+            samples = []
+            for labels, hist in labelled(table):
+                running = 0
+                for bound, count in zip(self.buckets, hist.counts):
+                    running += count
+                    samples.append((f"{name}_bucket", dict(labels, le = repr(float(bound))), running))
+                samples.append((f"{name}_bucket", dict(labels, le = "+Inf"), hist.count))
+                samples.append((f"{name}_sum", labels, hist.sum))
+                samples.append((f"{name}_count", labels, hist.count))
+            return samples
+
+        name = f"{ns}_request_duration_seconds"
+        yield name, "histogram", "Time spent on network requests.", histogram(name, self.latency)
+        name = f"{ns}_decode_duration_seconds"
+        yield name, "histogram", "Time spent decoding response bodies.", histogram(name, self.decode)
+        name = f"{ns}_responses_total"
+        yield name, "counter", "Completed requests by status code or error.", [
+            (name, {"provider": p, "endpoint": e, "status": s}, v) for (p, e, s), v in sorted(self.responses.items())
+        ]
+        for metric, kind, text, table in (
+            ("received_bytes_total", "counter", "Response bytes received.", self.bytes),
+            ("requests_in_flight", "gauge", "Requests currently on the network.", self.in_flight),
+            ("retries_total", "counter", "Throttled requests retried.", self.retries),
+            ("cache_hits_total", "counter", "Requests answered from the response cache.", self.cache_hits),
+        ):
+            name = f"{ns}_{metric}"
+            yield name, kind, text, [(name, labels, v) for labels, v in labelled(table)]
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format.
+
+        :rtype: str
+        """
+        lines = []
+        for name, kind, text, samples in self._families():
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample, labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{sample}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def collect(self):
+        """Yields `prometheus_client` metric families, so the collector can be registered with a registry.
+
+        :raises ImportError: If prometheus_client isn't installed.
+        """
+        from prometheus_client.core import Metric
+
+        for name, kind, text, samples in self._families():
+            base = name[:-len("_total")] if kind == "counter" and name.endswith("_total") else name
+            metric = Metric(base, text, kind)
+            for sample, labels, value in samples:
+                metric.add_sample(sample, labels, value)
+            yield metric
@@ -0,0 +1,67 @@
+from typing import Optional
+
+from .tenor.models import Media as TenorMedia
+from .giphy.models import Media as GiphyMedia
+
+
+class Gif:
+    """A provider-neutral GIF, as returned by `GifClient`.
+    """
+    __slots__ = ("provider", "id", "title", "url", "mp4_url", "preview_url", "page_url", "width", "height", "size")
+
+    def __init__(self, *, provider: str, id: str, title: Optional[str] = None, url: Optional[str] = None, mp4_url: Optional[str] = None, preview_url: Optional[str] = None, page_url: Optional[str] = None, width: Optional[int] = None, height: Optional[int] = None, size: Optional[int] = None):
+        self.provider = provider
+        self.id = id
+        self.title = title
+        self.url = url
+        self.mp4_url = mp4_url
+        self.preview_url = preview_url
+        self.page_url = page_url
+        self.width = width
+        self.height = height
+        self.size = size
+
+    def __repr__(self) -> str:
+        return f"<Gif provider={self.provider!r} id={self.id!r} url={self.url!r}>"
+
+    @classmethod
+    def from_tenor(cls, media: TenorMedia) -> "Gif":
+        """Builds a Gif from a Tenor `Media` object.
+
+        :rtype: Gif
+        """
+        gif = media.gif
+        mp4 = media.mp4
+        dims = (gif.dimensions if gif is not None else None) or [None, None]
+        return cls(
+            provider = "tenor",
+            id = media.id,
+            title = media.title,
+            url = gif.url if gif is not None else media.url,
+            mp4_url = mp4.url if mp4 is not None else None,
+            preview_url = gif.preview_url if gif is not None else None,
+            page_url = media.item_url,
+            width = dims[0],
+            height = dims[1],
+            size = gif.size if gif is not None else None,
+        )
+
+    @classmethod
+    def from_giphy(cls, media: GiphyMedia) -> "Gif":
+        """Builds a Gif from a Giphy `Media` object.
+
+        :rtype: Gif
+        """
+        original = media.original
+        return cls(
+            provider = "giphy",
+            id = media.id,
+            title = media.title,
+            url = original.url if original is not None else None,
+            mp4_url = original.mp4 if original is not None else None,
+            preview_url = media.preview_url,
+            page_url = media.url,
+            width = original.width if original is not None else None,
+            height = original.height if original is not None else None,
+            size = original.size if original is not None else None,
+        )
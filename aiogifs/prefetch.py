@@ -0,0 +1,251 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+import aiohttp
+
+from .dedup import AnyMedia, preview_url
+from .giphy.models import GiphyResponse
+from .http import HTTPClient
+from .tenor.models import TenorResponse
+from .utils import gather_bounded
+
+
+class Thumbnail:
+    """A cached preview image and the validators used to revalidate it."""
+    __slots__ = ("url", "body", "content_type", "etag", "last_modified", "expires")
+
+    def __init__(self, *, url: str, body: bytes, content_type: Optional[str], etag: Optional[str], last_modified: Optional[str], expires: float):
+        self.url = url
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires > time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"<Thumbnail url={self.url!r} size={len(self.body)}>"
+
+
+class ThumbnailCache:
+    def __init__(self, *, max_bytes: int = 64 * 1024 * 1024):
+        """An in-memory LRU cache of preview images, capped by their total size.
+
+        Expired thumbnails are kept until evicted, so they can be revalidated with a conditional GET
+        instead of being downloaded again.
+
+        :param max_bytes: The maximum total size of the images kept in bytes, defaults to 64 MiB
+        :type max_bytes: int, optional
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Thumbnail]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Returns the total size in bytes of the images currently cached.
+
+        :rtype: int
+        """
+        return self._bytes
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit and miss counters and the size of the cache.
+
+        :rtype: Dict[str, int]
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes, "evictions": self.evictions}
+
+    def get(self, url: str, *, stale: bool = False) -> Optional[Thumbnail]:
+        """Returns the thumbnail of a url, or None if it isn't cached or expired.
+
+        :param url: The preview url.
+        :type url: str
+        :param stale: Also returns an expired thumbnail, defaults to False
+        :type stale: bool, optional
+        :rtype: Optional[Thumbnail]
+        """
+        thumb = self._entries.get(url)
+        if stale:
+            # a lookup for revalidation, not counted
+            return thumb
+        if thumb is None or not thumb.fresh:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(url)
+        self.hits += 1
+        return thumb
+
+    def put(self, thumb: Thumbnail):
+        """Stores a thumbnail, evicting the least recently used ones beyond `max_bytes`.
+        """
+        if len(thumb.body) > self.max_bytes:
+            return
+        old = self._entries.pop(thumb.url, None)
+        if old is not None:
+            self._bytes -= len(old.body)
+        self._entries[thumb.url] = thumb
+        self._bytes += len(thumb.body)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last = False)
+            self._bytes -= len(evicted.body)
+            self.evictions += 1
+
+    def clear(self):
+        """Removes every thumbnail.
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+
+class PreviewPrefetcher:
+    MAX_OVERSIZED = 4096
+
+    def __init__(self, *, http: Optional[HTTPClient] = None, cache: Optional[ThumbnailCache] = None, concurrency: int = 8, ttl: float = 3600.0, max_preview_bytes: int = 1024 * 1024):
+        """Downloads the preview images of search results ahead of time into a `ThumbnailCache`.
+
+        Passed to a `TenorClient` or `GiphyClient` as `prefetcher`, it starts warming the previews of
+        every search and trending response in the background. An image proxy then reads them with
+        `fetch`, which answers from memory. Expired thumbnails are revalidated with `If-None-Match`
+        and `If-Modified-Since`, so unchanged images are not downloaded again.
+
+        :param http: The HTTP client whose session downloads the images. Set by the client the prefetcher is passed to, defaults to None
+        :type http: Optional[HTTPClient], optional
+        :param cache: The cache holding the images. If none is passed, a 64 MiB `ThumbnailCache` is used, defaults to None
+        :type cache: Optional[ThumbnailCache], optional
+        :param concurrency: The maximum number of downloads running at once, defaults to 8
+        :type concurrency: int, optional
+        :param ttl: How long a thumbnail is used before being revalidated in seconds, defaults to 3600.0
+        :type ttl: float, optional
+        :param max_preview_bytes: Skips previews bigger than this many bytes, defaults to 1 MiB
+        :type max_preview_bytes: int, optional
+        """
+        self.http = http
+        self.cache = cache if cache is not None else ThumbnailCache()
+        self.ttl = ttl
+        self.max_preview_bytes = max_preview_bytes
+        self.concurrency = concurrency
+        self.downloads = 0
+        self.revalidated = 0
+        self._inflight: Dict[str, "asyncio.Future[Optional[Thumbnail]]"] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # previews found too big, so they aren't downloaded again until `ttl` passes
+        self._oversized: "OrderedDict[str, float]" = OrderedDict()
+
+    def prefetch(self, results: Union[TenorResponse, GiphyResponse, Iterable[AnyMedia]]) -> asyncio.Task:
+        """Starts warming the previews of a response or of a list of media in the background.
+
+        :param results: A `TenorResponse`, a `GiphyResponse`, or media objects.
+        :type results: Union[TenorResponse, GiphyResponse, Iterable[AnyMedia]]
+        :return: The task doing so. It can be awaited, but doesn't need to be.
+        :rtype: asyncio.Task
+        """
+        media = (results.media or []) if isinstance(results, (TenorResponse, GiphyResponse)) else results
+        urls = [url for url in (preview_url(m) for m in media) if url]
+        task = asyncio.ensure_future(self.warm(urls))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def warm(self, urls: Iterable[str]) -> List[Union[Optional[Thumbnail], Exception]]:
+        """Fetches many previews concurrently, skipping those already cached.
+
+        :param urls: The preview urls.
+        :type urls: Iterable[str]
+        :return: One thumbnail per url, in input order. A failed download holds its exception instead.
+        :rtype: List[Union[Optional[Thumbnail], Exception]]
+        """
+        return await gather_bounded(self.fetch, list(dict.fromkeys(urls)), concurrency = self.concurrency)
+
+    async def fetch(self, url: str) -> Optional[Thumbnail]:
+        """Returns the thumbnail of a url, downloading or revalidating it if needed. Concurrent calls for one url share a download.
+
+        :param url: The preview url.
+        :type url: str
+        :return: The thumbnail, or None if the image is bigger than `max_preview_bytes`.
+        :rtype: Optional[Thumbnail]
+        """
+        thumb = self.cache.get(url)
+        if thumb is not None:
+            return thumb
+        expires = self._oversized.get(url)
+        if expires is not None:
+            if expires > time.monotonic():
+                return None
+            del self._oversized[url]
+        call = self._inflight.get(url)
+        if call is None:
+            call = self._inflight[url] = asyncio.ensure_future(self._download(url))
+            call.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(call)
+
+    async def close(self):
+        """Cancels the downloads running in the background and waits for them to stop.
+
+        Called by the client the prefetcher downloads with when it closes, so no download reopens its session.
+        """
+        tasks = [task for task in (*self._tasks, *self._inflight.values()) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions = True)
+
+    async def _download(self, url: str) -> Optional[Thumbnail]:
+        if self.http is None:
+            raise RuntimeError("PreviewPrefetcher has no HTTP client. Pass it to a client or set `http`")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        stale = self.cache.get(url, stale = True)
+        headers = {}
+        if stale is not None:
+            if stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+
+        async with self._semaphore:
+            session = await self.http.ensure_session()
+            async with session.get(url, headers = headers, timeout = self.http.DOWNLOAD_TIMEOUT) as resp:
+                if resp.status == 304 and stale is not None:
+                    self.revalidated += 1
+                    stale.expires = time.monotonic() + self.ttl
+                    return stale
+                if resp.content_length is not None and resp.content_length > self.max_preview_bytes:
+                    return self._skip(url)
+                body = bytearray()
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    body += chunk
+                    if len(body) > self.max_preview_bytes:
+                        return self._skip(url)
+                self.downloads += 1
+                thumb = Thumbnail(
+                    url = url,
+                    body = bytes(body),
+                    content_type = resp.headers.get(aiohttp.hdrs.CONTENT_TYPE),
+                    etag = resp.headers.get(aiohttp.hdrs.ETAG),
+                    last_modified = resp.headers.get(aiohttp.hdrs.LAST_MODIFIED),
+                    expires = time.monotonic() + self.ttl,
+                )
+        self.cache.put(thumb)
+        return thumb
+
+    def _skip(self, url: str) -> None:
+        self._oversized[url] = time.monotonic() + self.ttl
+        self._oversized.move_to_end(url)
+        while len(self._oversized) > self.MAX_OVERSIZED:
+            self._oversized.popitem(last = False)
+        return None
@@ -0,0 +1,147 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("children", "entry")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # the terms, the number of terms asked for and the expiry time of the answer for this prefix
+        self.entry: Optional[Tuple[List[str], int, float]] = None
+
+
+class PrefixCache:
+    def __init__(self, *, max_entries: int = 4096, ttl: float = 600.0, prefix_reuse: bool = False):
+        """Caches search-as-you-type answers, so a query typed again is answered locally.
+
+        With `prefix_reuse`, answers are also reused for longer queries: when the answer for "hap"
+        held fewer terms than were asked for, the completions of "happ" are found by filtering it
+        instead of sending another request. Answers are kept in a trie per scope, so a lookup walks
+        the query once and finds the longest cached prefix on the way. This is an approximation:
+        providers rank and cut their suggestions, and may complete "happ" with terms they left out
+        for "hap" or that don't start with it. It is off by default here, and the clients turn it on
+        for autocomplete unless they are given another cache.
+
+        :param max_entries: The maximum number of answers kept, defaults to 4096
+        :type max_entries: int, optional
+        :param ttl: How long an answer is kept in seconds, defaults to 600.0
+        :type ttl: float, optional
+        :param prefix_reuse: Answers longer queries by filtering the answer of a prefix, defaults to False
+        :type prefix_reuse: bool, optional
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prefix_reuse = prefix_reuse
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+        self._roots: Dict[str, _Node] = {}
+        # the cached (scope, query) pairs, least recently used first
+        self._entries: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Returns the exact hit, prefix hit and miss counters of the cache.
+
+        :rtype: Dict[str, int]
+        """
+        return {"hits": self.hits, "prefix_hits": self.prefix_hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def get(self, query: str, limit: int, *, scope: str = "", exact: bool = False) -> Optional[List[str]]:
+        """Returns up to `limit` terms for `query`, or None if they can't be answered locally.
+
+        :param query: The text typed so far.
+        :type query: str
+        :param limit: The number of terms wanted.
+        :type limit: int
+        :param scope: Separates answers that depend on other parameters, such as the locale, defaults to ""
+        :type scope: str, optional
+        :param exact: Answers only a repeat of the query, even with `prefix_reuse`, defaults to False
+        :type exact: bool, optional
+        :rtype: Optional[List[str]]
+        """
+        query = self.normalize(query)
+        now = time.monotonic()
+        result: Optional[List[str]] = None
+        # the longest prefix whose answer listed every completion, as (prefix, terms)
+        reusable: Optional[Tuple[str, List[str]]] = None
+        expired = []
+        node = self._roots.get(scope)
+        for depth in range(len(query) + 1):
+            if node is None:
+                break
+            if node.entry is not None:
+                terms, asked, expires = node.entry
+                complete = len(terms) < asked
+                if expires <= now:
+                    expired.append(query[:depth])
+                elif depth == len(query) and (complete or asked >= limit):
+                    self._entries.move_to_end((scope, query))
+                    self.hits += 1
+                    result = terms[:limit]
+                elif complete and depth and self.prefix_reuse and not exact:
+                    reusable = (query[:depth], terms)
+            node = node.children.get(query[depth]) if depth < len(query) else None
+        for prefix in expired:
+            self._remove(scope, prefix)
+        if result is not None:
+            return result
+        if reusable is not None:
+            prefix, terms = reusable
+            self._entries.move_to_end((scope, prefix))
+            self.prefix_hits += 1
+            return [t for t in terms if self.normalize(t).startswith(query)][:limit]
+        self.misses += 1
+        return None
+
+    def put(self, query: str, limit: int, terms: List[str], *, scope: str = ""):
+        """Stores the terms returned for `query` when `limit` terms were asked for.
+
+        :param query: The text typed so far.
+        :type query: str
+        :param limit: The number of terms that were asked for.
+        :type limit: int
+        :param terms: The terms returned.
+        :type terms: List[str]
+        :param scope: Separates answers that depend on other parameters, such as the locale, defaults to ""
+        :type scope: str, optional
+        """
+        query = self.normalize(query)
+        node = self._roots.setdefault(scope, _Node())
+        for char in query:
+            node = node.children.setdefault(char, _Node())
+        node.entry = (list(terms), limit, time.monotonic() + self.ttl)
+        self._entries[(scope, query)] = None
+        self._entries.move_to_end((scope, query))
+        while len(self._entries) > self.max_entries:
+            self._remove(*next(iter(self._entries)))
+
+    def _remove(self, scope: str, query: str):
+        self._entries.pop((scope, query), None)
+        path = [self._roots[scope]]
+        for char in query:
+            path.append(path[-1].children[char])
+        path[-1].entry = None
+        # prunes the branch back to the last node still holding an answer or other branches
+        for depth in range(len(query), 0, -1):
+            node = path[depth]
+            if node.entry is not None or node.children:
+                return
+            del path[depth - 1].children[query[depth - 1]]
+        if path[0].entry is None and not path[0].children:
+            del self._roots[scope]
+
+    def clear(self):
+        """Removes every cached answer.
+        """
+        self._roots.clear()
+        self._entries.clear()
@@ -0,0 +1,182 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Reads how long to wait from the `Retry-After` or `X-RateLimit-*` headers of a response.
+
+    :param headers: The response headers.
+    :type headers: Mapping[str, str]
+    :return: The number of seconds to wait, or None if the headers don't say.
+    :rtype: Optional[float]
+    """
+    value = headers.get("Retry-After")
+    if value is not None:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is not None and reset is not None:
+        try:
+            if int(float(remaining)) > 0:
+                return None
+            reset = float(reset)
+        except ValueError:
+            return None
+        # some APIs send an epoch timestamp, others the number of seconds left
+        if reset > 1e9:
+            reset -= time.time()
+        return max(reset, 0.0)
+    return None
+
+
+class RateLimiter:
+    _registry: Dict[str, "RateLimiter"] = {}
+
+    def __init__(self, *, rate: float = 10.0, burst: int = 10, max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 30.0):
+        """An async token bucket that also handles `429 Too Many Requests` responses.
+
+        :param rate: The number of requests allowed per second, defaults to 10.0
+        :type rate: float, optional
+        :param burst: The number of requests that may be sent at once after a quiet period, defaults to 10
+        :type burst: int, optional
+        :param max_retries: How many times a throttled request is retried before the error is raised, defaults to 3
+        :type max_retries: int, optional
+        :param backoff_base: The base delay in seconds of the exponential backoff, defaults to 0.5
+        :type backoff_base: float, optional
+        :param backoff_cap: The maximum backoff delay in seconds, defaults to 30.0
+        :type backoff_cap: float, optional
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._waiting = 0
+
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @classmethod
+    def for_key(cls, api_key: str, **kwargs) -> "RateLimiter":
+        """Returns the limiter shared by every client using `api_key`, creating it on first use.
+
+        :param api_key: The API key the limit applies to.
+        :type api_key: str
+        :return: The shared RateLimiter. Keyword arguments are only used when it is created.
+        :rtype: RateLimiter
+        """
+        limiter = cls._registry.get(api_key)
+        if limiter is None:
+            limiter = cls._registry[api_key] = cls(**kwargs)
+        return limiter
+
+    @property
+    def queue_depth(self) -> int:
+        """Returns the number of requests currently waiting for a token.
+
+        :rtype: int
+        """
+        return self._waiting
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Returns the limiter's counters: requests sent, throttled responses, queue depth and wait times.
+
+        :rtype: Dict[str, float]
+        """
+        return {
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "queue_depth": self._waiting,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+        }
+
+    def _refill(self, now: float):
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Waits until a request may be sent.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        start = time.monotonic()
+        self._waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if self._paused_until > now:
+                        await asyncio.sleep(self._paused_until - now)
+                        continue
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def pause(self, seconds: float):
+        """Stops every request going through this limiter for `seconds`.
+
+        :param seconds: How long to pause for.
+        :type seconds: float
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+    def backoff(self, attempt: int) -> float:
+        """Returns a jittered exponential backoff delay for the given retry attempt.
+
+        :param attempt: The retry attempt, starting at 0.
+        :type attempt: int
+        :rtype: float
+        """
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def update(self, headers: Mapping[str, str]):
+        """Pauses the limiter if a successful response says the quota is used up.
+
+        :param headers: The response headers.
+        :type headers: Mapping[str, str]
+        """
+        delay = parse_retry_after(headers)
+        if delay:
+            self.pause(delay)
+
+    def throttle(self, headers: Mapping[str, str], attempt: int) -> float:
+        """Records a `429` response and pauses the limiter. Returns the pause in seconds.
+
+        :param headers: The headers of the throttled response.
+        :type headers: Mapping[str, str]
+        :param attempt: The retry attempt, starting at 0.
+        :type attempt: int
+        :rtype: float
+        """
+        self.throttled += 1
+        delay = max(parse_retry_after(headers) or 0.0, self.backoff(attempt))
+        self.pause(delay)
+        return delay
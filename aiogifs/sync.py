@@ -0,0 +1,187 @@
+import asyncio
+import functools
+import inspect
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from .giphy import GiphyClient
+from .tenor import TenorClient
+from .transport import Transport
+
+T = TypeVar("T")
+
+
+class LoopThread:
+    _shared: Optional["LoopThread"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, *, name: str = "aiogifs-loop"):
+        """An event loop running forever on a daemon thread, for calling the async clients from synchronous code.
+
+        :param name: The name of the thread, defaults to "aiogifs-loop"
+        :type name: str, optional
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target = self._run, name = name, daemon = True)
+        self._thread.start()
+
+    @classmethod
+    def shared(cls) -> "LoopThread":
+        """Returns the process-wide loop thread, starting it on first use.
+
+        :rtype: LoopThread
+        """
+        with cls._shared_lock:
+            if cls._shared is None or not cls._shared._thread.is_alive():
+                cls._shared = cls()
+            return cls._shared
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Runs a coroutine on the loop thread and blocks until it completes.
+
+        :param coro: The coroutine to run.
+        :type coro: Awaitable[T]
+        :param timeout: How long to wait in seconds. The coroutine is cancelled when it expires, defaults to None
+        :type timeout: Optional[float], optional
+        :raises concurrent.futures.TimeoutError: If the timeout expires.
+        :return: The result of the coroutine.
+        :rtype: T
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("LoopThread.run cannot be called from the loop thread itself")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, agen: AsyncIterator[T], timeout: Optional[float] = None) -> Iterator[T]:
+        """Consumes an async iterator on the loop thread, one item at a time.
+
+        :param agen: The async iterator to consume.
+        :type agen: AsyncIterator[T]
+        :param timeout: How long to wait for each item in seconds. The iterator is closed when it expires, defaults to None
+        :type timeout: Optional[float], optional
+        :rtype: Iterator[T]
+        """
+        step: Optional[asyncio.Future] = None
+
+        async def anext():
+            nonlocal step
+            step = asyncio.ensure_future(agen.__anext__())
+            return await step
+
+        async def aclose():
+            # a step cancelled by the timeout may still be unwinding inside the iterator, which can't be closed meanwhile
+            if step is not None and not step.done():
+                await asyncio.gather(step, return_exceptions = True)
+            await agen.aclose()
+
+        try:
+            while True:
+                try:
+                    yield self.run(anext(), timeout)
+                except StopAsyncIteration:
+                    return
+        finally:
+            if hasattr(agen, "aclose"):
+                self.run(aclose())
+
+    def stop(self):
+        """Stops the loop and waits for the thread to exit.
+        """
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+class _SyncClient:
+    _client_cls: Callable[..., Any]
+
+    def __init__(self, *, api_key: str, loop_thread: Optional[LoopThread] = None, timeout: Optional[float] = None, **kwargs):
+        self._thread = loop_thread or LoopThread.shared()
+        self._timeout = timeout
+        kwargs.setdefault("transport", Transport.shared(self._thread.loop))
+
+        async def create():
+            client = self._client_cls(api_key = api_key, **kwargs)
+            return await client.open()
+
+        self._client = self._thread.run(create())
+
+    @property
+    def client(self):
+        """Returns the wrapped async client. Its coroutines must only be run on the loop thread.
+        """
+        return self._client
+
+    def __getattr__(self, name: str):
+        # looked up directly, as a client whose __init__ failed has no _client and would recurse here
+        client = self.__dict__.get("_client")
+        if client is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        attr = getattr(client, name)
+        if inspect.isasyncgenfunction(attr):
+            @functools.wraps(attr)
+            def iterate(*args, **kwargs):
+                return self._thread.iterate(attr(*args, **kwargs), self._timeout)
+            return iterate
+        if inspect.iscoroutinefunction(attr):
+            @functools.wraps(attr)
+            def call(*args, **kwargs):
+                return self._thread.run(attr(*args, **kwargs), self._timeout)
+            return call
+        return attr
+
+    def close(self):
+        """Releases the client's session. The shared connection pool closes once every client released it.
+        """
+        self._thread.run(self._client.close())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SyncTenorClient(_SyncClient):
+    """A blocking `TenorClient` for code that can't `await`, such as Flask views or Celery tasks.
+
+    Every method of `TenorClient` is available and blocks until it completes. Async iterators like
+    `iter_search` become regular iterators. All clients run on one background event loop thread and
+    by default share the loop's `Transport.shared()`, so any number of threads can search concurrently through
+    one connection pool.
+
+    :param api_key: Your API Key for the Tenor API
+    :type api_key: str
+    :param loop_thread: The loop thread to run on. Defaults to `LoopThread.shared()`
+    :type loop_thread: Optional[LoopThread], optional
+    :param timeout: How long a call may block in seconds, defaults to None
+    :type timeout: Optional[float], optional
+    :param kwargs: Any other keyword argument accepted by `TenorClient`.
+    """
+    _client_cls = TenorClient
+
+
+class SyncGiphyClient(_SyncClient):
+    """A blocking `GiphyClient` for code that can't `await`, such as Flask views or Celery tasks.
+
+    Every method of `GiphyClient` is available and blocks until it completes. Async iterators like
+    `iter_search` become regular iterators. All clients run on one background event loop thread and
+    by default share the loop's `Transport.shared()`, so any number of threads can search concurrently through
+    one connection pool.
+
+    :param api_key: Your API Key for the Giphy API
+    :type api_key: str
+    :param loop_thread: The loop thread to run on. Defaults to `LoopThread.shared()`
+    :type loop_thread: Optional[LoopThread], optional
+    :param timeout: How long a call may block in seconds, defaults to None
+    :type timeout: Optional[float], optional
+    :param kwargs: Any other keyword argument accepted by `GiphyClient`.
+    """
+    _client_cls = GiphyClient
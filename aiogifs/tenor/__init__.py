@@ -1,2 +1,3 @@
 from .client import TenorClient
+from .selector import FormatSelector
 from .types import *
\ No newline at end of file
@@ -1,25 +1,113 @@
 from .http import HTTPClient, Route
 import asyncio
-from aiohttp import ClientSession # just for type hinting
-from typing import Optional
+from aiohttp import ClientSession, ClientTimeout # just for type hinting
+from typing import TYPE_CHECKING, AsyncIterator, BinaryIO, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import os
+from ..cache import CacheBackend
+from ..ratelimit import RateLimiter
+from ..transport import Transport
+from ..hedging import HedgePolicy
+from ..instrumentation import Hooks
 from .types import MediaFilter, AspectRatio, ContentFilter
-from .models import TenorResponse
+from .models import TenorResponse, Media, GIF, MP4
+from ..batching import Batcher
+from ..breaker import CircuitBreaker
+from ..prefix import PrefixCache
+from ..utils import ParsedResponses, gather_bounded, map_bounded, paginate
+
+if TYPE_CHECKING:
+    # imported for annotations only: both modules import the models of both providers
+    from ..dedup import Deduplicator
+    from ..prefetch import PreviewPrefetcher
 
 
 class TenorClient:
-    def __init__(self, *, api_key: str, session: Optional[ClientSession] = None, loop: Optional[asyncio.AbstractEventLoop] = None):
+    _shared: Dict[Tuple[asyncio.AbstractEventLoop, str], "TenorClient"] = {}
+
+    def __init__(self, *, api_key: str, session: Optional[ClientSession] = None, loop: Optional[asyncio.AbstractEventLoop] = None, cache: Union[CacheBackend, bool, None] = True, cache_ttls: Optional[Dict[str, float]] = None, rate_limiter: Optional[RateLimiter] = None, transport: Optional[Transport] = None, json_loads: Optional[Callable[[bytes], dict]] = None, timeout: Optional[ClientTimeout] = None, timeouts: Optional[Dict[str, ClientTimeout]] = None, hedging: Optional[HedgePolicy] = None, hooks: Sequence[Hooks] = (), base_url: Optional[str] = None, batch_window: Optional[float] = None, breaker: Optional[CircuitBreaker] = None, prefetcher: Optional["PreviewPrefetcher"] = None, autocomplete_cache: Union[PrefixCache, bool, None] = True):
         """Initialises the TenorClient
 
         :param api_key: Your API Key for the Tenor API
         :type api_key: str
         :param session: Allows for custom session passing. If none is passed, a new session is created, defaults to None
         :type session: Optional[ClientSession], optional
+        :param cache: The response cache used for search and trending. True uses an in-memory cache, False or None disables caching, defaults to True
+        :type cache: Union[CacheBackend, bool, None], optional
+        :param cache_ttls: Overrides the cache lifetime in seconds per endpoint, e.g. `{"/trending": 30}`, defaults to None
+        :type cache_ttls: Optional[Dict[str, float]], optional
+        :param rate_limiter: Throttles requests and retries `429` responses. Use `RateLimiter.for_key` to share one between clients, defaults to None
+        :type rate_limiter: Optional[RateLimiter], optional
+        :param transport: A connection pool shared with other clients, such as `Transport.shared()`. Ignored when a session is passed, defaults to None
+        :type transport: Optional[Transport], optional
+        :param json_loads: The function decoding response bodies. If none is passed, orjson, msgspec or ujson is used when installed, defaults to None
+        :type json_loads: Optional[Callable[[bytes], dict]], optional
+        :param timeout: The connect/read/total timeouts of every request. If none is passed, requests time out after 10 seconds, defaults to None
+        :type timeout: Optional[ClientTimeout], optional
+        :param timeouts: Overrides the timeouts per endpoint, defaults to None
+        :type timeouts: Optional[Dict[str, ClientTimeout]], optional
+        :param hedging: Sends a duplicate of requests that run slower than usual and uses whichever answers first, defaults to None
+        :type hedging: Optional[HedgePolicy], optional
+        :param hooks: Receive an event for every request, retry and cache hit, such as a `MetricsCollector`, defaults to ()
+        :type hooks: Sequence[Hooks], optional
+        :param base_url: Sends requests to another server than the official API, such as a proxy or a mock server, defaults to None
+        :type base_url: Optional[str], optional
+        :param batch_window: Collects `get_by_id` calls made within this many seconds, such as 0.002, into one request. None sends every call on its own, defaults to None
+        :type batch_window: Optional[float], optional
+        :param breaker: Fails fast, or serves expired cached responses, while an endpoint keeps failing, defaults to None
+        :type breaker: Optional[CircuitBreaker], optional
+        :param prefetcher: Warms the preview images of every search and trending response in the background, defaults to None
+        :type prefetcher: Optional[PreviewPrefetcher], optional
+        :param autocomplete_cache: Answers `autocomplete` locally where it can. True also reuses the answer for a prefix: once "hap" got fewer terms than were asked for, "happ" is answered by filtering them. The provider ranks and cuts its suggestions, so such an answer may lack terms it would add for "happ", or order them differently. Pass `PrefixCache()` to reuse exact repeats only, or False or None to leave autocomplete to the response cache, defaults to True
+        :type autocomplete_cache: Union[PrefixCache, bool, None], optional
         """
         self._auth = api_key
-        self.http = HTTPClient(api_key = self._auth, session = session)
+        self.http = HTTPClient(api_key = self._auth, session = session, cache = cache, cache_ttls = cache_ttls, rate_limiter = rate_limiter, transport = transport, json_loads = json_loads, timeout = timeout, timeouts = timeouts, hedging = hedging, hooks = hooks, base_url = base_url, breaker = breaker)
         self.loop = loop
-        self.__session = session
-        self.open()
+        if autocomplete_cache is True:
+            autocomplete_cache = PrefixCache(prefix_reuse = True)
+        self.autocomplete_cache: Optional[PrefixCache] = autocomplete_cache if isinstance(autocomplete_cache, PrefixCache) else None
+        self.batcher: Optional[Batcher[str, dict]] = None
+        if batch_window is not None:
+            self.batcher = Batcher(lambda ids: self.http.lookup("/gifs", ids), window = batch_window, max_batch = self.http.MAX_IDS)
+        self.prefetcher = prefetcher
+        self._parsed: ParsedResponses[TenorResponse] = ParsedResponses(lambda data: TenorResponse(data = data))
+        if prefetcher is not None and prefetcher.http is None:
+            prefetcher.http = self.http
+
+    @classmethod
+    def shared(cls, api_key: str, **kwargs) -> "TenorClient":
+        """Returns the client of an API key on the running event loop, creating it on first use.
+
+        Short-lived handlers can call this on every request and reuse a warm client, with its cache
+        and open connections, instead of building a new one. Each loop gets its own client, using the
+        loop's `Transport.shared()` unless another transport is passed. Clients left behind by loops
+        closed since are dropped without being closed, as their background tasks belonged to those
+        loops. Their sessions are closed with the transports `Transport.shared` keeps for those loops.
+
+        :param api_key: Your API Key for the Tenor API
+        :type api_key: str
+        :param kwargs: Any other keyword argument accepted by `TenorClient`. Only used when the client is created.
+        :rtype: TenorClient
+        """
+        loop = asyncio.get_running_loop()
+        for key in [key for key in cls._shared if key[0].is_closed()]:
+            # closing would run the dead loop's background tasks on this one. The session belongs to that
+            # loop's shared transport, which `Transport.shared` closes
+            del cls._shared[key]
+        client = cls._shared.get((loop, api_key))
+        if client is None:
+            kwargs.setdefault("transport", Transport.shared(loop))
+            client = cls._shared[(loop, api_key)] = cls(api_key = api_key, loop = loop, **kwargs)
+        return client
+
+    @classmethod
+    async def close_shared(cls):
+        """Closes every client returned by `shared` on the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        for key in [key for key in cls._shared if key[0] is loop]:
+            await cls._shared.pop(key).close()
+
     async def search(self, query: str, *, locale: Optional[str] = None, content_filter: Optional[ContentFilter] = "off", media_filter: Optional[MediaFilter] = None, ar_range: Optional[AspectRatio] = None, limit: Optional[int] = None, pos: Optional[int] = None, anon_id: Optional[str] = None) -> TenorResponse:
         """Searches tenor with the provided query.
 
@@ -56,7 +144,10 @@ class TenorClient:
         params = self._filter_params(params)
         route = Route("/search", params = params)
         data = await self.http.request(route)
-        return TenorResponse(data = data)
+        response = self._parsed.get(data)
+        if self.prefetcher is not None:
+            self.prefetcher.prefetch(response)
+        return response
 
     async def trending(self, *, locale: Optional[str] = None, content_filter: Optional[ContentFilter] = "off", media_filter: Optional[MediaFilter] = None, ar_range: Optional[AspectRatio] = None, limit: Optional[int] = None, pos: Optional[int] = None, anon_id: Optional[str] = None) -> TenorResponse:
         """Fetches currently trending media on Tenor
@@ -91,18 +182,254 @@ class TenorClient:
         params = self._filter_params(params)
         route = Route("/trending", params = params)
         data = await self.http.request(route)
-        return TenorResponse(data = data)
+        response = self._parsed.get(data)
+        if self.prefetcher is not None:
+            self.prefetcher.prefetch(response)
+        return response
+
+    async def get_by_ids(self, ids: Iterable[str], *, media_filter: Optional[MediaFilter] = None, concurrency: int = 4) -> List[Optional[Media]]:
+        """Fetches media by ID. Any number of IDs can be passed: they are packed into requests of up to 50 IDs, sent concurrently.
+
+        Every media object is cached on its own, so IDs resolved before are answered without a request.
+
+        :param ids: The IDs of the media.
+        :type ids: Iterable[str]
+        :param media_filter: The type of Media Filter used. This filters the types of media returned, defaults to None
+        :type media_filter: Optional[MediaFilter], optional
+        :param concurrency: The maximum number of requests in flight at once, defaults to 4
+        :type concurrency: int, optional
+        :return: One `Media` object per ID, in input order. IDs Tenor doesn't know, or returns without media, hold None.
+        :rtype: List[Optional[Media]]
+        """
+        ids = [str(id) for id in ids]
+        found = await self.http.lookup("/gifs", ids, params = {"mediafilter": media_filter}, concurrency = concurrency)
+        objects = [found.get(id) for id in ids]
+        return [None if obj is None else Media(data = obj.get("media")[0], raw_object = obj) for obj in objects]
+
+    async def get_by_id(self, id: str) -> Optional[Media]:
+        """Fetches one media object by ID. With `batch_window` set, concurrent calls share one request.
+
+        :param id: The ID of the media.
+        :type id: str
+        :return: The `Media` object, or None if Tenor doesn't know the ID or returns it without media.
+        :rtype: Optional[Media]
+        """
+        if self.batcher is None:
+            return (await self.get_by_ids([id]))[0]
+        obj = await self.batcher.load(str(id))
+        return None if obj is None else Media(data = obj.get("media")[0], raw_object = obj)
+
+    async def autocomplete(self, query: str, *, limit: int = 20, locale: Optional[str] = None, anon_id: Optional[str] = None) -> List[str]:
+        """Completes a partially typed search term. Answers are kept in `autocomplete_cache`, which answers repeated queries, and by default longer ones, locally.
+
+        :param query: The partial search term.
+        :type query: str
+        :param limit: The maximum number of terms returned, defaults to 20
+        :type limit: int, optional
+        :param locale: The locale. Usually in the format of xx_YY, defaults to None
+        :type locale: Optional[str], optional
+        :param anon_id: Specify the anonymous_id tied to the given user, defaults to None
+        :type anon_id: Optional[str], optional
+        :return: A list of completed search terms.
+        :rtype: List[str]
+        """
+        scope = locale or ""
+        prefixes = self.autocomplete_cache
+        terms = prefixes.get(query, limit, scope = scope) if prefixes is not None else None
+        if terms is not None:
+            return terms
+        # kept by `autocomplete_cache` only, rather than in the response cache as well
+        terms = await self._terms("/autocomplete", {"q": query, "limit": limit, "locale": locale, "anon_id": anon_id}, cache = prefixes is None)
+        if prefixes is not None:
+            prefixes.put(query, limit, terms, scope = scope)
+        return terms
+
+    async def search_suggestions(self, query: str, *, limit: Optional[int] = None, locale: Optional[str] = None, anon_id: Optional[str] = None) -> List[str]:
+        """Fetches search terms related to a search term.
+
+        :param query: The search term.
+        :type query: str
+        :param limit: The maximum number of terms returned, defaults to None
+        :type limit: Optional[int], optional
+        :param locale: The locale. Usually in the format of xx_YY, defaults to None
+        :type locale: Optional[str], optional
+        :param anon_id: Specify the anonymous_id tied to the given user, defaults to None
+        :type anon_id: Optional[str], optional
+        :return: A list of suggested search terms.
+        :rtype: List[str]
+        """
+        return await self._terms("/search_suggestions", {"q": query, "limit": limit, "locale": locale, "anon_id": anon_id})
+
+    async def trending_terms(self, *, limit: Optional[int] = None, locale: Optional[str] = None, anon_id: Optional[str] = None) -> List[str]:
+        """Fetches the currently trending search terms.
+
+        :param limit: The maximum number of terms returned, defaults to None
+        :type limit: Optional[int], optional
+        :param locale: The locale. Usually in the format of xx_YY, defaults to None
+        :type locale: Optional[str], optional
+        :param anon_id: Specify the anonymous_id tied to the given user, defaults to None
+        :type anon_id: Optional[str], optional
+        :return: A list of trending search terms.
+        :rtype: List[str]
+        """
+        return await self._terms("/trending_terms", {"limit": limit, "locale": locale, "anon_id": anon_id})
+
+    async def _terms(self, endpoint: str, params: dict, *, cache: bool = True) -> List[str]:
+        route = Route(endpoint, params = self._filter_params(params))
+        data = await self.http.request(route, cache = cache)
+        return list(data.get("results") or [])
+
+    async def search_many(self, queries: Iterable[str], *, concurrency: int = 10, **kwargs) -> List[Union[TenorResponse, Exception]]:
+        """Runs many searches concurrently, with at most `concurrency` requests in flight.
+
+        :param queries: The queries to search for.
+        :type queries: Iterable[str]
+        :param concurrency: The maximum number of searches running at once, defaults to 10
+        :type concurrency: int, optional
+        :param kwargs: Any other keyword argument accepted by `search`.
+        :return: One result per query, in input order. A search that failed holds its exception instead of a response.
+        :rtype: List[Union[TenorResponse, Exception]]
+        """
+        return await gather_bounded(lambda query: self.search(query, **kwargs), queries, concurrency = concurrency)
+
+    async def iter_search_many(self, queries: Iterable[str], *, concurrency: int = 10, **kwargs) -> AsyncIterator[Tuple[str, Union[TenorResponse, Exception]]]:
+        """Like `search_many`, but yields `(query, result)` pairs as the searches complete.
+
+        :param queries: The queries to search for.
+        :type queries: Iterable[str]
+        :param concurrency: The maximum number of searches running at once, defaults to 10
+        :type concurrency: int, optional
+        :param kwargs: Any other keyword argument accepted by `search`.
+        :return: An async iterator of `(query, result)` pairs. A search that failed holds its exception instead of a response.
+        :rtype: AsyncIterator[Tuple[str, Union[TenorResponse, Exception]]]
+        """
+        async for _, query, result in map_bounded(lambda query: self.search(query, **kwargs), queries, concurrency = concurrency):
+            yield query, result
+
+    async def iter_search(self, query: str, *, max_results: Optional[int] = None, page_size: int = 50, prefetch: bool = True, pos: Optional[str] = None, dedupe: Optional["Deduplicator"] = None, **kwargs) -> AsyncIterator[Media]:
+        """Iterates over search results, following Tenor's `next` positions from page to page.
+
+        :param query: The query used to search Tenor
+        :type query: str
+        :param max_results: Stops after this many results. None iterates until Tenor runs out, defaults to None
+        :type max_results: Optional[int], optional
+        :param page_size: How many results are requested per page. Tenor allows up to 50, defaults to 50
+        :type page_size: int, optional
+        :param prefetch: Requests the next page while the current one is being consumed, defaults to True
+        :type prefetch: bool, optional
+        :param pos: The position of the first page, defaults to None
+        :type pos: Optional[str], optional
+        :param dedupe: Skips media already seen by this `Deduplicator`, such as repeats across pages. Skipped media don't count towards `max_results`, defaults to None
+        :type dedupe: Optional[Deduplicator], optional
+        :param kwargs: Any other keyword argument accepted by `search`, except `limit`.
+        :return: An async iterator of `Media` objects.
+        :rtype: AsyncIterator[Media]
+        """
+        async def fetch_page(pos, limit):
+            resp = await self.search(query, limit = limit, pos = pos, **kwargs)
+            return resp.media or [], resp.next
+
+        async for media in paginate(fetch_page, page_size = page_size, start = pos, max_results = max_results, prefetch = prefetch, skip = dedupe.is_duplicate if dedupe is not None else None):
+            yield media
+
+    async def iter_trending(self, *, max_results: Optional[int] = None, page_size: int = 50, prefetch: bool = True, pos: Optional[str] = None, dedupe: Optional["Deduplicator"] = None, **kwargs) -> AsyncIterator[Media]:
+        """Iterates over trending media, following Tenor's `next` positions from page to page.
+
+        :param max_results: Stops after this many results. None iterates until Tenor runs out, defaults to None
+        :type max_results: Optional[int], optional
+        :param page_size: How many results are requested per page. Tenor allows up to 50, defaults to 50
+        :type page_size: int, optional
+        :param prefetch: Requests the next page while the current one is being consumed, defaults to True
+        :type prefetch: bool, optional
+        :param pos: The position of the first page, defaults to None
+        :type pos: Optional[str], optional
+        :param dedupe: Skips media already seen by this `Deduplicator`, such as repeats across pages. Skipped media don't count towards `max_results`, defaults to None
+        :type dedupe: Optional[Deduplicator], optional
+        :param kwargs: Any other keyword argument accepted by `trending`, except `limit`.
+        :return: An async iterator of `Media` objects.
+        :rtype: AsyncIterator[Media]
+        """
+        async def fetch_page(pos, limit):
+            resp = await self.trending(limit = limit, pos = pos, **kwargs)
+            return resp.media or [], resp.next
+
+        async for media in paginate(fetch_page, page_size = page_size, start = pos, max_results = max_results, prefetch = prefetch, skip = dedupe.is_duplicate if dedupe is not None else None):
+            yield media
+
+    async def stream(self, media: Union[str, GIF, MP4], *, chunk_size: int = 64 * 1024, start: int = 0, max_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Streams a media file in fixed-size chunks over the client's session.
+
+        :param media: A url or a `GIF`/`MP4` format object.
+        :type media: Union[str, GIF, MP4]
+        :param chunk_size: The maximum size of each chunk, defaults to 64 KiB
+        :type chunk_size: int, optional
+        :param start: The byte offset to start from, defaults to 0
+        :type start: int, optional
+        :param max_size: Refuses files bigger than this many bytes, checked against the known size before fetching, defaults to None
+        :type max_size: Optional[int], optional
+        :raises MediaTooLarge: If the file is bigger than `max_size`.
+        :return: An async iterator of byte chunks.
+        :rtype: AsyncIterator[bytes]
+        """
+        async for chunk in self.http.stream(media, chunk_size = chunk_size, start = start, max_size = max_size):
+            yield chunk
+
+    async def download(self, media: Union[str, GIF, MP4], dest: Union[str, os.PathLike, BinaryIO], *, chunk_size: int = 64 * 1024, resume: bool = True, max_size: Optional[int] = None) -> int:
+        """Downloads a media file to a path or a writer, resuming partial downloads with HTTP Range requests.
+
+        :param media: A url or a `GIF`/`MP4` format object.
+        :type media: Union[str, GIF, MP4]
+        :param dest: A file path, or an object with a (possibly async) `write` method.
+        :type dest: Union[str, os.PathLike, BinaryIO]
+        :param chunk_size: The maximum size of each chunk, defaults to 64 KiB
+        :type chunk_size: int, optional
+        :param resume: Continues a partial download found at `dest`, defaults to True
+        :type resume: bool, optional
+        :param max_size: Refuses files bigger than this many bytes, checked against the known size before fetching, defaults to None
+        :type max_size: Optional[int], optional
+        :raises MediaTooLarge: If the file is bigger than `max_size`.
+        :return: The size of the downloaded file in bytes.
+        :rtype: int
+        """
+        return await self.http.download(media, dest, chunk_size = chunk_size, resume = resume, max_size = max_size)
+
+    async def download_many(self, items: Iterable[Tuple[Union[str, GIF, MP4], Union[str, os.PathLike, BinaryIO]]], *, concurrency: int = 4, **kwargs) -> List[Union[int, Exception]]:
+        """Downloads many media files, with at most `concurrency` downloads running at once.
+
+        :param items: `(media, dest)` pairs, as accepted by `download`.
+        :type items: Iterable[Tuple[Union[str, GIF, MP4], Union[str, os.PathLike, BinaryIO]]]
+        :param concurrency: The maximum number of downloads running at once, defaults to 4
+        :type concurrency: int, optional
+        :param kwargs: Any other keyword argument accepted by `download`.
+        :return: The size of each downloaded file, in input order. A failed download holds its exception instead.
+        :rtype: List[Union[int, Exception]]
+        """
+        return await gather_bounded(lambda item: self.download(*item, **kwargs), items, concurrency = concurrency)
+
+    async def open(self) -> "TenorClient":
+        """Opens the HTTP session now. Otherwise it is opened by the first request.
+
+        :rtype: TenorClient
+        """
+        await self.http.ensure_session()
+        return self
 
     async def close(self):
-        """Cleans up. Primarily HTTP Session closing.
+        """Cleans up. Stops the batches and preview downloads still running, then closes the HTTP Session.
         """
+        if self._shared.get((self.loop, self._auth)) is self:
+            del self._shared[(self.loop, self._auth)]
+        if self.batcher is not None:
+            await self.batcher.close()
+        if self.prefetcher is not None and self.prefetcher.http is self.http:
+            await self.prefetcher.close()
         return await self.http.cleanup()
 
-    def open(self):
-        """Called in __init__. Opens the aiohttp.ClientSession()
-        """
-        if self.__session is None:
-            asyncio.create_task(self.http.open_session())
+    async def __aenter__(self) -> "TenorClient":
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
 
     def  _filter_params(self, map: dict) -> dict:
         new_dict = {k: v for k, v in map.items() if v is not None}
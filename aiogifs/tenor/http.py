@@ -1,37 +1,26 @@
-import aiohttp
-from typing import Optional
-import warnings
+from ..http import HTTPClient as BaseHTTPClient, Route as BaseRoute
 
-class Route:
+class Route(BaseRoute):
     BASE = "https://g.tenor.com/v1"
-    def __init__(self, endpoint: str, params: dict, method: str = "GET", **kwargs):
-        self.method = method
-        self.endpoint = endpoint
-        self.url = self.BASE + endpoint.format(**kwargs)
-        self.params = params
 
 
 
-class HTTPClient:
-    def __init__(self, *, api_key: Optional[str] = None, session: Optional[aiohttp.ClientSession] = None):
-        self.__session = session
-        self._auth = api_key
-    
-    async def open_session(self):
-        if not self.__session:
-            self.__session = aiohttp.ClientSession(raise_for_status = True)
-        else:
-            if not self.__session.raise_for_status:
-                warnings.warn("raise_for_status is not enabled on your ClientSession. No HTTP Error raising is enabled!")
+class HTTPClient(BaseHTTPClient):
+    PROVIDER = "tenor"
+    AUTH_PARAM = "key"
+    ROUTE = Route
+    RESULTS_KEY = "results"
+    MAX_IDS = 50
+    REVALIDATE = ("/trending", "/trending_terms")
+    DEFAULT_TTLS = {
+        "/search": 300,
+        "/trending": 60,
+        "/gifs": 3600,
+        "/autocomplete": 600,
+        "/search_suggestions": 600,
+        "/trending_terms": 300,
+    }
 
-    async def request(self, route: Route) -> dict:
-        if self._auth and route.params.get("key") is None:
-            route.params.update(key = self._auth)
-        async with self.__session.request(route.method, route.url, params = route.params) as resp:
-            data = await resp.json()
-        return data
-
-    async def cleanup(self):
-        await self.__session.close()
-        self.__session = None
-    
+    def _usable(self, obj: dict) -> bool:
+        # a result without media, such as one taken down, has nothing to build a Media from
+        return bool(obj.get("media"))
@@ -1,7 +1,12 @@
 from typing import List, Union, Optional
 
 
+_MISSING = object()
+
+
 class MP4:
+    __slots__ = ("_data",)
+
     def __init__(self, *, data: dict):
         self._data = data
     
@@ -51,6 +56,8 @@ class MP4:
         return self._data.get("url")
 
 class GIF:
+    __slots__ = ("_data",)
+
     def __init__(self, *, data: dict):
         self._data = data
     
@@ -91,40 +98,64 @@ class GIF:
         return self._data.get("url")
 
 class WebM(GIF):
-    pass
+    __slots__ = ()
 
 class TinyMP4(MP4):
-    pass
+    __slots__ = ()
 
 class LoopedMP4(MP4):
-    pass
+    __slots__ = ()
 
 class NanoMP4(MP4):
-    pass
+    __slots__ = ()
 
 class TinyGIF(GIF):
-    pass
+    __slots__ = ()
 
 class NanoGIF(GIF):
-    pass
+    __slots__ = ()
 
-class TinyWebM(WebM): 
-    pass
+class TinyWebM(WebM):
+    __slots__ = ()
 
 class MediumGIF(GIF):
-    pass
+    __slots__ = ()
 
 class Media:
+    __slots__ = ("_data", "_raw_data", "_formats")
+
     def __init__(self, *, data: dict, raw_object: dict):
         self._data = data
         self._raw_data = raw_object
+        self._formats = None
 
     def _create_cls(self, key: str, cls):
-        obj = self._data.get(key)
-        if obj is None:
-            return None
-        else:
-            return cls(data = obj)
+        if self._formats is None:
+            self._formats = {}
+        obj = self._formats.get(key, _MISSING)
+        if obj is _MISSING:
+            data = self._data.get(key)
+            obj = self._formats[key] = None if data is None else cls(data = data)
+        return obj
+
+    @property
+    def id(self) -> str:
+        """Returns the Tenor id of the `Media` object.
+
+        :return: A string containing the id.
+        :rtype: str
+        """
+        return self._raw_data.get("id")
+
+    @property
+    def title(self) -> str:
+        """Returns the title of the `Media` object. Often empty.
+
+        :return: A string containing the title.
+        :rtype: str
+        """
+        return self._raw_data.get("title")
+
     @property
     def url(self) -> str:
         """Returns a quick access url for the `Media` object. Usually a `GIF` file type.
@@ -236,26 +267,39 @@ class Media:
 
 
 class TenorResponse:
+    __slots__ = ("_data", "_media")
+
     def __init__(self, *, data: dict):
         self._data = data
-        
+        self._media = _MISSING
+
     @property
     def media(self) -> List[Optional[Media]]:
-        """Generates the media objects and returns them in a list.
+        """Generates the media objects and returns them in a list. The list is built once and reused.
 
         :return: A list of `Media` objects.
         :rtype: Optional[List[Media]]
         """
-        results = self._data.get("results")
-        if results is None or len(results) == 0:
-            return None
-        
-        media_objs = []
-        for i in results:
-            media_obj = Media(data = i.get("media")[0], raw_object = i)
-            media_objs.append(media_obj)
+        if self._media is _MISSING:
+            results = self._data.get("results")
+            if results is None or len(results) == 0:
+                self._media = None
+            else:
+                self._media = [Media(data = i.get("media")[0], raw_object = i) for i in results]
+
+        return self._media
+
+    @property
+    def next(self) -> Optional[str]:
+        """Returns the position to pass as `pos` to fetch the next page of results.
 
-        return media_objs
+        :return: The position of the next page, or None if this is the last one.
+        :rtype: Optional[str]
+        """
+        pos = self._data.get("next")
+        if not pos or pos == "0":
+            return None
+        return pos
 
     @property
     def raw(self) -> dict:
@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .models import GIF, MP4, Media, TenorResponse
+
+Format = Union[GIF, MP4]
+
+# every `Media` variant and its container
+VARIANTS: Dict[str, str] = {
+    "nano_gif": "gif",
+    "tiny_gif": "gif",
+    "medium_gif": "gif",
+    "gif": "gif",
+    "nano_mp4": "mp4",
+    "tiny_mp4": "mp4",
+    "mp4": "mp4",
+    "looped_mp4": "mp4",
+    "tiny_webm": "webm",
+    "webm": "webm",
+}
+
+
+class FormatSelector:
+    def __init__(self, *, max_bytes: Optional[int] = None, max_width: Optional[int] = None, max_height: Optional[int] = None, min_width: Optional[int] = None, min_height: Optional[int] = None, max_duration: Optional[float] = None, containers: Sequence[str] = ("mp4", "webm", "gif"), exclude: Sequence[str] = ("looped_mp4",)):
+        """Picks the smallest variant of a Tenor `Media` object that meets a set of constraints.
+
+        Variants with an unknown size, dimension or duration are not ruled out by the constraint on it.
+
+        :param max_bytes: The maximum file size in bytes, defaults to None
+        :type max_bytes: Optional[int], optional
+        :param max_width: The maximum width in pixels, defaults to None
+        :type max_width: Optional[int], optional
+        :param max_height: The maximum height in pixels, defaults to None
+        :type max_height: Optional[int], optional
+        :param min_width: The minimum width in pixels, defaults to None
+        :type min_width: Optional[int], optional
+        :param min_height: The minimum height in pixels, defaults to None
+        :type min_height: Optional[int], optional
+        :param max_duration: The maximum duration, in the unit of `MP4.duration`, defaults to None
+        :type max_duration: Optional[float], optional
+        :param containers: The accepted containers, most preferred first. A smaller file in a less preferred container loses, defaults to ("mp4", "webm", "gif")
+        :type containers: Sequence[str], optional
+        :param exclude: Variant names never picked, defaults to ("looped_mp4",)
+        :type exclude: Sequence[str], optional
+        """
+        self.max_bytes = max_bytes
+        self.max_width = max_width
+        self.max_height = max_height
+        self.min_width = min_width
+        self.min_height = min_height
+        self.max_duration = max_duration
+        self.containers = tuple(containers)
+        self._variants: List[Tuple[int, str]] = [
+            (self.containers.index(container), name)
+            for name, container in VARIANTS.items()
+            if container in self.containers and name not in exclude
+        ]
+
+    def accepts(self, fmt: Format) -> bool:
+        """Returns whether a media format meets every constraint.
+
+        :param fmt: The format to check.
+        :type fmt: Union[GIF, MP4]
+        :rtype: bool
+        """
+        size = fmt.size
+        if self.max_bytes is not None and size is not None and size > self.max_bytes:
+            return False
+        dims = fmt.dimensions
+        if dims:
+            width, height = dims[0], dims[1]
+            if self.max_width is not None and width > self.max_width:
+                return False
+            if self.max_height is not None and height > self.max_height:
+                return False
+            if self.min_width is not None and width < self.min_width:
+                return False
+            if self.min_height is not None and height < self.min_height:
+                return False
+        duration = getattr(fmt, "duration", None)
+        if self.max_duration is not None and duration and duration > self.max_duration:
+            return False
+        return True
+
+    def select(self, media: Media) -> Optional[Format]:
+        """Returns the smallest acceptable variant of `media`, in the most preferred container that has one.
+
+        :param media: The media to pick a variant of.
+        :type media: Media
+        :return: The picked format, or None if no variant meets the constraints.
+        :rtype: Optional[Union[GIF, MP4]]
+        """
+        best = None
+        best_key = None
+        for rank, name in self._variants:
+            fmt = getattr(media, name)
+            if fmt is None or not fmt.url or not self.accepts(fmt):
+                continue
+            size = fmt.size
+            key = (rank, size if size is not None else float("inf"))
+            if best_key is None or key < best_key:
+                best, best_key = fmt, key
+        return best
+
+    def select_all(self, response: TenorResponse) -> List[Optional[Format]]:
+        """Picks a variant for every result of a response.
+
+        :param response: The response to pick variants from.
+        :type response: TenorResponse
+        :return: The picked format of every result, in order. None where no variant meets the constraints.
+        :rtype: List[Optional[Union[GIF, MP4]]]
+        """
+        return [self.select(media) for media in response.media or []]
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import aiohttp
+from typing import Any, Dict, Optional
+
+
+class Transport:
+    _shared: Dict[asyncio.AbstractEventLoop, "Transport"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, *, limit: int = 100, limit_per_host: int = 30, keepalive_timeout: Optional[float] = 30.0, ttl_dns_cache: Optional[int] = 300, happy_eyeballs_delay: Optional[float] = 0.25, interleave: Optional[int] = None, **connector_kwargs: Any):
+        """A tuned connection pool that several clients can share.
+
+        The underlying `aiohttp.ClientSession` is created on first use and closed once every client
+        using it has released it. aiohttp always enables TCP_NODELAY on its connections.
+
+        :param limit: The maximum number of open connections, defaults to 100
+        :type limit: int, optional
+        :param limit_per_host: The maximum number of open connections per host, defaults to 30
+        :type limit_per_host: int, optional
+        :param keepalive_timeout: How long idle connections are kept open in seconds, defaults to 30.0
+        :type keepalive_timeout: Optional[float], optional
+        :param ttl_dns_cache: How long resolved DNS entries are cached in seconds. None caches them forever, defaults to 300
+        :type ttl_dns_cache: Optional[int], optional
+        :param happy_eyeballs_delay: The Happy Eyeballs (RFC 8305) delay between connection attempts. None disables it, defaults to 0.25
+        :type happy_eyeballs_delay: Optional[float], optional
+        :param interleave: How many addresses of the first family are tried before the next one, defaults to None
+        :type interleave: Optional[int], optional
+        :param connector_kwargs: Passed on to `aiohttp.TCPConnector`.
+        """
+        self.connector_options: Dict[str, Any] = dict(
+            limit = limit,
+            limit_per_host = limit_per_host,
+            keepalive_timeout = keepalive_timeout,
+            ttl_dns_cache = ttl_dns_cache,
+            use_dns_cache = True,
+            happy_eyeballs_delay = happy_eyeballs_delay,
+            interleave = interleave,
+        )
+        self.connector_options.update(connector_kwargs)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._users = 0
+
+    @classmethod
+    def shared(cls, loop: Optional[asyncio.AbstractEventLoop] = None) -> "Transport":
+        """Returns the transport of an event loop, creating it with the default settings on first use.
+
+        A session only works on the loop it was opened on, so every loop gets its own transport.
+        Transports left behind by loops closed since are dropped, and their sessions closed on `loop`.
+
+        :param loop: The loop the transport is used on, defaults to the running loop
+        :type loop: Optional[asyncio.AbstractEventLoop], optional
+        :raises RuntimeError: If no loop is passed and none is running.
+        :rtype: Transport
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        with cls._shared_lock:
+            for closed in [other for other in cls._shared if other.is_closed()]:
+                # aiohttp closes a session of a closed loop without using that loop, so any loop can do it
+                asyncio.run_coroutine_threadsafe(cls._shared.pop(closed).close(), loop)
+            transport = cls._shared.get(loop)
+            if transport is None:
+                transport = cls._shared[loop] = cls()
+            return transport
+
+    @classmethod
+    async def close_shared(cls):
+        """Closes the transport returned by `shared` for the running loop, along with its session.
+        """
+        loop = asyncio.get_running_loop()
+        with cls._shared_lock:
+            transport = cls._shared.pop(loop, None)
+        if transport is not None:
+            await transport.close()
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        """Returns the open session, or None if it hasn't been opened yet.
+
+        :rtype: Optional[aiohttp.ClientSession]
+        """
+        return self._session
+
+    async def acquire(self) -> aiohttp.ClientSession:
+        """Registers a user of the transport and returns its session, opening it if needed.
+
+        :rtype: aiohttp.ClientSession
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(**self.connector_options)
+            self._session = aiohttp.ClientSession(connector = connector, raise_for_status = True)
+        self._users += 1
+        return self._session
+
+    async def release(self):
+        """Unregisters a user of the transport. The session is closed when the last user releases it.
+        """
+        self._users = max(self._users - 1, 0)
+        if self._users == 0:
+            await self.close()
+
+    async def close(self):
+        """Closes the session regardless of how many clients are still using it.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._users = 0
@@ -0,0 +1,24 @@
+
+class Strategy:
+    """How `GifClient` combines its providers.
+    """
+    @staticmethod
+    def hedge():
+        """Sends the request to every provider at once and returns the first successful answer.
+        """
+        return "hedge"
+
+    @staticmethod
+    def race():
+        """Sends the request to the primary provider, and to the next one only if it fails or hasn't answered within the latency budget. Returns the first successful answer.
+        """
+        return "race"
+
+    @staticmethod
+    def merge():
+        """Sends the request to every provider and merges the answers, dropping duplicates.
+
+        A duplicate repeats the provider and ID or the media URL of an earlier result. The same GIF
+        hosted by both Tenor and Giphy has different URLs on each, so it appears once per provider.
+        """
+        return "merge"
@@ -0,0 +1,155 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, Iterable, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+Page = Tuple[List[T], Optional[Any]]
+
+
+async def paginate(fetch_page: Callable[[Optional[Any], int], Awaitable[Page]], *, page_size: int, start: Optional[Any] = None, max_results: Optional[int] = None, prefetch: bool = True, skip: Optional[Callable[[T], Awaitable[bool]]] = None) -> AsyncIterator[T]:
+    """Yields the items of consecutive pages.
+
+    :param fetch_page: A coroutine function taking a position and a page size and returning the items of that page and the position of the next one, or None on the last page.
+    :type fetch_page: Callable[[Optional[Any], int], Awaitable[Tuple[List[T], Optional[Any]]]]
+    :param page_size: The number of items requested per page.
+    :type page_size: int
+    :param start: The position of the first page, defaults to None
+    :type start: Optional[Any], optional
+    :param max_results: Stops after this many items. None fetches every page, defaults to None
+    :type max_results: Optional[int], optional
+    :param prefetch: Requests the next page while the current one is being consumed, defaults to True
+    :type prefetch: bool, optional
+    :param skip: A coroutine function returning whether an item is left out, such as `Deduplicator.is_duplicate`. Skipped items don't count towards `max_results`, defaults to None
+    :type skip: Optional[Callable[[T], Awaitable[bool]]], optional
+    """
+    def fetch(pos: Optional[Any], count: int) -> "asyncio.Future[Page]":
+        size = page_size if max_results is None else min(page_size, max_results - count)
+        return asyncio.ensure_future(fetch_page(pos, size))
+
+    if max_results is not None and max_results <= 0:
+        return
+
+    count = 0
+    task: Optional["asyncio.Future[Page]"] = fetch(start, 0)
+    try:
+        while task is not None:
+            items, pos = await task
+            task = None
+            more = bool(items) and pos is not None
+            if skip is not None:
+                items = [item for item in items if not await skip(item)]
+            more = more and (max_results is None or count + len(items) < max_results)
+            if more and prefetch:
+                task = fetch(pos, count + len(items))
+
+            for item in items:
+                yield item
+                count += 1
+                if max_results is not None and count >= max_results:
+                    return
+
+            if more and task is None:
+                task = fetch(pos, count)
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+class _Died:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def map_bounded(func: Callable[[T], Awaitable[R]], items: Iterable[T], *, concurrency: int) -> AsyncIterator[Tuple[int, T, Union[R, Exception]]]:
+    """Calls `func` on every item with at most `concurrency` calls running at once.
+
+    Yields `(index, item, result)` tuples as the calls complete. A call that raises yields its
+    exception as the result instead of stopping the others. A `BaseException` other than
+    `Exception`, such as a `CancelledError`, is raised to the consumer.
+
+    :param func: The coroutine function to call.
+    :type func: Callable[[T], Awaitable[R]]
+    :param items: The arguments to call `func` with.
+    :type items: Iterable[T]
+    :param concurrency: The maximum number of calls running at once.
+    :type concurrency: int
+    """
+    items = list(items)
+    results: "asyncio.Queue[Tuple[int, T, Union[R, Exception, _Died]]]" = asyncio.Queue()
+    pending = iter(enumerate(items))
+
+    async def worker():
+        for index, item in pending:
+            try:
+                result = await func(item)
+            except Exception as e:
+                result = e
+            except BaseException as e:
+                # the worker dies with it: tell the consumer instead of leaving it waiting for results
+                results.put_nowait((index, item, _Died(e)))
+                raise
+            results.put_nowait((index, item, result))
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(min(max(concurrency, 1), len(items)))]
+    for task in workers:
+        # the error of a dead worker reaches the consumer through the queue
+        task.add_done_callback(lambda task: task.cancelled() or task.exception())
+    try:
+        for _ in range(len(items)):
+            index, item, result = await results.get()
+            if isinstance(result, _Died):
+                raise result.error
+            yield index, item, result
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+async def gather_bounded(func: Callable[[T], Awaitable[R]], items: Iterable[T], *, concurrency: int) -> List[Union[R, Exception]]:
+    """Like `map_bounded`, but waits for every call and returns the results in input order.
+
+    :rtype: List[Union[R, Exception]]
+    """
+    items = list(items)
+    results: List[Union[R, Exception]] = [None] * len(items)
+    async for index, _, result in map_bounded(func, items, concurrency = concurrency):
+        results[index] = result
+    return results
+
+
+class ParsedResponses(Generic[R]):
+    MAX_ENTRIES = 32
+
+    def __init__(self, build: Callable[[dict], R], *, max_entries: int = MAX_ENTRIES):
+        """Maps payloads to the response objects built from them.
+
+        Cached and revalidated payloads are handed out again as the same object, so the response
+        and the models it already built are reused instead of being parsed again.
+
+        :param build: Builds the response of a payload, such as `TenorResponse`.
+        :type build: Callable[[dict], R]
+        :param max_entries: The number of responses remembered, defaults to 32
+        :type max_entries: int, optional
+        """
+        self.build = build
+        self.max_entries = max_entries
+        # keyed by id(), with the payload kept alive so the id can't be reused while remembered
+        self._entries: "OrderedDict[int, Tuple[dict, R]]" = OrderedDict()
+
+    def get(self, data: dict) -> R:
+        """Returns the response of a payload, building it unless it was built before.
+
+        :rtype: R
+        """
+        entry = self._entries.get(id(data))
+        if entry is not None and entry[0] is data:
+            self._entries.move_to_end(id(data))
+            return entry[1]
+        response = self.build(data)
+        self._entries[id(data)] = (data, response)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last = False)
+        return response
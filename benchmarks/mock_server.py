@@ -0,0 +1,237 @@
+"""A local stand-in for the Tenor and Giphy APIs, used by the benchmarks and the tests.
+
+Tenor is served under `/tenor/v1` and Giphy under `/giphy/v1`. Responses are taken from
+`benchmarks/payloads/<provider>_<endpoint>.json` when such a recording exists, and are
+otherwise synthesised with the same shape as the real APIs. JSON responses carry an ETag and
+answer a matching `If-None-Match` with a `304`. Files added to `media` are served under
+`/media/<name>` with ETag and `Range` support.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+from collections import Counter
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+PAYLOADS = os.path.join(os.path.dirname(__file__), "payloads")
+
+TERMS = ["happy", "happy birthday", "happy dance", "happiness", "harry potter", "hello", "hello kitty", "hug", "laugh", "love"]
+
+TENOR_FORMATS = {
+    "nanogif": (90, 50), "tinygif": (220, 124), "mediumgif": (498, 280), "gif": (498, 280),
+    "nanomp4": (150, 84), "tinymp4": (320, 180), "mp4": (640, 360), "loopedmp4": (640, 360),
+    "tinywebm": (320, 180), "webm": (640, 360),
+}
+
+
+def tenor_result(i: int) -> dict:
+    media = {}
+    for n, (name, (w, h)) in enumerate(TENOR_FORMATS.items(), 1):
+        media[name] = {
+            "url": f"https://media.tenor.com/images/{i:016x}/{name}.gif",
+            "preview": f"https://media.tenor.com/images/{i:016x}/{name}-preview.png",
+            "dims": [w, h],
+            # distinct per result, as real files are, so size fingerprints don't match across results
+            "size": w * h * n // 3 + i,
+            "duration": 2.4 if "mp4" in name or "webm" in name else 0,
+        }
+    return {
+        "id": str(17000000000000000 + i),
+        "title": "",
+        "content_description": f"Synthetic GIF number {i}",
+        "itemurl": f"https://tenor.com/view/synthetic-gif-{i}",
+        "url": f"https://tenor.com/{i:x}.gif",
+        "created": 1600000000.0 + i,
+        "hasaudio": False,
+        "tags": ["benchmark", "synthetic"],
+        "media": [media],
+    }
+
+
+def giphy_result(i: int) -> dict:
+    def image(w: int, h: int, still: bool = False) -> dict:
+        image = {"url": f"https://media.giphy.com/media/{i:x}/{w}x{h}.gif", "width": str(w), "height": str(h)}
+        if not still:
+            image.update(size = str(w * h * 3 + i), mp4 = image["url"][:-3] + "mp4", mp4_size = str(w * h + i), webp = image["url"][:-3] + "webp", webp_size = str(w * h * 2 + i))
+        return image
+
+    return {
+        "type": "gif",
+        "id": f"synthetic{i:x}",
+        "url": f"https://giphy.com/gifs/synthetic-{i:x}",
+        "slug": f"synthetic-{i:x}",
+        "bitly_gif_url": f"https://gph.is/{i:x}",
+        "bitly_url": f"https://gph.is/{i:x}",
+        "embed_url": f"https://giphy.com/embed/{i:x}",
+        "username": "",
+        "source": "",
+        "title": f"Synthetic GIF number {i}",
+        "rating": "g",
+        "images": {
+            "original": image(480, 270),
+            "downsized": image(480, 270),
+            "fixed_height": image(356, 200),
+            "fixed_height_small": image(178, 100),
+            "fixed_width": image(200, 113),
+            "fixed_width_small": image(100, 56),
+            "fixed_width_still": image(200, 113, still = True),
+            "original_still": image(480, 270, still = True),
+            "preview_gif": image(150, 84),
+        },
+    }
+
+
+def _load(name: str) -> Optional[dict]:
+    path = os.path.join(PAYLOADS, f"{name}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as fp:
+        return json.load(fp)
+
+
+class MockServer:
+    def __init__(self, *, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, throttle_rate: float = 0.0, pool: int = 200, seed: int = 0):
+        """Serves Tenor and Giphy shaped responses with injected latency and errors.
+
+        :param latency: The base latency of every response in seconds, defaults to 0.0
+        :param jitter: A random extra latency of up to this many seconds, defaults to 0.0
+        :param error_rate: The share of requests answered with a 500, defaults to 0.0
+        :param throttle_rate: The share of requests answered with a 429, defaults to 0.0
+        :param pool: How many distinct results each endpoint pages over, defaults to 200
+        :param seed: Seeds the random latency and error injection, defaults to 0
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        # requests served per path, such as "/tenor/v1/search"
+        self.hits: Counter = Counter()
+        self.terms = list(TERMS)
+        self.media: Dict[str, bytes] = {}
+        # whether media requests honour the Range header
+        self.ranges = True
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+        tenor = _load("tenor_search")
+        giphy = _load("giphy_search")
+        self.tenor: List[dict] = tenor["results"] if tenor else [tenor_result(i) for i in range(pool)]
+        self.giphy: List[dict] = giphy["data"] if giphy else [giphy_result(i) for i in range(pool)]
+
+    @property
+    def tenor_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/tenor/v1"
+
+    @property
+    def giphy_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/giphy/v1"
+
+    def media_url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self.port}/media/{name}"
+
+    async def _delay(self, request: web.Request) -> Optional[web.Response]:
+        self.requests += 1
+        self.hits[request.path] += 1
+        delay = self.latency + self.random.random() * self.jitter
+        if delay:
+            await asyncio.sleep(delay)
+        roll = self.random.random()
+        if roll < self.error_rate:
+            return web.Response(status = 500)
+        if roll < self.error_rate + self.throttle_rate:
+            return web.Response(status = 429, headers = {"Retry-After": "0"})
+        return None
+
+    @staticmethod
+    def _json(request: web.Request, payload: dict) -> web.Response:
+        body = json.dumps(payload).encode()
+        etag = '"' + hashlib.blake2b(body, digest_size = 8).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status = 304, headers = {"ETag": etag})
+        return web.Response(body = body, content_type = "application/json", headers = {"ETag": etag})
+
+    def _terms(self, request: web.Request) -> List[str]:
+        limit = int(request.query.get("limit", 20))
+        query = request.query.get("q", "").lower()
+        return [term for term in self.terms if term.startswith(query)][:limit]
+
+    async def tenor_handler(self, request: web.Request) -> web.Response:
+        error = await self._delay(request)
+        if error is not None:
+            return error
+        endpoint = request.match_info["endpoint"]
+        if endpoint == "gifs":
+            ids = set(request.query.get("ids", "").split(","))
+            return self._json(request, {"results": [result for result in self.tenor if result["id"] in ids]})
+        if endpoint in ("autocomplete", "search_suggestions", "trending_terms"):
+            return self._json(request, {"results": self._terms(request)})
+        limit = min(int(request.query.get("limit", 20)), 50)
+        pos = int(request.query.get("pos", 0) or 0)
+        results = [self.tenor[(pos + i) % len(self.tenor)] for i in range(limit)]
+        return self._json(request, {"weburl": "https://tenor.com/search", "results": results, "next": str(pos + limit)})
+
+    async def giphy_handler(self, request: web.Request) -> web.Response:
+        error = await self._delay(request)
+        if error is not None:
+            return error
+        meta = {"status": 200, "msg": "OK", "response_id": "benchmark"}
+        endpoint = request.match_info.get("endpoint")
+        if endpoint is None:
+            ids = set(request.query.get("ids", "").split(","))
+            return self._json(request, {"data": [result for result in self.giphy if result["id"] in ids], "meta": meta})
+        if endpoint == "search/tags":
+            return self._json(request, {"data": [{"name": term} for term in self._terms(request)], "meta": meta})
+        limit = min(int(request.query.get("limit", 25)), 50)
+        offset = int(request.query.get("offset", 0))
+        data = [self.giphy[(offset + i) % len(self.giphy)] for i in range(limit)]
+        return self._json(request, {
+            "data": data,
+            "pagination": {"total_count": 5000, "count": limit, "offset": offset},
+            "meta": meta,
+        })
+
+    async def media_handler(self, request: web.Request) -> web.Response:
+        self.hits[request.path] += 1
+        body = self.media.get(request.match_info["name"])
+        if body is None:
+            return web.Response(status = 404)
+        etag = '"' + hashlib.blake2b(body, digest_size = 8).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status = 304, headers = {"ETag": etag})
+        headers = {"ETag": etag}
+        if self.ranges and request.http_range.start:
+            start = request.http_range.start
+            if start >= len(body):
+                return web.Response(status = 416)
+            headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            return web.Response(status = 206, body = body[start:], headers = headers)
+        return web.Response(body = body, content_type = "image/gif", headers = headers)
+
+    async def start(self, port: int = 0):
+        app = web.Application()
+        app.router.add_get("/tenor/v1/{endpoint}", self.tenor_handler)
+        app.router.add_get("/giphy/v1/gifs", self.giphy_handler)
+        app.router.add_get("/giphy/v1/gifs/{endpoint:.+}", self.giphy_handler)
+        app.router.add_get("/media/{name}", self.media_handler)
+        self._runner = web.AppRunner(app, access_log = None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
@@ -0,0 +1,156 @@
+"""Measures the throughput, latency, decode time and memory use of TenorClient and GiphyClient
+against the local mock server, and writes the results as JSON.
+
+    python -m benchmarks.run --requests 2000 --concurrency 50 --output results.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List
+
+from aiogifs import MetricsCollector
+from aiogifs.giphy import GiphyClient
+from aiogifs.giphy.models import GiphyResponse
+from aiogifs.tenor import TenorClient
+from aiogifs.tenor.models import TenorResponse
+
+from .mock_server import MockServer
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def load(call: Callable[[int], Awaitable[object]], *, requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": elapsed,
+        "requests_per_second": requests / elapsed,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p90_ms": percentile(latencies, 0.90) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "latency_max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+def model_memory(build: Callable[[], object], walk: Callable[[object], None], repeat: int = 20) -> float:
+    """Returns the bytes allocated per response to build it and touch every media object once."""
+    tracemalloc.start()
+    keep = []
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(repeat):
+        response = build()
+        walk(response)
+        keep.append(response)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / repeat
+
+
+def walk_tenor(response: TenorResponse):
+    for media in response.media or []:
+        media.gif, media.mp4, media.tiny_gif, media.tiny_mp4
+
+
+def walk_giphy(response: GiphyResponse):
+    for media in response.media:
+        media.original, media.preview_url
+
+
+async def run(args: argparse.Namespace) -> dict:
+    results = {}
+    server = MockServer(latency = args.latency, jitter = args.jitter, error_rate = args.error_rate, throttle_rate = args.throttle_rate)
+    async with server:
+        queries = [f"query{i % args.distinct}" for i in range(args.requests)]
+
+        metrics = MetricsCollector()
+        tenor = TenorClient(api_key = "benchmark", cache = args.cache, base_url = server.tenor_url, hooks = [metrics])
+        await tenor.open()
+        stats = await load(lambda i: tenor.search(queries[i], limit = args.limit), requests = args.requests, concurrency = args.concurrency)
+        await tenor.close()
+        payload = {"results": server.tenor[:args.limit], "next": str(args.limit)}
+        stats.update(_decode_stats(metrics, "tenor"))
+        stats["memory_per_response_bytes"] = model_memory(lambda: TenorResponse(data = payload), walk_tenor)
+        results["tenor"] = stats
+
+        metrics = MetricsCollector()
+        giphy = GiphyClient(api_key = "benchmark", cache = args.cache, base_url = server.giphy_url, hooks = [metrics])
+        await giphy.open()
+        stats = await load(lambda i: giphy.search(queries[i], limit = args.limit), requests = args.requests, concurrency = args.concurrency)
+        await giphy.close()
+        payload = {"data": server.giphy[:args.limit], "pagination": {}, "meta": {}}
+        stats.update(_decode_stats(metrics, "giphy"))
+        stats["memory_per_response_bytes"] = model_memory(lambda: GiphyResponse(raw_payload = payload), walk_giphy)
+        results["giphy"] = stats
+
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "json_backend": getattr(tenor.http.json_loads, "__module__", None),
+        "config": vars(args),
+        "results": results,
+    }
+
+
+def _decode_stats(metrics: MetricsCollector, provider: str) -> Dict[str, float]:
+    count = sum(h.count for (p, _), h in metrics.decode.items() if p == provider)
+    total = sum(h.sum for (p, _), h in metrics.decode.items() if p == provider)
+    received = sum(v for (p, _), v in metrics.bytes.items() if p == provider)
+    return {
+        "decode_mean_us": total / count * 1e6 if count else 0.0,
+        "response_bytes_mean": received / count if count else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type = int, default = 1000, help = "requests sent to each provider")
+    parser.add_argument("--concurrency", type = int, default = 20, help = "requests in flight at once")
+    parser.add_argument("--limit", type = int, default = 50, help = "results per response")
+    parser.add_argument("--distinct", type = int, default = 10 ** 9, help = "number of distinct queries cycled through")
+    parser.add_argument("--cache", action = "store_true", help = "keep the response cache enabled")
+    parser.add_argument("--latency", type = float, default = 0.0, help = "server latency in seconds")
+    parser.add_argument("--jitter", type = float, default = 0.0, help = "random extra server latency in seconds")
+    parser.add_argument("--error-rate", type = float, default = 0.0, help = "share of requests failing with a 500")
+    parser.add_argument("--throttle-rate", type = float, default = 0.0, help = "share of requests failing with a 429")
+    parser.add_argument("--output", help = "file the JSON results are written to, instead of stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args)), indent = 2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
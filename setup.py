@@ -2,7 +2,8 @@ from setuptools import setup, find_packages
 
 
 extras_require = {
-    'speedups': ['aiohttp[speedups]'],
+    'speedups': ['aiohttp[speedups]', 'orjson'],
+    'phash': ['Pillow'],
 }
 
 
@@ -21,7 +22,7 @@ setup(
     long_description=open("README.md").read(),
     packages=["aiogifs", "aiogifs/tenor", "aiogifs/giphy"],
     extras_require = extras_require,
-    install_requires=['aiohttp'],
+    install_requires=['aiohttp>=3.10'],
     keywords=["python", "aiohttp", "tenor", "giphy", "api", "async", "await"],
     classifiers=[
         "Development Status :: 1 - Planning",
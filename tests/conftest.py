@@ -0,0 +1,17 @@
+import asyncio
+import inspect
+
+import pytest
+
+# a test still running after this many seconds is reported as hung
+TIMEOUT = 30
+
+
+@pytest.hookimpl(tryfirst = True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Runs `async def` tests on a fresh event loop, so the suite needs no asyncio plugin."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    kwargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    asyncio.run(asyncio.wait_for(pyfuncitem.obj(**kwargs), TIMEOUT))
+    return True
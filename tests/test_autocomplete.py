@@ -0,0 +1,111 @@
+from aiogifs import PrefixCache
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+def test_exact_hits_only_by_default():
+    cache = PrefixCache()
+    cache.put("hap", 20, ["happy", "happiness"])
+    assert cache.get("HAP ", 20) == ["happy", "happiness"]
+    assert cache.get("happ", 20) is None
+    assert cache.stats["hits"] == 1 and cache.stats["prefix_hits"] == 0
+
+
+def test_prefix_reuse_is_opt_in():
+    cache = PrefixCache(prefix_reuse = True)
+    cache.put("hap", 20, ["happy", "happiness"])
+    assert cache.get("happy", 20) == ["happy"]
+    assert cache.stats["prefix_hits"] == 1
+    # a cut-off answer may be missing completions, so it is never reused for longer queries
+    cache.put("h", 2, ["happy", "hello"])
+    assert cache.get("hu", 2) is None
+
+
+def test_longest_prefix_wins_and_evicted_branches_are_pruned():
+    cache = PrefixCache(prefix_reuse = True, max_entries = 2)
+    cache.put("h", 20, ["happy", "hello", "hug"])
+    cache.put("he", 20, ["hello", "help"])
+    assert cache.get("hel", 20) == ["hello", "help"]
+    cache.put("x", 20, [])
+    # "h" was the least recently used, so only "he" still answers under it
+    assert len(cache) == 2 and cache.get("hu", 20) is None
+    cache.clear()
+    assert len(cache) == 0 and not cache._roots
+
+
+def test_asking_for_more_terms_misses():
+    cache = PrefixCache()
+    cache.put("h", 2, ["happy", "hello"])
+    assert cache.get("h", 1) == ["happy"]
+    assert cache.get("h", 5) is None
+
+
+def test_expired_answers_are_dropped():
+    cache = PrefixCache(ttl = 0)
+    cache.put("hap", 20, ["happy"])
+    assert cache.get("hap", 20) is None
+    assert len(cache) == 0
+
+
+async def test_tenor_autocomplete_is_cached_once():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            assert await client.autocomplete("hap", limit = 5) == ["happy", "happy birthday", "happy dance", "happiness"]
+            assert await client.autocomplete("hap", limit = 5) == ["happy", "happy birthday", "happy dance", "happiness"]
+            assert server.hits["/tenor/v1/autocomplete"] == 1
+            # the payload isn't kept by the response cache too
+            assert len(client.http.cache) == 0
+
+
+
+async def test_tenor_autocomplete_reuses_a_prefix_answer():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            await client.autocomplete("hap", limit = 5)
+            # "hap" got fewer terms than asked for, so they hold every completion of "happ"
+            assert await client.autocomplete("happ", limit = 5) == ["happy", "happy birthday", "happy dance", "happiness"]
+            assert await client.autocomplete("happy ", limit = 5) == ["happy", "happy birthday", "happy dance"]
+            assert server.hits["/tenor/v1/autocomplete"] == 1
+            assert client.autocomplete_cache.stats["prefix_hits"] == 2
+
+            # a cut-off answer isn't reused
+            await client.autocomplete("h", limit = 2)
+            await client.autocomplete("he", limit = 2)
+            assert server.hits["/tenor/v1/autocomplete"] == 3
+
+
+async def test_autocomplete_cache_can_be_exact_or_off():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, autocomplete_cache = PrefixCache()) as client:
+            await client.autocomplete("hap", limit = 5)
+            await client.autocomplete("happ", limit = 5)
+            assert server.hits["/tenor/v1/autocomplete"] == 2
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, autocomplete_cache = False) as client:
+            assert client.autocomplete_cache is None
+            await client.autocomplete("hap", limit = 5)
+            await client.autocomplete("hap", limit = 5)
+            # left to the response cache
+            assert server.hits["/tenor/v1/autocomplete"] == 3 and len(client.http.cache) == 1
+
+
+async def test_tenor_terms_endpoints():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            assert await client.search_suggestions("hello") == ["hello", "hello kitty"]
+            assert len(await client.trending_terms(limit = 3)) == 3
+
+
+async def test_giphy_autocomplete_uses_tag_search():
+    async with MockServer() as server:
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url) as client:
+            assert await client.autocomplete("hel") == ["hello", "hello kitty"]
+            assert await client.autocomplete("hel") == ["hello", "hello kitty"]
+            assert await client.autocomplete("hell") == ["hello", "hello kitty"]
+            assert server.hits["/giphy/v1/gifs/search/tags"] == 1
+            assert len(client.http.cache) == 0
+
+            # a later page is only reused for the same query
+            await client.autocomplete("h", limit = 10, offset = 5)
+            await client.autocomplete("hu", limit = 10, offset = 5)
+            assert server.hits["/giphy/v1/gifs/search/tags"] == 3
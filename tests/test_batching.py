@@ -0,0 +1,94 @@
+import asyncio
+import gc
+
+import pytest
+
+from aiogifs import Batcher
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+class Died(BaseException):
+    pass
+
+
+async def test_loads_within_the_window_share_a_call():
+    calls = []
+
+    async def load_many(keys):
+        calls.append(keys)
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    batcher = Batcher(load_many, window = 0.01)
+    assert await asyncio.gather(batcher.load("a"), batcher.load("b"), batcher.load("a"), batcher.load("missing")) == ["A", "B", "A", None]
+    assert calls == [["a", "b", "missing"]]
+    assert batcher.stats["batches"] == 1 and batcher.stats["mean_batch_size"] == 3
+
+
+async def test_max_batch_sends_early():
+    calls = []
+
+    async def load_many(keys):
+        calls.append(keys)
+        return {key: key for key in keys}
+
+    batcher = Batcher(load_many, window = 60, max_batch = 2)
+    assert await asyncio.gather(batcher.load(1), batcher.load(2)) == [1, 2]
+    assert calls == [[1, 2]]
+
+
+@pytest.mark.parametrize("error", [ValueError("boom"), Died()])
+async def test_a_failed_batch_fails_every_caller(error):
+    async def load_many(keys):
+        raise error
+
+    batcher = Batcher(load_many, window = 0.001)
+    results = await asyncio.wait_for(asyncio.gather(batcher.load("a"), batcher.load("b"), return_exceptions = True), 1)
+    assert results == [error, error]
+    await asyncio.gather(*batcher._tasks, return_exceptions = True)
+
+
+async def test_a_cancelled_batch_cancels_its_callers():
+    started = asyncio.Event()
+
+    async def load_many(keys):
+        started.set()
+        await asyncio.sleep(60)
+
+    batcher = Batcher(load_many, window = 0)
+    callers = [asyncio.ensure_future(batcher.load(key)) for key in "ab"]
+    await started.wait()
+    for task in list(batcher._tasks):
+        task.cancel()
+    results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions = True), 1)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+async def test_errors_without_callers_are_retrieved():
+    errors = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+    release = asyncio.Event()
+
+    async def load_many(keys):
+        await release.wait()
+        raise ValueError("boom")
+
+    batcher = Batcher(load_many, window = 0)
+    caller = asyncio.ensure_future(batcher.load("a"))
+    await asyncio.sleep(0.01)
+    caller.cancel()
+    release.set()
+    await asyncio.gather(*batcher._tasks)
+    del caller
+    gc.collect()
+    assert errors == []
+
+
+async def test_get_by_id_batches_through_the_client():
+    async with MockServer() as server:
+        ids = [result["id"] for result in server.tenor[:5]]
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, batch_window = 0.01) as client:
+            media = await asyncio.gather(*(client.get_by_id(id) for id in ids + ["unknown"]))
+            assert [m.id for m in media[:5]] == ids and media[5] is None
+            assert server.hits["/tenor/v1/gifs"] == 1
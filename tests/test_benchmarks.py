@@ -0,0 +1,23 @@
+import argparse
+
+import aiohttp
+
+from benchmarks.mock_server import MockServer
+from benchmarks.run import run
+
+
+async def test_mock_server_injects_errors():
+    async with MockServer(error_rate = 1.0) as server:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.giphy_url + "/gifs/search") as resp:
+                assert resp.status == 500
+
+
+async def test_benchmark_reports_every_provider():
+    args = argparse.Namespace(requests = 20, concurrency = 4, limit = 5, distinct = 10 ** 9, cache = False, latency = 0.0, jitter = 0.0, error_rate = 0.2, throttle_rate = 0.0, output = None)
+    report = await run(args)
+    for provider in ("tenor", "giphy"):
+        stats = report["results"][provider]
+        assert stats["requests"] == 20
+        assert 0 < stats["errors"] < 20
+        assert stats["memory_per_response_bytes"] > 0
@@ -0,0 +1,128 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from aiogifs import CircuitBreaker, CircuitOpen
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+KEY = "tenor:/search"
+
+
+def test_opens_once_enough_requests_failed():
+    breaker = CircuitBreaker(failure_rate = 0.5, min_requests = 4, cooldown = 60)
+    for success in (True, False, True):
+        permit = breaker.allow(KEY)
+        assert permit
+        breaker.record(KEY, success, permit)
+    assert breaker.state(KEY) == "closed"
+    breaker.record(KEY, False, breaker.allow(KEY))
+    assert breaker.state(KEY) == "open"
+    assert breaker.allow(KEY) is None
+    assert 0 < breaker.retry_after(KEY) <= 60
+    assert breaker.stats[KEY]["trips"] == 1
+
+
+def test_probes_close_or_reopen_the_circuit():
+    breaker = CircuitBreaker(min_requests = 1, cooldown = 0)
+    breaker.record(KEY, False, breaker.allow(KEY))
+    assert breaker.state(KEY) == "half_open"
+    probe = breaker.allow(KEY)
+    assert probe.probe
+    # one probe at a time, and the refused request is told to come back later
+    assert breaker.allow(KEY) is None
+    assert breaker.retry_after(KEY) == CircuitBreaker.PROBE_RETRY_AFTER
+    breaker.record(KEY, False, probe)
+    assert breaker.stats[KEY]["trips"] == 2
+
+    probe = breaker.allow(KEY)
+    breaker.release(KEY, probe)
+    probe = breaker.allow(KEY)
+    assert probe
+    breaker.record(KEY, True, probe)
+    assert breaker.state(KEY) == "closed"
+
+
+def test_only_probes_decide_a_half_open_circuit():
+    breaker = CircuitBreaker(min_requests = 1, cooldown = 0)
+    early = breaker.allow(KEY)
+    late = breaker.allow(KEY)
+    breaker.record(KEY, False, early)
+    probe = breaker.allow(KEY)
+    assert probe.probe and not late.probe
+
+    # let through while the circuit was closed, so neither closes nor reopens it
+    breaker.record(KEY, True, late)
+    assert breaker.state(KEY) == "half_open"
+    breaker.release(KEY, late)
+    assert breaker.allow(KEY) is None
+
+    breaker.record(KEY, True, probe)
+    assert breaker.state(KEY) == "closed"
+    # nor does it count once the circuit closed again
+    breaker.record(KEY, False, late)
+    assert breaker.stats[KEY]["failures"] == 0
+
+
+def test_client_errors_are_not_failures():
+    assert not CircuitBreaker.is_failure(aiohttp.ClientResponseError(None, (), status = 404))
+    assert CircuitBreaker.is_failure(aiohttp.ClientResponseError(None, (), status = 503))
+    assert CircuitBreaker.is_failure(asyncio.TimeoutError())
+
+
+async def test_an_open_circuit_fails_fast():
+    breaker = CircuitBreaker(min_requests = 2, cooldown = 60)
+    async with MockServer(error_rate = 1.0) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, breaker = breaker, cache = False) as client:
+            for _ in range(2):
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await client.search("cat")
+            with pytest.raises(CircuitOpen):
+                await client.search("cat")
+            assert server.hits["/tenor/v1/search"] == 2
+
+
+async def test_an_open_circuit_serves_stale_responses():
+    breaker = CircuitBreaker(min_requests = 1, cooldown = 60)
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, breaker = breaker, cache_ttls = {"/search": 0.01}) as client:
+            first = await client.search("cat", limit = 5)
+            server.error_rate = 1.0
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.search("dog", limit = 5)
+            assert breaker.state(KEY) == "open"
+            await asyncio.sleep(0.02)
+            assert (await client.search("cat", limit = 5)).media[0].id == first.media[0].id
+            with pytest.raises(CircuitOpen):
+                await client.search("dog", limit = 5)
+            assert server.hits["/tenor/v1/search"] == 2
+
+
+async def test_expired_responses_are_served_while_revalidated():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, breaker = CircuitBreaker(), cache_ttls = {"/search": 0.05}) as client:
+            old = (await client.search("cat", limit = 5)).media[0].id
+            server.tenor = server.tenor[::-1]
+            new = server.tenor[0]["id"]
+            await asyncio.sleep(0.1)
+
+            # expired: answered from the cache while one refresh runs in the background
+            answers = await asyncio.gather(*(client.search("cat", limit = 5) for _ in range(3)))
+            assert [answer.media[0].id for answer in answers] == [old] * 3
+            while client.http._inflight:
+                await asyncio.sleep(0.01)
+            assert server.hits["/tenor/v1/search"] == 2
+            assert (await client.search("cat", limit = 5)).media[0].id == new
+
+
+async def test_close_cancels_background_refreshes():
+    async with MockServer() as server:
+        client = TenorClient(api_key = "key", base_url = server.tenor_url, breaker = CircuitBreaker(), cache_ttls = {"/search": 0.01})
+        await client.search("cat", limit = 5)
+        server.latency = 1.0
+        await asyncio.sleep(0.02)
+        await client.search("cat", limit = 5)
+        assert client.http._inflight
+        await client.close()
+        assert not client.http._inflight and client.http._session is None
@@ -0,0 +1,146 @@
+import asyncio
+import fnmatch
+
+import aiohttp
+import pytest
+
+from aiogifs import MemoryCache, RedisCache
+from aiogifs.cache import make_cache_key
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+def test_cache_key_ignores_auth_and_order():
+    a = make_cache_key("https://g.tenor.com/v1/search/", {"q": "cat", "limit": 5, "key": "one"}, exclude = ("key",))
+    b = make_cache_key("https://G.tenor.com/v1/search", {"limit": 5, "key": "two", "q": "cat", "pos": None}, exclude = ("key",))
+    assert a == b
+
+
+async def test_memory_cache_expires():
+    cache = MemoryCache()
+    await cache.set("a", {"v": 1}, ttl = 0.05)
+    assert await cache.get("a") == {"v": 1}
+    await asyncio.sleep(0.1)
+    assert await cache.get("a") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+    assert len(cache) == 0
+
+
+async def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries = 2)
+    await cache.set("a", 1, ttl = 60)
+    await cache.set("b", 2, ttl = 60)
+    await cache.get("a")
+    await cache.set("c", 3, ttl = 60)
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert cache.evictions == 1
+
+
+async def test_memory_cache_byte_limit():
+    cache = MemoryCache(max_bytes = 100)
+    await cache.set("a", "x", ttl = 60, size = 60)
+    await cache.set("b", "y", ttl = 60, size = 60)
+    assert await cache.get("a") is None
+    assert cache.size == 60
+    # an entry bigger than the whole cache is not stored
+    await cache.set("c", "z", ttl = 60, size = 200)
+    assert await cache.get("c") is None
+
+
+async def test_search_is_cached():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            first = await client.search("cat", limit = 5)
+            second = await client.search("cat", limit = 5)
+            assert first.raw is second.raw
+            await client.search("dog", limit = 5)
+        assert server.hits["/tenor/v1/search"] == 2
+
+
+async def test_cache_disabled():
+    async with MockServer() as server:
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url, cache = False) as client:
+            await client.trending(limit = 5)
+            await client.trending(limit = 5)
+        assert server.hits["/giphy/v1/gifs/trending"] == 2
+
+
+async def test_errors_are_not_cached():
+    async with MockServer(error_rate = 1.0) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.search("cat", limit = 5)
+            server.error_rate = 0.0
+            response = await client.search("cat", limit = 5)
+            assert len(response.media) == 5
+
+
+class FakeRedis:
+    """Keeps keys in a dict and expires them against `now`, which the tests move forward."""
+    def __init__(self):
+        self.now = 0.0
+        self.data = {}
+
+    async def get(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= self.now:
+            del self.data[key]
+            return None
+        return value
+
+    async def set(self, key, value, ex = None):
+        self.data[key] = (value, None if ex is None else self.now + ex)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match = "*"):
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+
+async def test_redis_cache_expires_and_keeps_a_stale_copy():
+    client = FakeRedis()
+    cache = RedisCache(client, stale_ttl = 10)
+    await cache.set("a", {"v": 1}, ttl = 5)
+    assert client.data["aiogifs:a"] == ('{"v": 1}', 5)
+    assert client.data["aiogifs:stale:a"] == ('{"v": 1}', 15)
+    assert await cache.get("a") == {"v": 1}
+
+    client.now = 6
+    assert await cache.get("a") is None
+    assert await cache.get("a", stale = True) == {"v": 1}
+    client.now = 16
+    assert await cache.get("a", stale = True) is None
+    assert cache.stats["hits"] == 2 and cache.stats["misses"] == 2
+
+    # below a second there is nothing Redis could expire, so nothing is stored
+    await cache.set("b", {"v": 2}, ttl = 0.5)
+    assert not client.data
+
+
+async def test_redis_cache_without_stale_ttl_reads_the_live_key():
+    client = FakeRedis()
+    cache = RedisCache(client)
+    await cache.set("a", {"v": 1}, ttl = 5)
+    assert list(client.data) == ["aiogifs:a"]
+    assert await cache.get("a", stale = True) == {"v": 1}
+
+
+async def test_redis_cache_delete_and_clear_keep_to_its_prefix():
+    client = FakeRedis()
+    await client.set("other:a", "1")
+    cache = RedisCache(client, stale_ttl = 10)
+    for key in ("a", "b"):
+        await cache.set(key, {"key": key}, ttl = 5)
+
+    await cache.delete("a")
+    assert await cache.get("a") is None and await cache.get("a", stale = True) is None
+    assert await cache.get("b") == {"key": "b"}
+
+    await cache.clear()
+    assert list(client.data) == ["other:a"]
@@ -0,0 +1,48 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+async def test_identical_requests_share_one_call():
+    async with MockServer(latency = 0.05) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, cache = False) as client:
+            responses = await asyncio.gather(*(client.search("cat", limit = 5) for _ in range(10)))
+            assert server.hits["/tenor/v1/search"] == 1
+            assert all(r.raw is responses[0].raw for r in responses)
+            assert not client.http._inflight
+
+
+async def test_error_reaches_every_waiter():
+    async with MockServer(latency = 0.05, error_rate = 1.0) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, cache = False) as client:
+            results = await asyncio.gather(*(client.search("cat", limit = 5) for _ in range(3)), return_exceptions = True)
+            assert all(isinstance(r, aiohttp.ClientResponseError) for r in results)
+            assert server.hits["/tenor/v1/search"] == 1
+
+
+async def test_cancelled_waiter_leaves_request_running():
+    async with MockServer(latency = 0.1) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, cache = False) as client:
+            first = asyncio.ensure_future(client.search("cat", limit = 5))
+            second = asyncio.ensure_future(client.search("cat", limit = 5))
+            await asyncio.sleep(0.02)
+            first.cancel()
+            response = await second
+            assert len(response.media) == 5
+            assert server.hits["/tenor/v1/search"] == 1
+
+
+async def test_new_caller_does_not_join_a_cancelled_request():
+    async with MockServer(latency = 0.1) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, cache = False) as client:
+            only = asyncio.ensure_future(client.search("cat", limit = 5))
+            await asyncio.sleep(0.02)
+            only.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await only
+            response = await client.search("cat", limit = 5)
+            assert len(response.media) == 5
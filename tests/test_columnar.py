@@ -0,0 +1,63 @@
+import pytest
+
+from aiogifs import MediaTable
+from aiogifs.giphy.models import Media as GiphyMedia
+from aiogifs.tenor import TenorClient
+from aiogifs.tenor.models import Media as TenorMedia
+from benchmarks.mock_server import MockServer, giphy_result, tenor_result
+
+
+def tenor_media(i: int, size: int) -> TenorMedia:
+    result = tenor_result(i)
+    result["media"][0]["gif"]["size"] = size
+    if i % 3 == 0:
+        del result["media"][0]["tinymp4"]
+    return TenorMedia(data = result["media"][0], raw_object = result)
+
+
+def test_rows_read_like_media():
+    media = [tenor_media(i, 100 * i) for i in range(1, 4)]
+    table = MediaTable.from_tenor(media)
+    assert len(table) == 3
+    row = table[1]
+    assert row.id == media[1].id and row.url == media[1].url
+    assert row.gif.url == media[1].gif.url and row.gif.size == 200
+    assert row.gif.dimensions == media[1].gif.dimensions
+    assert row.mp4.duration == media[1].mp4.duration
+    assert table[-1].tiny_mp4 is None
+    assert "tiny_mp4" not in table[-1].images
+    with pytest.raises(IndexError):
+        table[3]
+    with pytest.raises(AttributeError):
+        row.webm
+
+
+def test_columns_filter_and_sort():
+    table = MediaTable.from_tenor([tenor_media(i, size) for i, size in enumerate((300, 100, 200, 400), 1)])
+    assert list(table.column("gif", "size")) == [300, 100, 200, 400]
+    assert [row.gif.size for row in table.filter("gif", max_bytes = 250)] == [100, 200]
+    assert [row.gif.size for row in table.sort("gif")] == [100, 200, 300, 400]
+    assert [row.gif.size for row in table.sort("gif", reverse = True)[:2]] == [400, 300]
+    # the third row has no tiny_mp4
+    assert len(table.filter("tiny_mp4")) == 3
+    with pytest.raises(ValueError):
+        table.column("gif", "colour")
+
+
+def test_giphy_images_are_columns():
+    media = [GiphyMedia(data = giphy_result(i)) for i in range(5)]
+    table = MediaTable.from_giphy(media)
+    row = table[0]
+    assert row.provider == "giphy"
+    assert row.original.url == media[0].images["original"].url
+    assert row.fixed_width.width == 200 and row.fixed_width.height == 113
+    assert row.original.duration is None
+    assert table.nbytes > 0
+
+
+async def test_collect_from_an_iterator():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            table = await MediaTable.collect(client.iter_trending(max_results = 120, page_size = 50), provider = "tenor")
+    assert len(table) == 120
+    assert table.ids == [result["id"] for result in server.tenor[:120]]
@@ -0,0 +1,25 @@
+import importlib.util
+import json
+
+import pytest
+
+from aiogifs.decoders import BACKENDS, get_decoder
+
+
+def test_default_decoder_decodes_bytes():
+    assert get_decoder()(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+@pytest.mark.parametrize("name", list(BACKENDS))
+def test_named_backends(name):
+    if name != "json" and importlib.util.find_spec(name) is None:
+        with pytest.raises(ImportError):
+            get_decoder(name)
+        return
+    payload = {"results": [{"id": "1", "dims": [1, 2]}], "next": "1"}
+    assert get_decoder(name)(json.dumps(payload).encode()) == payload
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_decoder("simdjson")
@@ -0,0 +1,78 @@
+import asyncio
+import io
+
+from PIL import Image
+
+from aiogifs import Deduplicator
+from aiogifs.dedup import dhash, normalize_url
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from aiogifs.tenor.models import Media as TenorMedia
+from benchmarks.mock_server import MockServer, tenor_result
+
+
+def png(size: int, reverse: bool = False) -> bytes:
+    image = Image.new("L", (size, size))
+    image.putdata([((size - x if reverse else x) * 255 // size) for y in range(size) for x in range(size)])
+    out = io.BytesIO()
+    image.save(out, format = "PNG")
+    return out.getvalue()
+
+
+def media(i: int, preview: str) -> TenorMedia:
+    result = tenor_result(i)
+    for fmt in result["media"][0].values():
+        fmt["preview"] = preview
+    return TenorMedia(data = result["media"][0], raw_object = result)
+
+
+def test_cdn_aliases_are_folded():
+    assert normalize_url("https://media2.giphy.com/media/abc/giphy.gif/") == "media.giphy.com/media/abc/giphy.gif"
+
+
+def test_similar_images_hash_close():
+    assert bin(dhash(png(64)) ^ dhash(png(48))).count("1") <= 3
+    assert bin(dhash(png(64)) ^ dhash(png(64, reverse = True))).count("1") > 3
+
+
+async def test_fingerprints_drop_repeats():
+    dedupe = Deduplicator(max_entries = 2)
+    first, second, third = (media(i, "") for i in range(3))
+    assert await dedupe.unique([first, second, first]) == [first, second]
+    assert dedupe.stats == {"entries": 2, "dropped": 1}
+    await dedupe.unique([third])
+    # only the last two media are remembered
+    assert not await dedupe.is_duplicate(first)
+
+
+async def test_near_duplicate_previews_are_dropped():
+    async with MockServer() as server:
+        server.media.update({"a.png": png(64), "b.png": png(48), "c.png": png(64, reverse = True)})
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            dedupe = Deduplicator(client = client)
+            items = [media(i, server.media_url(name)) for i, name in enumerate(("a.png", "b.png", "c.png"))]
+            assert await dedupe.unique(items) == [items[0], items[2]]
+
+
+async def test_copies_checked_concurrently_are_caught():
+    async with MockServer() as server:
+        server.media["a.png"] = png(64)
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            dedupe = Deduplicator(client = client)
+            item = media(0, server.media_url("a.png"))
+            assert await asyncio.gather(*(dedupe.is_duplicate(item) for _ in range(3))) == [False, True, True]
+            assert server.hits["/media/a.png"] == 1
+
+
+async def test_skipped_media_dont_count_towards_max_results():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            dedupe = Deduplicator()
+            seen = [m.id async for m in client.iter_search("cat", max_results = 100, dedupe = dedupe)]
+            more = [m.id async for m in client.iter_search("cat", max_results = 100, pos = "50", dedupe = dedupe)]
+            assert len(more) == 100 and not set(seen) & set(more)
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url) as client:
+            dedupe = Deduplicator()
+            seen = [m.id async for m in client.iter_trending(max_results = 60, page_size = 25, dedupe = dedupe)]
+            more = [m.id async for m in client.iter_trending(max_results = 60, page_size = 25, offset = 30, dedupe = dedupe)]
+            assert len(more) == 60 and not set(seen) & set(more)
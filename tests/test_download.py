@@ -0,0 +1,82 @@
+import io
+
+import pytest
+
+from aiogifs import MediaTooLarge
+from aiogifs.giphy import GiphyClient
+from aiogifs.giphy.models import Media as GiphyMedia
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+BODY = bytes(range(256)) * 1000
+
+
+async def test_stream_in_chunks():
+    async with MockServer() as server:
+        server.media["a.gif"] = BODY
+        async with TenorClient(api_key = "key") as client:
+            chunks = [chunk async for chunk in client.stream(server.media_url("a.gif"), chunk_size = 4096)]
+        assert b"".join(chunks) == BODY
+        assert max(len(chunk) for chunk in chunks) <= 4096
+
+
+async def test_max_size_is_enforced():
+    async with MockServer() as server:
+        server.media["a.gif"] = BODY
+        async with TenorClient(api_key = "key") as client:
+            with pytest.raises(MediaTooLarge):
+                async for _ in client.stream(server.media_url("a.gif"), max_size = 1000):
+                    pass
+
+
+async def test_download_to_writer():
+    async with MockServer() as server:
+        server.media["a.gif"] = BODY
+        buffer = io.BytesIO()
+        async with TenorClient(api_key = "key") as client:
+            assert await client.download(server.media_url("a.gif"), buffer) == len(BODY)
+        assert buffer.getvalue() == BODY
+
+
+async def test_resume_requests_missing_bytes(tmp_path):
+    dest = tmp_path / "a.gif"
+    dest.write_bytes(BODY[:1000])
+    async with MockServer() as server:
+        server.media["a.gif"] = BODY
+        async with TenorClient(api_key = "key") as client:
+            assert await client.download(server.media_url("a.gif"), str(dest)) == len(BODY)
+            # a complete file is answered with a 416 and left alone
+            assert await client.download(server.media_url("a.gif"), str(dest)) == len(BODY)
+    assert dest.read_bytes() == BODY
+
+
+async def test_resume_ignored_by_server(tmp_path):
+    dest = tmp_path / "a.gif"
+    dest.write_bytes(b"stale bytes")
+    async with MockServer() as server:
+        server.media["a.gif"] = BODY
+        server.ranges = False
+        async with TenorClient(api_key = "key") as client:
+            assert await client.download(server.media_url("a.gif"), str(dest)) == len(BODY)
+    assert dest.read_bytes() == BODY
+
+
+async def test_empty_response_truncates_partial_file(tmp_path):
+    dest = tmp_path / "a.gif"
+    dest.write_bytes(b"stale bytes")
+    async with MockServer() as server:
+        server.media["a.gif"] = b""
+        server.ranges = False
+        async with TenorClient(api_key = "key") as client:
+            assert await client.download(server.media_url("a.gif"), str(dest)) == 0
+    assert dest.read_bytes() == b""
+
+
+async def test_giphy_media_without_original():
+    media = GiphyMedia(data = {"id": "abc", "images": {"fixed_width": {"url": "https://media.giphy.com/a.gif"}}})
+    async with GiphyClient(api_key = "key") as client:
+        with pytest.raises(ValueError):
+            await client.download(media, io.BytesIO())
+        with pytest.raises(ValueError):
+            async for _ in client.stream(media):
+                pass
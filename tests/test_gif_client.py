@@ -0,0 +1,97 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from aiogifs import GifClient
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+def make(tenor_server: MockServer, giphy_server: MockServer, **kwargs) -> GifClient:
+    return GifClient(
+        tenor = TenorClient(api_key = "key", base_url = tenor_server.tenor_url, cache = False),
+        giphy = GiphyClient(api_key = "key", base_url = giphy_server.giphy_url, cache = False),
+        **kwargs,
+    )
+
+
+async def test_hedge_returns_the_first_success():
+    async with MockServer(error_rate = 1.0) as tenor, MockServer(latency = 0.02) as giphy:
+        async with make(tenor, giphy, strategy = "hedge") as client:
+            gifs = await client.search("cat", limit = 5)
+        assert [gif.provider for gif in gifs] == ["giphy"] * 5
+
+
+async def test_race_asks_the_next_provider_after_the_budget():
+    async with MockServer(latency = 0.5) as tenor, MockServer() as giphy:
+        async with make(tenor, giphy, strategy = "race", budget = 0.05) as client:
+            gifs = await client.trending(limit = 3)
+        assert {gif.provider for gif in gifs} == {"giphy"}
+
+
+async def test_race_keeps_a_fast_primary():
+    async with MockServer() as tenor, MockServer() as giphy:
+        async with make(tenor, giphy, strategy = "race", budget = 1.0) as client:
+            gifs = await client.search("cat", limit = 3)
+        assert {gif.provider for gif in gifs} == {"tenor"}
+        assert giphy.requests == 0
+
+
+async def test_merge_interleaves_providers():
+    async with MockServer() as tenor, MockServer() as giphy:
+        async with make(tenor, giphy, strategy = "merge") as client:
+            gifs = await client.search("cat", limit = 3)
+        assert [gif.provider for gif in gifs] == ["tenor", "giphy"] * 3
+
+
+async def test_merge_leaves_out_failed_providers():
+    async with MockServer() as tenor, MockServer(error_rate = 1.0) as giphy:
+        async with make(tenor, giphy, strategy = "merge") as client:
+            gifs = await client.search("cat", limit = 3)
+        assert [gif.provider for gif in gifs] == ["tenor"] * 3
+
+
+async def test_losers_have_stopped_when_the_call_returns():
+    stopped = []
+
+    async def fast():
+        return []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            stopped.append("slow")
+
+    async with MockServer() as server:
+        async with make(server, server) as client:
+            assert await client._first([fast, slow], None) == []
+            assert stopped == ["slow"]
+            assert await client._merge([fast, slow], 0.05) == []
+            assert stopped == ["slow", "slow"]
+
+
+async def test_async_with_opens_every_provider():
+    async with MockServer() as server:
+        async with make(server, server) as client:
+            assert client.tenor.http._session is not None and client.giphy.http._session is not None
+        assert client.tenor.http._session is None and client.giphy.http._session is None
+
+
+async def test_every_provider_failing_raises():
+    async with MockServer(error_rate = 1.0) as tenor, MockServer(error_rate = 1.0) as giphy:
+        async with make(tenor, giphy) as client:
+            for strategy in ("hedge", "race", "merge"):
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await client.search("cat", strategy = strategy)
+
+
+async def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        GifClient()
+    async with MockServer() as server:
+        async with make(server, server) as client:
+            with pytest.raises(ValueError):
+                await client.search("cat", strategy = "fastest")
@@ -0,0 +1,49 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from aiogifs import HedgePolicy
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+def test_delay_needs_enough_samples():
+    policy = HedgePolicy(percentile = 0.5, min_samples = 4, min_delay = 0.01, max_delay = 0.3)
+    for latency in (0.1, 0.2, 0.4):
+        policy.record("/search", latency)
+    assert policy.delay("/search") is None
+    policy.record("/search", 0.8)
+    assert policy.delay("/search") == 0.3
+    assert policy.delay("/trending") is None
+
+
+async def test_slow_request_is_hedged():
+    policy = HedgePolicy(min_samples = 1, min_delay = 0.02)
+    policy.record("/search", 0.01)
+    async with MockServer(latency = 0.1) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, hedging = policy) as client:
+            response = await client.search("cat", limit = 5)
+        assert len(response.media) == 5
+        assert policy.stats["hedged"] == 1
+        assert server.hits["/tenor/v1/search"] == 2
+
+
+async def test_failed_copy_waits_for_the_other():
+    policy = HedgePolicy(min_samples = 1, min_delay = 0.02)
+    policy.record("/search", 0.01)
+    async with MockServer(latency = 0.1, error_rate = 1.0) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, hedging = policy) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.search("cat", limit = 5)
+        assert server.hits["/tenor/v1/search"] == 2
+
+
+async def test_per_route_timeout():
+    timeouts = {"/search": aiohttp.ClientTimeout(total = 0.05)}
+    async with MockServer(latency = 0.2) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, timeouts = timeouts) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.search("cat", limit = 5)
+            response = await client.trending(limit = 5)
+        assert len(response.media) == 5
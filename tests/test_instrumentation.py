@@ -0,0 +1,86 @@
+import aiohttp
+import pytest
+
+from aiogifs import Hooks, MetricsCollector, TracingHooks
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+async def test_metrics_count_requests_and_cache_hits():
+    metrics = MetricsCollector()
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, hooks = [metrics]) as client:
+            await client.search("cat", limit = 5)
+            await client.search("cat", limit = 5)
+    labels = ("tenor", "/search")
+    assert metrics.responses[labels + ("200",)] == 1
+    assert metrics.cache_hits[labels] == 1
+    assert metrics.in_flight[labels] == 0
+    assert metrics.latency[labels].count == 1 and metrics.bytes[labels] > 0
+    text = metrics.render()
+    assert 'aiogifs_responses_total{provider="tenor",endpoint="/search",status="200"} 1' in text
+    assert 'aiogifs_request_duration_seconds_bucket{provider="tenor",endpoint="/search",le="+Inf"} 1' in text
+
+
+async def test_failed_requests_are_labelled_by_status():
+    metrics = MetricsCollector()
+    async with MockServer(error_rate = 1.0) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, hooks = [metrics]) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.search("cat", limit = 5)
+    assert metrics.responses[("tenor", "/search", "500")] == 1
+
+
+class _Span:
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def add_event(self, name, attributes):
+        pass
+
+    def record_exception(self, error):
+        self.attributes["error"] = error
+
+    def end(self):
+        self.ended = True
+
+
+class _Tracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes):
+        span = _Span(name, attributes)
+        self.spans.append(span)
+        return span
+
+
+async def test_tracing_records_a_span_per_request():
+    tracer = _Tracer()
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, hooks = [TracingHooks(tracer)]) as client:
+            await client.trending(limit = 5)
+    [span] = tracer.spans
+    assert span.name == "tenor /trending" and span.ended
+    assert span.attributes["http.status_code"] == 200
+
+
+class _Broken(Hooks):
+    def on_request_end(self, event):
+        raise RuntimeError("metrics backend down")
+
+
+async def test_broken_hook_does_not_fail_the_request():
+    metrics = MetricsCollector()
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, hooks = [_Broken(), metrics]) as client:
+            with pytest.warns(RuntimeWarning, match = "metrics backend down"):
+                response = await client.search("cat", limit = 5)
+    assert len(response.media) == 5
+    # hooks after the broken one still run
+    assert metrics.responses[("tenor", "/search", "200")] == 1
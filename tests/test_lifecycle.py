@@ -0,0 +1,78 @@
+import asyncio
+
+import aiohttp
+
+from aiogifs import Transport
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+async def test_session_opens_on_first_request():
+    async with MockServer() as server:
+        client = TenorClient(api_key = "key", base_url = server.tenor_url)
+        assert client.http._session is None
+        await asyncio.gather(*(client.search(query, limit = 5) for query in ("cat", "dog", "fox")))
+        session = client.http._session
+        assert session is not None and not session.closed
+        await client.close()
+        assert session.closed and client.http._session is None
+
+
+async def test_concurrent_first_requests_open_one_session():
+    opened = []
+    async with MockServer() as server:
+        client = GiphyClient(api_key = "key", base_url = server.giphy_url, cache = False)
+        open_session = client.http.open_session
+
+        async def counted():
+            opened.append(True)
+            await asyncio.sleep(0.01)
+            await open_session()
+
+        client.http.open_session = counted
+        sessions = await asyncio.gather(*(client.http.ensure_session() for _ in range(5)))
+        assert len(opened) == 1 and len({id(session) for session in sessions}) == 1
+        await client.close()
+
+
+async def test_async_with_opens_and_closes():
+    async with MockServer() as server:
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url) as client:
+            session = client.http._session
+            assert session is not None
+            await client.search("cat", limit = 5)
+        assert session.closed
+
+        # a closed client opens a new session when used again
+        await client.search("dog", limit = 5)
+        assert not client.http._session.closed
+        await client.close()
+
+
+async def test_a_passed_session_is_used_as_is():
+    async with MockServer() as server:
+        async with aiohttp.ClientSession(raise_for_status = True) as session:
+            client = TenorClient(api_key = "key", base_url = server.tenor_url, session = session)
+            await client.search("cat", limit = 5)
+            assert client.http._session is session
+
+
+async def test_shared_clients_are_reused_until_closed():
+    async with MockServer() as server:
+        tenor = TenorClient.shared("key", base_url = server.tenor_url)
+        giphy = GiphyClient.shared("key", base_url = server.giphy_url)
+        assert TenorClient.shared("key") is tenor and GiphyClient.shared("key") is giphy
+        assert TenorClient.shared("other", base_url = server.tenor_url) is not tenor
+        await tenor.search("cat", limit = 5)
+        await giphy.search("cat", limit = 5)
+        assert tenor.http._session is giphy.http._session
+
+        await tenor.close()
+        assert TenorClient.shared("key", base_url = server.tenor_url) is not tenor
+        await TenorClient.close_shared()
+        await GiphyClient.close_shared()
+        loop = asyncio.get_running_loop()
+        assert not [key for key in (*TenorClient._shared, *GiphyClient._shared) if key[0] is loop]
+        assert Transport.shared().session is None
+        await Transport.close_shared()
@@ -0,0 +1,68 @@
+import aiohttp
+import pytest
+
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+async def test_tenor_ids_are_packed_into_batches():
+    async with MockServer() as server:
+        ids = [result["id"] for result in server.tenor[:120]]
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            media = await client.get_by_ids(ids)
+            assert [m.id for m in media] == ids
+            # 50 IDs per request
+            assert server.hits["/tenor/v1/gifs"] == 3
+
+
+async def test_giphy_ids_are_packed_into_batches():
+    async with MockServer() as server:
+        ids = [result["id"] for result in server.giphy[:150]]
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url) as client:
+            media = await client.get_by_ids(ids)
+            assert [m.id for m in media] == ids
+            # 100 IDs per request
+            assert server.hits["/giphy/v1/gifs"] == 2
+
+
+async def test_known_ids_are_answered_from_the_cache():
+    async with MockServer() as server:
+        ids = [result["id"] for result in server.tenor[:10]]
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            await client.get_by_ids(ids[:5])
+            media = await client.get_by_ids(list(reversed(ids)))
+            assert [m.id for m in media] == list(reversed(ids))
+            # only the five new IDs were requested
+            assert server.hits["/tenor/v1/gifs"] == 2
+            assert (await client.get_by_id(ids[0])).id == ids[0]
+            assert server.hits["/tenor/v1/gifs"] == 2
+
+
+async def test_unknown_ids_hold_none():
+    async with MockServer() as server:
+        known = server.giphy[0]["id"]
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url) as client:
+            media = await client.get_by_ids(["unknown", known, "unknown"])
+            assert media[0] is None and media[2] is None
+            assert media[1].id == known
+            assert await client.get_by_id("missing") is None
+
+
+async def test_tenor_results_without_media_hold_none():
+    async with MockServer() as server:
+        ids = [result["id"] for result in server.tenor[:2]]
+        server.tenor[0] = dict(server.tenor[0], media = [])
+        del server.tenor[1]["media"]
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, batch_window = 0.001) as client:
+            assert await client.get_by_ids(ids) == [None, None]
+            assert await client.get_by_id(ids[0]) is None
+            # nothing was cached for them, so they are asked for again
+            assert server.hits["/tenor/v1/gifs"] == 2 and len(client.http.cache) == 0
+
+
+async def test_failed_batch_raises():
+    async with MockServer(error_rate = 1.0) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.get_by_ids([result["id"] for result in server.tenor[:3]])
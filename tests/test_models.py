@@ -0,0 +1,43 @@
+import pytest
+
+from aiogifs.giphy.models import GiphyResponse
+from aiogifs.tenor.models import TenorResponse
+from benchmarks.mock_server import giphy_result, tenor_result
+
+
+def test_tenor_children_are_memoized():
+    response = TenorResponse(data = {"results": [tenor_result(i) for i in range(3)], "next": "3"})
+    media = response.media
+    assert media is response.media
+    first = media[0]
+    assert first.gif is first.gif and first.mp4 is first.mp4
+    assert first.gif.dimensions == [498, 280]
+    assert response.next == "3"
+
+
+def test_tenor_missing_fields():
+    response = TenorResponse(data = {"results": [], "next": "0"})
+    assert response.media is None and response.next is None
+    media = TenorResponse(data = {"results": [{"id": "1", "media": [{}]}]}).media[0]
+    assert media.gif is None and media.mp4 is None
+    assert media.id == "1"
+
+
+def test_models_have_no_instance_dict():
+    response = TenorResponse(data = {"results": [tenor_result(0)]})
+    for obj in (response, response.media[0], response.media[0].gif, response.media[0].mp4):
+        with pytest.raises(AttributeError):
+            obj.__dict__
+    giphy = GiphyResponse(raw_payload = {"data": [giphy_result(0)], "meta": {}, "pagination": {}})
+    for obj in (giphy, giphy.media[0], giphy.meta, giphy.media[0].original):
+        with pytest.raises(AttributeError):
+            obj.__dict__
+
+
+def test_giphy_children_are_memoized():
+    response = GiphyResponse(raw_payload = {"data": [giphy_result(i) for i in range(2)], "meta": {"status": 200}, "pagination": {"count": 2, "offset": 0, "total_count": 10}})
+    assert response.media is response.media
+    assert response.meta is response.meta
+    media = response.media[0]
+    assert media.images is media.images
+    assert media.original.width == 480 and media.original.size == 480 * 270 * 3
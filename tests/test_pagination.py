@@ -0,0 +1,76 @@
+import pytest
+
+from aiogifs.giphy import GiphyClient
+from aiogifs.giphy.models import GiphyResponse
+from aiogifs.tenor import TenorClient
+from aiogifs.utils import paginate
+from benchmarks.mock_server import MockServer
+
+
+async def test_tenor_iter_search_follows_next():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            ids = [media.id async for media in client.iter_search("cat", max_results = 25, page_size = 10)]
+        assert len(ids) == 25 and len(set(ids)) == 25
+        assert server.hits["/tenor/v1/search"] == 3
+
+
+async def test_giphy_iter_trending_follows_offsets():
+    async with MockServer() as server:
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url) as client:
+            ids = [media.id async for media in client.iter_trending(max_results = 30, page_size = 20, prefetch = False)]
+        assert ids == [r["id"] for r in server.giphy[:30]]
+
+
+async def test_stops_on_last_page():
+    pages = {None: ([1, 2], "a"), "a": ([3], None)}
+
+    async def fetch_page(pos, size):
+        return pages[pos]
+
+    assert [item async for item in paginate(fetch_page, page_size = 2)] == [1, 2, 3]
+
+
+async def test_zero_max_results_fetches_nothing():
+    calls = []
+
+    async def fetch_page(pos, size):
+        calls.append(size)
+        return [1, 2], None
+
+    assert [item async for item in paginate(fetch_page, page_size = 2, max_results = 0)] == []
+    assert calls == []
+
+
+async def test_error_is_raised_to_the_consumer():
+    async def fetch_page(pos, size):
+        if pos is None:
+            return [1], "next"
+        raise RuntimeError("page failed")
+
+    seen = []
+    with pytest.raises(RuntimeError):
+        async for item in paginate(fetch_page, page_size = 1):
+            seen.append(item)
+    assert seen == [1]
+
+
+def test_pagination_is_memoized():
+    response = GiphyResponse(raw_payload = {"data": [], "pagination": {"count": 0}})
+    assert response.pagination is response.pagination
+
+
+async def test_skipped_items_dont_count():
+    pages = {None: ([1, 2, 3], "a"), "a": ([5, 7], "b"), "b": ([4, 6, 8, 10], None)}
+    sizes = []
+
+    async def fetch_page(pos, size):
+        sizes.append(size)
+        return pages[pos]
+
+    async def odd(item):
+        return item % 2 == 1
+
+    # a page left empty by skipping doesn't end the iteration
+    assert [item async for item in paginate(fetch_page, page_size = 3, max_results = 4, skip = odd)] == [2, 4, 6, 8]
+    assert sizes == [3, 3, 3]
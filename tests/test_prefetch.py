@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from aiogifs import PreviewPrefetcher, ThumbnailCache
+from aiogifs.prefetch import Thumbnail
+from aiogifs.tenor import TenorClient
+from aiogifs.tenor.models import Media
+from benchmarks.mock_server import MockServer
+
+
+def thumbnail(url: str, size: int) -> Thumbnail:
+    return Thumbnail(url = url, body = b"x" * size, content_type = None, etag = None, last_modified = None, expires = float("inf"))
+
+
+def test_cache_evicts_least_recently_used_bytes():
+    cache = ThumbnailCache(max_bytes = 10)
+    cache.put(thumbnail("a", 4))
+    cache.put(thumbnail("b", 4))
+    assert cache.get("a") is not None
+    cache.put(thumbnail("c", 4))
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.size == 8 and cache.stats["evictions"] == 1
+    cache.put(thumbnail("d", 11))
+    assert "d" not in cache._entries
+
+
+async def test_searches_warm_their_previews():
+    async with MockServer() as server:
+        for result in server.tenor[:5]:
+            url = server.media_url(f"{result['id']}.png")
+            server.media[f"{result['id']}.png"] = result["id"].encode()
+            for fmt in result["media"][0].values():
+                fmt["preview"] = url
+        prefetcher = PreviewPrefetcher()
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, prefetcher = prefetcher) as client:
+            response = await client.search("cat", limit = 5)
+            await asyncio.gather(*prefetcher._tasks)
+            assert len(prefetcher.cache) == 5
+            thumb = await prefetcher.fetch(response.media[0].tiny_gif.preview_url)
+            assert thumb.body == response.media[0].id.encode()
+            assert prefetcher.downloads == 5
+
+
+async def test_expired_previews_are_revalidated():
+    async with MockServer() as server:
+        server.media["a.png"] = b"preview"
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            prefetcher = PreviewPrefetcher(http = client.http, ttl = 0)
+            first = await prefetcher.fetch(server.media_url("a.png"))
+            second = await prefetcher.fetch(server.media_url("a.png"))
+            assert second is first and second.body == b"preview"
+            assert prefetcher.downloads == 1 and prefetcher.revalidated == 1
+
+
+async def test_oversized_previews_are_not_downloaded_again():
+    async with MockServer() as server:
+        server.media["big.png"] = b"x" * 1000
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            prefetcher = PreviewPrefetcher(http = client.http, max_preview_bytes = 100)
+            assert await prefetcher.warm([server.media_url("big.png")] * 2) == [None]
+            assert await prefetcher.fetch(server.media_url("big.png")) is None
+            assert server.hits["/media/big.png"] == 1
+
+
+async def test_fetch_needs_an_http_client():
+    with pytest.raises(RuntimeError):
+        await PreviewPrefetcher().fetch("http://127.0.0.1/a.png")
+
+
+async def test_close_stops_background_work():
+    async with MockServer() as server:
+        # an API url answered slowly keeps the preview download running
+        result = server.tenor[0]
+        for fmt in result["media"][0].values():
+            fmt["preview"] = server.tenor_url + "/trending"
+        server.latency = 1.0
+        prefetcher = PreviewPrefetcher()
+        client = TenorClient(api_key = "key", base_url = server.tenor_url, prefetcher = prefetcher, batch_window = 60)
+        await client.open()
+        task = prefetcher.prefetch([Media(data = result["media"][0], raw_object = result)])
+        lookup = asyncio.ensure_future(client.get_by_id("1"))
+        await asyncio.sleep(0.05)
+        await client.close()
+
+        assert task.cancelled() and lookup.cancelled()
+        assert not prefetcher._tasks and not prefetcher._inflight
+        await asyncio.sleep(0.05)
+        assert client.http._session is None
+        assert server.hits["/tenor/v1/gifs"] == 0
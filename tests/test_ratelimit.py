@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from aiogifs import Hooks, RateLimiter
+from aiogifs.ratelimit import parse_retry_after
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "2.5"}) == 2.5
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"}) == 3.0
+    assert parse_retry_after({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "3"}) is None
+    assert parse_retry_after({}) is None
+
+
+async def test_token_bucket_paces_requests():
+    limiter = RateLimiter(rate = 20, burst = 2)
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(4)))
+    # two tokens are available at once, the other two refill at 20 per second
+    assert time.monotonic() - start >= 0.09
+    assert limiter.stats["acquired"] == 4
+
+
+async def test_pause_blocks_acquire():
+    limiter = RateLimiter(rate = 100, burst = 10)
+    limiter.pause(0.1)
+    start = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+class _Recover(Hooks):
+    def __init__(self, server: MockServer):
+        self.server = server
+        self.retries = 0
+
+    def on_retry(self, event):
+        self.retries += 1
+        self.server.throttle_rate = 0.0
+
+
+async def test_throttled_request_is_retried():
+    async with MockServer(throttle_rate = 1.0) as server:
+        hook = _Recover(server)
+        limiter = RateLimiter(backoff_base = 0.01)
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, rate_limiter = limiter, hooks = [hook]) as client:
+            response = await client.search("cat", limit = 5)
+        assert len(response.media) == 5
+        assert hook.retries == 1 and limiter.throttled == 1
+
+
+async def test_gives_up_after_max_retries():
+    async with MockServer(throttle_rate = 1.0) as server:
+        limiter = RateLimiter(max_retries = 2, backoff_base = 0.01)
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, rate_limiter = limiter) as client:
+            with pytest.raises(aiohttp.ClientResponseError) as info:
+                await client.search("cat", limit = 5)
+        assert info.value.status == 429
+        assert server.hits["/tenor/v1/search"] == 3
+
+
+async def test_without_limiter_429_is_raised():
+    async with MockServer(throttle_rate = 1.0) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.search("cat", limit = 5)
+        assert server.hits["/tenor/v1/search"] == 1
@@ -0,0 +1,81 @@
+import aiohttp
+
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from aiogifs.tenor.http import Route
+from aiogifs.tenor.models import TenorResponse
+from aiogifs.utils import ParsedResponses
+from benchmarks.mock_server import MockServer
+
+
+def test_parsed_responses_are_reused():
+    parsed = ParsedResponses(lambda data: TenorResponse(data = data), max_entries = 2)
+    first, second, third = {"results": []}, {"results": []}, {"results": []}
+    response = parsed.get(first)
+    assert parsed.get(first) is response
+    assert parsed.get(dict(first)) is not response
+    parsed.get(second)
+    parsed.get(third)
+    assert parsed.get(first) is not response
+
+
+async def test_mock_server_answers_conditional_requests():
+    async with MockServer() as server:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.tenor_url + "/trending", params = {"limit": "2"}) as resp:
+                assert resp.status == 200
+                etag = resp.headers["ETag"]
+                assert len((await resp.json())["results"]) == 2
+            async with session.get(server.tenor_url + "/trending", params = {"limit": "2"}, headers = {"If-None-Match": etag}) as resp:
+                assert resp.status == 304
+        assert server.hits["/tenor/v1/trending"] == 2
+
+
+async def test_unchanged_trending_is_not_downloaded_again():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, cache_ttls = {"/trending": 0}) as client:
+            first = await client.trending(limit = 5)
+            second = await client.trending(limit = 5)
+            assert second is first
+            assert server.hits["/tenor/v1/trending"] == 2
+
+            server.tenor = server.tenor[::-1]
+            third = await client.trending(limit = 5)
+            assert third is not first and third.media[0].id == server.tenor[0]["id"]
+
+
+async def test_a_304_without_a_validator_is_asked_again_in_full():
+    async with MockServer() as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, cache = False) as client:
+            # a route sent twice keeps the conditional headers of its last request
+            route = Route("/trending", {"limit": 5})
+            await client.http.request(route)
+            first = await client.http.request(route)
+            assert "If-None-Match" in route.headers
+
+            client.http._validators.clear()
+            client.http._validator_bytes = 0
+            data = await client.http.request(route)
+            assert data == first and data is not first
+            assert server.hits["/tenor/v1/trending"] == 4
+            assert len(client.http._validators) == 1
+
+
+async def test_validators_are_bounded_by_size():
+    async with MockServer() as server:
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url, cache_ttls = {"/gifs/trending": 0}) as client:
+            await client.trending(limit = 5)
+            size = client.http._validator_bytes
+            assert len(client.http._validators) == 1 and size > 0
+
+            client.http.MAX_VALIDATOR_BYTES = size * 2
+            for limit in (4, 3, 2):
+                await client.trending(limit = limit)
+            # the oldest, biggest body was evicted first
+            assert not any("limit=5" in key for key in client.http._validators)
+            assert client.http._validator_bytes == sum(v.size for v in client.http._validators.values()) <= size * 2
+
+            # a body over the limit isn't kept at all
+            client.http.MAX_VALIDATOR_BYTES = 10
+            await client.trending(limit = 1)
+            assert not client.http._validators and client.http._validator_bytes == 0
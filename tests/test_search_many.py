@@ -0,0 +1,60 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from aiogifs.utils import gather_bounded, map_bounded
+from benchmarks.mock_server import MockServer
+
+
+async def test_search_many_keeps_input_order():
+    async with MockServer(latency = 0.01, jitter = 0.02) as server:
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, cache = False) as client:
+            queries = [f"q{i}" for i in range(12)]
+            results = await client.search_many(queries, concurrency = 4, limit = 3)
+        assert all(len(r.media) == 3 for r in results)
+        assert server.hits["/tenor/v1/search"] == 12
+
+
+async def test_failed_search_holds_its_error():
+    async with MockServer(error_rate = 1.0) as server:
+        async with GiphyClient(api_key = "key", base_url = server.giphy_url) as client:
+            results = await client.search_many(["a", "b"], concurrency = 2)
+            pairs = [pair async for pair in client.iter_search_many(["c"], concurrency = 1)]
+        assert all(isinstance(r, aiohttp.ClientResponseError) for r in results)
+        assert pairs[0][0] == "c" and isinstance(pairs[0][1], aiohttp.ClientResponseError)
+
+
+async def test_concurrency_is_bounded():
+    running = 0
+    peak = 0
+
+    async def call(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return item * 2
+
+    assert await gather_bounded(call, range(10), concurrency = 3) == [i * 2 for i in range(10)]
+    assert peak == 3
+
+
+class _Fatal(BaseException):
+    pass
+
+
+@pytest.mark.parametrize("error", [asyncio.CancelledError, _Fatal])
+async def test_worker_dying_is_raised_instead_of_hanging(error):
+    async def call(item):
+        if item == 2:
+            raise error()
+        await asyncio.sleep(0.01)
+        return item
+
+    with pytest.raises(error):
+        async for _ in map_bounded(call, range(5), concurrency = 2):
+            pass
@@ -0,0 +1,31 @@
+from aiogifs.tenor import FormatSelector
+from aiogifs.tenor.models import TenorResponse
+from benchmarks.mock_server import tenor_result
+
+
+def media():
+    return TenorResponse(data = {"results": [tenor_result(1)]}).media[0]
+
+
+def test_picks_the_smallest_preferred_container():
+    m = media()
+    assert FormatSelector().select(m) is m.nano_mp4
+
+
+def test_constraints():
+    m = media()
+    assert FormatSelector(min_width = 300).select(m) is m.tiny_mp4
+    assert FormatSelector(containers = ("gif",), max_bytes = 50_000).select(m) is m.nano_gif
+    # every mp4 lasts 2.4 seconds, so only a gif fits
+    assert FormatSelector(containers = ("mp4", "gif"), max_duration = 1).select(m) is m.nano_gif
+
+
+def test_excluded_and_unknown_values():
+    m = TenorResponse(data = {"results": [{"id": "1", "media": [{"looped_mp4": {"url": "https://x/l.mp4", "size": 1}, "mp4": {"url": "https://x/m.mp4"}}]}]}).media[0]
+    # looped_mp4 is excluded by default, and an unknown size doesn't rule mp4 out
+    assert FormatSelector(max_bytes = 10).select(m) is m.mp4
+
+
+def test_nothing_acceptable():
+    assert FormatSelector(max_bytes = 10).select(media()) is None
+    assert FormatSelector().select_all(TenorResponse(data = {"results": []})) == []
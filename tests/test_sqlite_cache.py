@@ -0,0 +1,93 @@
+import asyncio
+
+from aiogifs import SQLiteCache
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+async def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path)
+    await cache.set("a", {"results": [1, 2]}, ttl = 60)
+    await cache.close()
+
+    reopened = SQLiteCache(path)
+    assert await reopened.get("a") == {"results": [1, 2]}
+    assert len(reopened) == 1
+    await reopened.close()
+
+
+async def test_expired_entries_are_missed(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), stale_ttl = 60)
+    await cache.set("a", 1, ttl = 0.05)
+    await asyncio.sleep(0.1)
+    assert await cache.get("a") is None
+    assert await cache.get("a", stale = True) == 1
+    await cache.close()
+
+
+async def test_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries = 2, touch_interval = 0)
+    await cache.set("a", 1, ttl = 60)
+    await asyncio.sleep(0.01)
+    await cache.set("b", 2, ttl = 60)
+    await asyncio.sleep(0.01)
+    await cache.get("a")
+    await asyncio.sleep(0.01)
+    await cache.set("c", 3, ttl = 60)
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1 and await cache.get("c") == 3
+    assert cache.evictions == 1 and len(cache) == 2
+    await cache.close()
+
+
+async def test_running_totals(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    await cache.set("a", "x" * 10, ttl = 60)
+    await cache.set("a", "x" * 20, ttl = 60)
+    await cache.set("b", "y", ttl = 60)
+    assert len(cache) == 2 and cache.size == 22 + 3
+    await cache.delete("a")
+    await cache.delete("missing")
+    assert len(cache) == 1 and cache.size == 3
+    await cache.clear()
+    assert len(cache) == 0 and cache.size == 0
+    await cache.close()
+
+
+async def test_writes_do_not_scan_the_table(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_bytes = 10_000, purge_interval = 3600)
+    await cache.set("first", 0, ttl = 60)
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+    for i in range(50):
+        await cache.set(f"k{i}", "v" * 100, ttl = 60)
+    assert not [s for s in statements if "COUNT(" in s or "expires <=" in s]
+    assert cache.size <= 10_000
+    await cache.close()
+
+
+async def test_purge_removes_expired_rows_and_recounts(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path, purge_interval = 0)
+    other = SQLiteCache(path)
+    await cache.set("old", 1, ttl = 0.05)
+    await other.set("theirs", 2, ttl = 60)
+    await asyncio.sleep(0.1)
+    await cache.set("new", 3, ttl = 60)
+    # the expired row is gone and the other process's row is counted
+    assert len(cache) == 2
+    assert await other.get("old") is None
+    await cache.close()
+    await other.close()
+
+
+async def test_client_uses_sqlite_cache(tmp_path):
+    async with MockServer() as server:
+        cache = SQLiteCache(str(tmp_path / "cache.db"))
+        async with TenorClient(api_key = "key", base_url = server.tenor_url, cache = cache) as client:
+            await client.search("cat", limit = 5)
+            response = await client.search("cat", limit = 5)
+        assert len(response.media) == 5
+        assert server.hits["/tenor/v1/search"] == 1
+        await cache.close()
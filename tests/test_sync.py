@@ -0,0 +1,82 @@
+import asyncio
+import concurrent.futures
+
+import pytest
+
+from aiogifs import Transport
+from aiogifs.sync import LoopThread, SyncGiphyClient, SyncTenorClient
+from benchmarks.mock_server import MockServer
+
+
+def test_sync_clients_block_until_done():
+    server_thread = LoopThread(name = "mock-server")
+    client_thread = LoopThread()
+    server = MockServer()
+    server_thread.run(server.start())
+    try:
+        with SyncTenorClient(api_key = "key", base_url = server.tenor_url, loop_thread = client_thread) as tenor:
+            assert len(tenor.search("cat", limit = 5).media) == 5
+            assert len(list(tenor.iter_search("cat", max_results = 7, page_size = 3))) == 7
+        with SyncGiphyClient(api_key = "key", base_url = server.giphy_url, loop_thread = client_thread) as giphy:
+            assert len(giphy.search("cat", limit = 5).media) == 5
+            assert giphy.client.http.transport is Transport.shared(client_thread.loop)
+    finally:
+        server_thread.run(server.stop())
+        server_thread.stop()
+        client_thread.stop()
+
+
+def test_every_loop_thread_gets_its_own_transport():
+    first, second = LoopThread(), LoopThread()
+    try:
+        assert Transport.shared(first.loop) is Transport.shared(first.loop)
+        assert Transport.shared(first.loop) is not Transport.shared(second.loop)
+    finally:
+        first.stop()
+        second.stop()
+
+
+def test_run_refuses_the_loop_thread_itself():
+    thread = LoopThread()
+
+    async def nested():
+        coro = asyncio.sleep(0)
+        try:
+            thread.run(coro)
+        finally:
+            coro.close()
+
+    try:
+        with pytest.raises(RuntimeError):
+            thread.run(nested())
+    finally:
+        thread.stop()
+
+
+def test_a_timed_out_iterator_is_closed_once_it_stops():
+    thread = LoopThread()
+    closed = []
+
+    async def slow():
+        try:
+            yield 1
+            await asyncio.sleep(10)
+            yield 2
+        finally:
+            # still unwinding from the timeout when the iterator closes it
+            await asyncio.sleep(0.01)
+            closed.append(True)
+
+    try:
+        items = thread.iterate(slow(), timeout = 0.05)
+        assert next(items) == 1
+        with pytest.raises(concurrent.futures.TimeoutError):
+            next(items)
+        assert closed == [True]
+    finally:
+        thread.stop()
+
+
+def test_a_half_built_client_has_no_attributes():
+    client = object.__new__(SyncTenorClient)
+    assert not hasattr(client, "search")
@@ -0,0 +1,123 @@
+import asyncio
+
+from aiogifs import Transport
+from aiogifs.giphy import GiphyClient
+from aiogifs.tenor import TenorClient
+from benchmarks.mock_server import MockServer
+
+
+async def test_clients_share_one_session():
+    transport = Transport(limit = 10, limit_per_host = 5)
+    async with MockServer() as server:
+        tenor = TenorClient(api_key = "key", base_url = server.tenor_url, transport = transport)
+        giphy = GiphyClient(api_key = "key", base_url = server.giphy_url, transport = transport)
+        await tenor.search("cat", limit = 5)
+        await giphy.search("cat", limit = 5)
+        session = transport.session
+        assert tenor.http._session is session and giphy.http._session is session
+        assert session.connector.limit == 10 and session.connector.limit_per_host == 5
+
+        await tenor.close()
+        assert not session.closed
+        await giphy.close()
+        assert session.closed and transport.session is None
+
+
+async def test_reopens_after_last_release():
+    transport = Transport()
+    first = await transport.acquire()
+    await transport.release()
+    assert first.closed
+    second = await transport.acquire()
+    assert second is not first and not second.closed
+    await transport.close()
+    assert second.closed
+
+
+async def test_release_without_users_is_harmless():
+    transport = Transport()
+    await transport.release()
+    assert transport.session is None
+
+
+async def test_only_acquired_sessions_are_released():
+    transport = Transport()
+    session = await transport.acquire()
+    async with MockServer() as server:
+        # handed the transport's session, the client neither released nor acquired it
+        client = TenorClient(api_key = "key", base_url = server.tenor_url, session = session, transport = transport)
+        await client.search("cat", limit = 5)
+        await client.close()
+        assert not session.closed
+
+        client = TenorClient(api_key = "key", base_url = server.tenor_url, transport = transport)
+        await client.search("cat", limit = 5)
+        await transport.close()
+        other = await transport.acquire()
+        # the transport closed under the client, so its release must not take the new session with it
+        await client.close()
+        assert not other.closed
+        await transport.release()
+        assert other.closed
+
+
+async def test_shared_is_per_loop():
+    transport = Transport.shared()
+    assert Transport.shared() is transport
+    assert Transport.shared(asyncio.get_running_loop()) is transport
+    await Transport.close_shared()
+    assert Transport.shared() is not transport
+    await Transport.close_shared()
+
+
+def test_shared_closes_what_a_closed_loop_left_behind():
+    async def open_session():
+        async with MockServer() as server:
+            transport = Transport.shared()
+            client = TenorClient(api_key = "key", base_url = server.tenor_url, transport = transport)
+            await client.search("cat", limit = 5)
+            return transport, transport.session
+
+    old, session = asyncio.run(open_session())
+    assert not session.closed
+
+    async def replace():
+        transport = Transport.shared()
+        await asyncio.sleep(0)
+        return transport
+
+    new = asyncio.run(replace())
+    assert new is not old
+    assert session.closed
+
+
+async def test_shared_clients_are_per_loop():
+    async with MockServer() as server:
+        client = TenorClient.shared("key", base_url = server.tenor_url)
+        assert TenorClient.shared("key") is client
+        assert client.http.transport is Transport.shared()
+        await client.search("cat", limit = 5)
+        await TenorClient.close_shared()
+        assert TenorClient.shared("key", base_url = server.tenor_url) is not client
+        await TenorClient.close_shared()
+        await Transport.close_shared()
+
+
+def test_shared_clients_of_a_closed_loop_are_dropped():
+    async def open_client():
+        async with MockServer() as server:
+            client = TenorClient.shared("key", base_url = server.tenor_url)
+            await client.search("cat", limit = 5)
+            return client, client.http._session
+
+    old, session = asyncio.run(open_client())
+
+    async def replace():
+        client = TenorClient.shared("key")
+        await asyncio.sleep(0)
+        return client
+
+    new = asyncio.run(replace())
+    assert new is not old and list(TenorClient._shared.values()) == [new]
+    # the old client wasn't closed on the new loop, but the session went with its loop's transport
+    assert old.http._session is session and session.closed